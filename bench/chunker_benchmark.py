@@ -0,0 +1,112 @@
+"""
+Micro-benchmark: linear-time RecursiveChunker vs the original string-rebuilding version.
+
+Large documents are built by replicating the script_7 / script_9 raw pages,
+then both implementations chunk them and the outputs are checked to be identical.
+
+Usage:
+    python bench/chunker_benchmark.py [--replicate 200] [--chunk-size 512] [--overlap 50]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "rag_pipeline"))
+
+from chunking import RecursiveChunker  # noqa: E402
+
+
+class LegacyRecursiveChunker:
+    """The pre-rewrite chunker, kept verbatim as the benchmark baseline."""
+
+    def __init__(self, chunk_size: int = 512, overlap: int = 50):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def split_into_sentences(self, text: str) -> List[str]:
+        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+        return [s.strip() for s in sentences if s.strip()]
+
+    def chunk_text(self, text: str) -> List[str]:
+        if not text or len(text) <= self.chunk_size:
+            return [text] if text else []
+
+        chunks = []
+        current_chunk = ""
+
+        for sentence in self.split_into_sentences(text):
+            test_chunk = current_chunk + " " + sentence if current_chunk else sentence
+
+            if len(test_chunk) <= self.chunk_size:
+                current_chunk = test_chunk
+            else:
+                if current_chunk:
+                    chunks.append(current_chunk)
+
+                if len(sentence) > self.chunk_size:
+                    chunks.extend(sentence[i:i + self.chunk_size]
+                                  for i in range(0, len(sentence), self.chunk_size))
+                    current_chunk = ""
+                else:
+                    current_chunk = sentence
+
+        if current_chunk:
+            chunks.append(current_chunk)
+
+        return self._add_overlap(chunks)
+
+    def _add_overlap(self, chunks: List[str]) -> List[str]:
+        if len(chunks) <= 1:
+            return chunks
+
+        overlapped_chunks = [chunks[0]]
+        for i in range(1, len(chunks)):
+            prev_chunk = chunks[i - 1]
+            overlap_text = prev_chunk[-self.overlap:] if len(prev_chunk) >= self.overlap else prev_chunk
+            overlapped_chunks.append(overlap_text + " " + chunks[i])
+
+        return overlapped_chunks
+
+
+def best_of(fn, text: str, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicate", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    legacy = LegacyRecursiveChunker(args.chunk_size, args.overlap)
+    current = RecursiveChunker(args.chunk_size, args.overlap)
+
+    print(f"{'document':<16} {'chars':>10} {'chunks':>8} {'legacy ms':>10} {'linear ms':>10} {'speedup':>8}")
+    for name in ("script_7.txt", "script_9.txt"):
+        text = (ROOT / "data" / "raw" / name).read_text(encoding="utf-8")
+        text = "\n\n".join([text] * args.replicate)
+
+        expected = legacy.chunk_text(text)
+        got = current.chunk_text(text)
+        if got != expected:
+            raise SystemExit(f"Output mismatch on {name}")
+
+        t_legacy = best_of(legacy.chunk_text, text, args.repeats)
+        t_current = best_of(current.chunk_text, text, args.repeats)
+        print(f"{name:<16} {len(text):>10} {len(got):>8} {t_legacy * 1000:>10.2f} "
+              f"{t_current * 1000:>10.2f} {t_legacy / t_current:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark compact FAISS layouts against the current IVF-Flat index.
+
+Reports, per index_type:
+    - index memory (serialized size) and bytes per vector
+    - recall@5 against exact brute-force search
+    - mean / p95 query latency, with and without exact re-ranking
+
+Usage:
+    python bench/index_compression.py                      # embed data/chunks
+    python bench/index_compression.py --synthetic 200000   # clustered random corpus
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import faiss
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "rag_pipeline"))
+
+from embedding import EmbeddingPipeline, INDEX_TYPES, exact_rerank  # noqa: E402
+
+
+def load_corpus_embeddings(chunks_dir: Path) -> np.ndarray:
+    """Embed every chunk under chunks_dir with the production model."""
+    texts = []
+    for chunk_file in sorted(chunks_dir.glob("chunks_*.jsonl")):
+        with open(chunk_file, "r", encoding="utf-8") as f:
+            texts.extend(json.loads(line)["content"] for line in f if line.strip())
+    pipeline = EmbeddingPipeline()
+    return pipeline.embed_texts(texts).astype("float32")
+
+
+def synthetic_embeddings(n: int, dim: int = 384, n_topics: int = 200, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors that roughly mimic sentence-embedding geometry."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_topics, dim)).astype("float32")
+    labels = rng.integers(0, n_topics, size=n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, dim)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def make_queries(vectors: np.ndarray, n_queries: int, seed: int = 1) -> np.ndarray:
+    """Perturbed corpus vectors, so every query has a meaningful neighbourhood."""
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    queries = vectors[picks] + 0.05 * rng.standard_normal((len(picks), vectors.shape[1])).astype("float32")
+    return queries.astype("float32")
+
+
+def benchmark(vectors: np.ndarray, queries: np.ndarray, k: int, rerank_factor: int) -> list:
+    pipeline = EmbeddingPipeline.__new__(EmbeddingPipeline)  # index building only, no model load
+
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+
+    report = []
+    for index_type in INDEX_TYPES:
+        index = pipeline.create_faiss_index(vectors, index_type=index_type)
+        memory = faiss.serialize_index(index).nbytes
+
+        rerank = index_type != "ivf_flat"
+        latencies = []
+        hits = 0
+        for qi, query in enumerate(queries):
+            start = time.perf_counter()
+            if rerank:
+                _, candidates = index.search(query.reshape(1, -1), k * rerank_factor)
+                ids, _ = exact_rerank(query, candidates[0], vectors, k)
+            else:
+                _, found = index.search(query.reshape(1, -1), k)
+                ids = found[0].tolist()
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len(set(ids) & set(truth[qi].tolist()))
+
+        latencies = np.array(latencies)
+        report.append({
+            "index_type": index_type,
+            "memory_bytes": int(memory),
+            "bytes_per_vector": round(memory / len(vectors), 1),
+            f"recall@{k}": round(hits / (len(queries) * k), 4),
+            "latency_ms_mean": round(float(latencies.mean()), 3),
+            "latency_ms_p95": round(float(np.percentile(latencies, 95)), 3),
+            "reranked": rerank,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of data/chunks")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    parser.add_argument("--output", type=str, default="", help="Optional JSON report path")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        vectors = synthetic_embeddings(args.synthetic)
+    else:
+        vectors = load_corpus_embeddings(ROOT / "data" / "chunks")
+    queries = make_queries(vectors, args.queries)
+
+    report = benchmark(vectors, queries, args.k, args.rerank_factor)
+
+    print(f"\n{len(vectors)} vectors, {len(queries)} queries, k={args.k}")
+    print(f"{'index_type':<10} {'memory':>12} {'B/vec':>8} {'recall':>8} {'mean ms':>9} {'p95 ms':>9}")
+    for row in report:
+        print(f"{row['index_type']:<10} {row['memory_bytes']:>12} {row['bytes_per_vector']:>8} "
+              f"{row[f'recall@{args.k}']:>8} {row['latency_ms_mean']:>9} {row['latency_ms_p95']:>9}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"num_vectors": len(vectors), "results": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
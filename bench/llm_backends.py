@@ -0,0 +1,167 @@
+"""
+Latency and cost of LLM providers per graph node.
+
+Sends each node's real prompts (REFORM_PROMPT / ANSWER_PROMPT from agentic_rag.py)
+to every --provider and reports, per (provider, node):
+    - per-call latency percentiles (sequential calls)
+    - input / output tokens per call and cost per call and per 1000 queries
+      (with --price SPEC=input_per_1k,output_per_1k)
+    - with --batch-size > 1: throughput of generate_batch (true batching for
+      transformers:, concurrent calls otherwise)
+
+Reformer prompts use the labelled questions in bench/data/retrieval_queries.jsonl
+cut down to terse keyword queries; responder prompts use the full questions
+with their gold chunks from data/chunks as context, so no index or retrieval is needed.
+"fake" starts a local fake_llm.py server unless given a URL.
+
+Usage:
+    python bench/llm_backends.py --provider fake --provider transformers:google/flan-t5-small
+    python bench/llm_backends.py --provider gemini:gemini-2.5-flash --price gemini:gemini-2.5-flash=0.3,2.5 \\
+        --provider llamacpp:/models/qwen2.5-0.5b-instruct-q4_k_m.gguf --node reformer --output llm.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "rag_pipeline"))
+
+from agentic_rag import ANSWER_PROMPT, REFORM_PROMPT, format_context  # noqa: E402
+from fake_llm import FakeLLMConfig, FakeLLMServer  # noqa: E402
+from llm import make_provider  # noqa: E402
+
+QUERIES = ROOT / "bench" / "data" / "retrieval_queries.jsonl"
+CHUNKS_DIR = ROOT / "data" / "chunks"
+STOPWORDS = {"what", "is", "the", "a", "an", "for", "of", "on", "to", "can", "i", "do", "my", "how", "which",
+             "does", "are", "under", "there", "much", "get", "need", "and", "or", "with", "by", "in", "without"}
+
+
+def load_prompts(n):
+    with open(QUERIES, "r", encoding="utf-8") as f:
+        labels = [json.loads(line) for line in f if line.strip()][:n]
+    chunks = {}
+    for chunk_file in sorted(CHUNKS_DIR.glob("chunks_*.jsonl")):
+        with open(chunk_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    chunk = json.loads(line)
+                    chunks[chunk["chunk_id"]] = chunk
+
+    reformer, responder = [], []
+    for label in labels:
+        words = [w.strip("?,.") for w in label["query"].split()]
+        terse = " ".join(w for w in words if w.lower() not in STOPWORDS)[:40]
+        reformer.append(REFORM_PROMPT.format(query=terse))
+        context = [chunks[cid] for cid in label.get("gold_chunks", [])[:5] if cid in chunks]
+        responder.append(ANSWER_PROMPT.format(context=format_context(context), query=label["query"]))
+    return {"reformer": reformer, "responder": responder}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+def run_node(provider, prompts, batch_size):
+    latencies, responses, errors = [], [], []
+    for prompt in prompts:
+        start = time.perf_counter()
+        try:
+            responses.append(provider.generate(prompt))
+            latencies.append(time.perf_counter() - start)
+        except Exception as exc:
+            errors.append(f"{type(exc).__name__}: {exc}")
+
+    result = {"calls": len(prompts), "errors": len(errors), "error_samples": sorted(set(errors))[:3]}
+    if latencies:
+        ms = [s * 1000 for s in latencies]
+        result["latency_ms"] = {"mean": sum(ms) / len(ms), "p50": percentile(ms, 50),
+                                "p95": percentile(ms, 95), "max": max(ms)}
+        n = len(responses)
+        result["input_tokens"] = sum(r.input_tokens for r in responses) / n
+        result["output_tokens"] = sum(r.output_tokens for r in responses) / n
+        result["cost_per_call"] = sum(provider.cost(r) for r in responses) / n
+        result["cost_per_1k_queries"] = result["cost_per_call"] * 1000
+        result["sample"] = responses[0].text[:160]
+
+    if batch_size > 1:
+        start = time.perf_counter()
+        try:
+            for i in range(0, len(prompts), batch_size):
+                provider.generate_batch(prompts[i:i + batch_size])
+            elapsed = time.perf_counter() - start
+            result["batch"] = {"size": batch_size, "seconds": elapsed, "prompts_per_s": len(prompts) / elapsed,
+                               "native": provider.supports_batching
+                                         or getattr(getattr(provider, "provider", None), "supports_batching", False)}
+        except Exception as exc:
+            result["batch"] = {"size": batch_size, "error": f"{type(exc).__name__}: {exc}"}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", action="append", default=[], help="provider spec (repeatable); default fake")
+    parser.add_argument("--node", choices=("reformer", "responder", "both"), default="both")
+    parser.add_argument("--price", action="append", default=[], help="SPEC=input_per_1k,output_per_1k")
+    parser.add_argument("--requests", type=int, default=20, help="prompts per node")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--fake-latency-ms", type=float, default=300.0)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    specs = args.provider or ["fake"]
+    prices = {}
+    for item in args.price:
+        spec, _, values = item.rpartition("=")
+        prices[spec] = tuple(float(v) for v in values.split(","))
+    nodes = ("reformer", "responder") if args.node == "both" else (args.node,)
+    prompts = load_prompts(args.requests)
+
+    server = None
+    report = {"generated_at": datetime.now().isoformat(timespec="seconds"), "requests": args.requests,
+              "providers": {}}
+    try:
+        for spec in specs:
+            build_spec = spec
+            if spec == "fake":
+                if server is None:
+                    server = FakeLLMServer(FakeLLMConfig(latency_ms=args.fake_latency_ms)).start()
+                build_spec = f"fake:{server.url}"
+            cost_in, cost_out = prices.get(spec, (0.0, 0.0))
+            print(f"\n=== {spec} ===")
+            start = time.perf_counter()
+            provider = make_provider(build_spec, cost_per_1k_input=cost_in, cost_per_1k_output=cost_out)
+            load_seconds = time.perf_counter() - start
+            entry = {"load_seconds": load_seconds, "nodes": {}}
+            for node in nodes:
+                entry["nodes"][node] = result = run_node(provider, prompts[node], args.batch_size)
+                latency = result.get("latency_ms", {})
+                print(f"  {node:<10} p50 {latency.get('p50', float('nan')):8.1f} ms  "
+                      f"p95 {latency.get('p95', float('nan')):8.1f} ms  "
+                      f"tokens {result.get('input_tokens', 0):6.0f} in / {result.get('output_tokens', 0):5.0f} out  "
+                      f"${result.get('cost_per_1k_queries', 0):.4f} / 1k queries  errors {result['errors']}")
+                if "batch" in result and "prompts_per_s" in result["batch"]:
+                    print(f"  {'':<10} batch {args.batch_size}: {result['batch']['prompts_per_s']:.2f} prompts/s "
+                          f"({'native' if result['batch']['native'] else 'concurrent calls'})")
+            report["providers"][spec] = entry
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    main()
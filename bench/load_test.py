@@ -0,0 +1,273 @@
+"""
+End-to-end load test of AgenticRAGPipeline.process_query against a fake LLM.
+
+The Gemini API is replaced by rag_pipeline/fake_llm.py (started in-process
+unless --llm-url points at a running one), so results reflect the pipeline and
+a chosen LLM latency / 429 profile rather than a real key's quota.
+
+Targets:
+    - pipeline: process_query over the questions in bench/data/retrieval_queries.jsonl
+                (needs data/vector_store and the cached embedding model)
+    - llm:      generate_content straight against the fake server
+Load models:
+    - closed: --concurrency workers, each sending its next request when the last returns
+    - open:   requests arrive at --qps (Poisson, or --arrivals uniform) regardless of
+              completions; they wait for one of --max-workers threads, and that wait is
+              reported as queueing delay (latency is measured from the scheduled arrival)
+
+Reports throughput, latency / service / queueing percentiles, errors, 429
+retries, queries coalesced with an identical one in flight and, for the
+pipeline, per-node time and per-node queueing delay (from the trace spans, see
+rag_pipeline/metrics.py).
+
+Usage:
+    python bench/load_test.py --mode closed --concurrency 8 --duration 30
+    python bench/load_test.py --mode open --qps 5 --duration 60 --error-rate 0.1 --output load.json
+    python bench/load_test.py --target llm --mode open --qps 50 --latency-ms 300 --max-concurrency 16
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "rag_pipeline"))
+
+from fake_llm import FakeGeminiClient, FakeLLMConfig, FakeLLMServer  # noqa: E402
+from llm import ClientProvider  # noqa: E402
+
+QUERIES = ROOT / "bench" / "data" / "retrieval_queries.jsonl"
+STORE_DIR = ROOT / "data" / "vector_store"
+NODES = ("faq", "analyzer", "reformer", "answer_cache", "retriever", "responder")
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of a non-empty list."""
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+def summarize(values):
+    """Millisecond percentiles of a list of seconds."""
+    if not values:
+        return None
+    ms = [v * 1000 for v in values]
+    return {"mean": sum(ms) / len(ms), "p50": percentile(ms, 50), "p95": percentile(ms, 95),
+            "p99": percentile(ms, 99), "max": max(ms)}
+
+
+def make_pipeline_call(llm_url, store_dir):
+    from agentic_rag import AgenticRAGPipeline
+
+    pipeline = AgenticRAGPipeline(store_dir, llm=ClientProvider(FakeGeminiClient(llm_url)))
+    with open(QUERIES, "r", encoding="utf-8") as f:
+        queries = [json.loads(line)["query"] for line in f if line.strip()]
+
+    def call(i):
+        result = pipeline.process_query(queries[i % len(queries)])
+        return {"retries": result.get("llm_rate_limited", 0), "timings": result.get("timings", {}),
+                "node_waits": result.get("node_waits", {}), "coalesced": result.get("coalesced", False)}
+
+    return call
+
+
+def make_llm_call(llm_url, stream):
+    import google.api_core.exceptions
+
+    client = FakeGeminiClient(llm_url)
+
+    def call(i):
+        prompt = f"Load test prompt {i}: summarise the Bank of Maharashtra home loan processing fee."
+        try:
+            response = client.generate_content(prompt, stream=stream)
+            if stream:
+                "".join(chunk.text for chunk in response)
+        except google.api_core.exceptions.ResourceExhausted:
+            return {"retries": 0, "rate_limited": True}
+        return {"retries": 0}
+
+    return call
+
+
+def _run_one(call, i, scheduled, records, lock):
+    start = time.perf_counter()
+    record = {"scheduled": scheduled, "start": start}
+    try:
+        record.update(call(i))
+        record["ok"] = not record.get("rate_limited")
+    except Exception as exc:
+        record["ok"] = False
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    record["end"] = time.perf_counter()
+    with lock:
+        records.append(record)
+
+
+def closed_loop(call, concurrency, duration, max_requests):
+    records, lock = [], threading.Lock()
+    deadline = time.perf_counter() + duration
+    counter = iter(range(max_requests or sys.maxsize))
+    counter_lock = threading.Lock()
+
+    def worker():
+        while time.perf_counter() < deadline:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            _run_one(call, i, time.perf_counter(), records, lock)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records
+
+
+def open_loop(call, qps, duration, max_workers, arrivals, seed):
+    records, lock = [], threading.Lock()
+    rng = random.Random(seed)
+    n = int(qps * duration)
+    offsets, t = [], 0.0
+    for _ in range(n):
+        offsets.append(t)
+        t += rng.expovariate(qps) if arrivals == "poisson" else 1 / qps
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        origin = time.perf_counter()
+        for i, offset in enumerate(offsets):
+            scheduled = origin + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(_run_one, call, i, scheduled, records, lock)
+    return records
+
+
+def report(records, wall, args):
+    ok = [r for r in records if r["ok"]]
+    result = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "target": args.target,
+        "mode": args.mode,
+        "offered_qps": args.qps if args.mode == "open" else None,
+        "concurrency": args.concurrency if args.mode == "closed" else args.max_workers,
+        "llm": {"latency_ms": args.latency_ms, "sigma": args.sigma, "error_rate": args.error_rate,
+                "max_concurrency": args.max_concurrency, "url": args.llm_url},
+        "requests": len(records),
+        "ok": len(ok),
+        "errors": len(records) - len(ok),
+        "error_samples": sorted({r["error"] for r in records if "error" in r})[:5],
+        "rate_limited": sum(bool(r.get("rate_limited")) for r in records),
+        "retries": sum(r.get("retries", 0) for r in records),
+        "coalesced": sum(bool(r.get("coalesced")) for r in records),
+        "wall_seconds": wall,
+        "throughput_qps": len(ok) / wall if wall else 0.0,
+        "latency_ms": summarize([r["end"] - r["scheduled"] for r in ok]),
+        "service_ms": summarize([r["end"] - r["start"] for r in ok]),
+        "queue_ms": summarize([r["start"] - r["scheduled"] for r in records]),
+    }
+    if args.target == "pipeline":
+        names = sorted({name for r in ok for name in r.get("timings", {})} - {"total"})
+        result["spans_ms"] = {name: summarize([r["timings"][name] for r in ok if name in r["timings"]])
+                              for name in names}
+        result["node_queue_ms"] = {node: summarize([r["node_waits"][node] for r in ok
+                                                     if node in r.get("node_waits", {})])
+                                   for node in NODES}
+    return result
+
+
+def print_report(result):
+    def row(label, stats):
+        if stats:
+            print(f"  {label:<22} {stats['mean']:>9.1f} {stats['p50']:>9.1f} {stats['p95']:>9.1f} "
+                  f"{stats['p99']:>9.1f} {stats['max']:>9.1f}")
+
+    print(f"\n{result['target']} / {result['mode']} loop: {result['requests']} requests in "
+          f"{result['wall_seconds']:.1f}s, {result['throughput_qps']:.2f} ok/s, "
+          f"{result['errors']} errors ({result['rate_limited']} rate limited), {result['retries']} 429 retries, "
+          f"{result['coalesced']} coalesced")
+    for sample in result["error_samples"]:
+        print(f"  error: {sample}")
+    print(f"  {'ms':<22} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    row("latency", result["latency_ms"])
+    row("service", result["service_ms"])
+    row("queue", result["queue_ms"])
+    for name, stats in result.get("spans_ms", {}).items():
+        row(name, stats)
+    for node, stats in result.get("node_queue_ms", {}).items():
+        row(f"{node} queue", stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("pipeline", "llm"), default="pipeline")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--concurrency", type=int, default=4, help="closed loop: concurrent clients")
+    parser.add_argument("--qps", type=float, default=2.0, help="open loop: offered arrival rate")
+    parser.add_argument("--arrivals", choices=("poisson", "uniform"), default="poisson")
+    parser.add_argument("--max-workers", type=int, default=32, help="open loop: requests in flight at most")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--requests", type=int, default=0, help="closed loop: stop after this many (0 = duration only)")
+    parser.add_argument("--stream", action="store_true", help="llm target: use streamGenerateContent")
+    parser.add_argument("--store", default=str(STORE_DIR))
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--seed", type=int, default=0)
+    fake = parser.add_argument_group("fake LLM (ignored with --llm-url)")
+    fake.add_argument("--llm-url", help="use a running fake_llm.py server")
+    fake.add_argument("--latency-ms", type=float, default=800.0)
+    fake.add_argument("--sigma", type=float, default=0.4)
+    fake.add_argument("--error-rate", type=float, default=0.0)
+    fake.add_argument("--max-concurrency", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if not args.llm_url:
+        config = FakeLLMConfig(latency_ms=args.latency_ms, sigma=args.sigma, error_rate=args.error_rate,
+                               max_concurrency=args.max_concurrency, seed=args.seed)
+        server = FakeLLMServer(config).start()
+        args.llm_url = server.url
+    try:
+        if args.target == "pipeline":
+            call = make_pipeline_call(args.llm_url, args.store)
+        else:
+            call = make_llm_call(args.llm_url, args.stream)
+        call(0)  # warm-up: model load, first index touch, connection setup
+
+        start = time.perf_counter()
+        if args.mode == "closed":
+            records = closed_loop(call, args.concurrency, args.duration, args.requests)
+        else:
+            records = open_loop(call, args.qps, args.duration, args.max_workers, args.arrivals, args.seed)
+        wall = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    result = report(records, wall, args)
+    if server is not None:
+        result["llm_server"] = server.stats
+    print_report(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
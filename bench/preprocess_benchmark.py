@@ -0,0 +1,106 @@
+"""
+Benchmark the compiled cleaning engine in utils/preprocess_text.py against the
+original multi-pass clean_text / split_into_sections.
+
+The data/raw corpus is concatenated and replicated N times (default 1000x,
+roughly 125 MB) and written to a temporary file, then:
+    - legacy:    read whole file, 10 re.sub passes, split_into_sections
+    - compiled:  read whole file, compiled clean_text, split_into_sections
+    - streaming: iter_clean_lines + iter_sections over the open file
+
+Usage:
+    python bench/preprocess_benchmark.py [--replicate 1000]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "utils"))
+
+import preprocess_text  # noqa: E402
+
+
+def legacy_clean_text(text):
+    """The original clean_text, kept verbatim as the benchmark baseline."""
+    text = re.sub(r"\n\s*\n", "\n\n", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    boilerplate_patterns = [
+        r"©\s*\d{4}.*",
+        r"All rights reserved.*",
+        r"Privacy Policy.*",
+        r"Terms of Service.*",
+        r"Cookie Policy.*",
+        r"Subscribe to.*",
+        r"Login\s*|\s*Signup.*"
+    ]
+    for bp in boilerplate_patterns:
+        text = re.sub(bp, "", text, flags=re.IGNORECASE)
+    text = text.replace("“", '"').replace("”", '"')
+    text = text.replace("‘", "'").replace("’", "'")
+    text = text.replace("\t", " ")
+    return text.strip()
+
+
+def run_legacy(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return preprocess_text.split_into_sections(legacy_clean_text(f.read()))
+
+
+def run_compiled(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return preprocess_text.split_into_sections(preprocess_text.clean_text(f.read()))
+
+
+def run_streaming(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return list(preprocess_text.iter_sections(preprocess_text.iter_clean_lines(f)))
+
+
+def measure(fn, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    sections = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sections, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicate", type=int, default=1000)
+    args = parser.parse_args()
+
+    corpus = "\n\n".join(p.read_text(encoding="utf-8") for p in sorted((ROOT / "data" / "raw").glob("*.txt")))
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for _ in range(args.replicate):
+                f.write(corpus)
+                f.write("\n\n")
+        size_mb = os.path.getsize(path) / 1e6
+
+        print(f"Corpus: {size_mb:.1f} MB ({args.replicate}x data/raw)\n")
+        print(f"{'variant':<10} {'seconds':>9} {'MB/s':>8} {'peak MB':>9} {'sections':>9}")
+
+        baseline = None
+        for name, fn in (("legacy", run_legacy), ("compiled", run_compiled), ("streaming", run_streaming)):
+            sections, elapsed, peak = measure(fn, path)
+            if baseline is None:
+                baseline = sections
+            elif sections != baseline:
+                print(f"  warning: {name} output differs from legacy")
+            print(f"{name:<10} {elapsed:>9.2f} {size_mb / elapsed:>8.1f} {peak / 1e6:>9.1f} {len(sections):>9}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
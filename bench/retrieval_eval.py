@@ -0,0 +1,315 @@
+"""
+Offline retrieval quality and latency for VectorStoreManager.retrieve.
+
+Runs the labelled BOM loan questions in bench/data/retrieval_queries.jsonl against
+one or more store configurations and reports, per configuration:
+    - hit@k, recall@k and MRR over relevant chunks, plus file-level hit@k
+    - encode / search / total latency percentiles (from the retriever's trace spans)
+    - queries per second over all repeats
+    - context_chars@k: characters of retrieved text per query, i.e. prompt size
+
+A chunk is relevant to a query when it comes from one of the query's gold_files
+and contains one of its answer spans (case and whitespace insensitive), so the
+labels stay valid when chunking changes. gold_chunks records the relevant
+chunk_ids in data/chunks at labelling time (refresh with --relabel); gold-chunk
+recall is reported for stores built from those same chunks.
+
+Configurations are built from data/chunks (or re-chunked from data/processed_data)
+into a temporary store; nothing is downloaded, the embedding model must already
+be in the local cache.
+    --config NAME:key=value,...   keys: store, index_type, rerank_factor, model,
+                                  chunk_size, overlap (chunk_size/overlap re-chunk),
+                                  small_to_big=1, child_size, max_parent_chars
+small_to_big configurations index sentence-level children of the sections in
+data/processed_data and return whole sections (see rag_pipeline/small_to_big.py);
+k then counts sections, so compare hit@k together with context_chars@k.
+Default configurations: the live data/vector_store, every index type and small_to_big.
+
+The JSON report (--output) has stable key order and rounded numbers, so two runs
+can be diffed directly or compared with --baseline.
+
+Usage:
+    python bench/retrieval_eval.py [--k 1 3 5 10] [--repeats 3] [--output report.json]
+    python bench/retrieval_eval.py --config flat512:index_type=ivf_flat --config sq8:index_type=sq8
+    python bench/retrieval_eval.py --config small:chunk_size=256,overlap=25 --baseline old.json
+    python bench/retrieval_eval.py --config chunks:index_type=ivf_flat --config s2b:small_to_big=1,max_parent_chars=1000
+    python bench/retrieval_eval.py --relabel
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import numpy as np  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "rag_pipeline"))
+
+from agentic_rag import VectorStoreManager  # noqa: E402
+from chunking import JSONLChunkingPipeline  # noqa: E402
+from embedding import INDEX_TYPES, EmbeddingPipeline, FAISSVectorStore  # noqa: E402
+from metrics import Registry, Tracer  # noqa: E402
+from small_to_big import SmallToBigIndex, iter_parents  # noqa: E402
+
+QUERIES = ROOT / "bench" / "data" / "retrieval_queries.jsonl"
+CHUNKS_DIR = ROOT / "data" / "chunks"
+PROCESSED_DIR = ROOT / "data" / "processed_data"
+STORE_DIR = ROOT / "data" / "vector_store"
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+def load_queries(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_chunks(chunks_dir):
+    chunks = []
+    for chunk_file in sorted(Path(chunks_dir).glob("chunks_*.jsonl")):
+        with open(chunk_file, "r", encoding="utf-8") as f:
+            chunks.extend(json.loads(line) for line in f if line.strip())
+    return chunks
+
+
+def rechunk(processed_dir, chunk_size, overlap):
+    pipeline = JSONLChunkingPipeline(chunk_size=chunk_size, overlap=overlap)
+    chunks = []
+    for jsonl_file in sorted(Path(processed_dir).glob("*.jsonl")):
+        chunks.extend(pipeline.process_jsonl_file(str(jsonl_file)))
+    return chunks
+
+
+def _normalize(text):
+    return " ".join(text.split()).lower()
+
+
+def source_stems(chunk):
+    """Stems of the files a chunk came from, including near-duplicates merged into it at build time."""
+    files = [chunk.get("original_file", "")] + [dup.get("original_file", "") for dup in chunk.get("duplicates", ())]
+    return {Path(f).stem for f in files}
+
+
+def is_relevant(chunk, label):
+    """From a gold file (any raw extension) and containing an answer span."""
+    if not source_stems(chunk) & {Path(f).stem for f in label["gold_files"]}:
+        return False
+    content = _normalize(chunk.get("content", ""))
+    return any(_normalize(answer) in content for answer in label["answers"])
+
+
+def relabel(queries, chunks):
+    """Fill gold_chunks from the current chunks; returns labels with no relevant chunk."""
+    unanswerable = []
+    for label in queries:
+        label["gold_chunks"] = [c["chunk_id"] for c in chunks if is_relevant(c, label)]
+        if not label["gold_chunks"]:
+            unanswerable.append(label["id"])
+    return unanswerable
+
+
+def parse_config(text):
+    name, _, body = text.partition(":")
+    config = {}
+    for item in filter(None, body.split(",")):
+        key, _, value = item.partition("=")
+        config[key.strip()] = int(value) if value.strip().isdigit() else value.strip()
+    return name, config
+
+
+def default_configs():
+    configs = {}
+    if STORE_DIR.exists():
+        configs["live"] = {"store": str(STORE_DIR)}
+    configs.update((index_type, {"index_type": index_type}) for index_type in INDEX_TYPES)
+    configs["small_to_big"] = {"small_to_big": 1}
+    return configs
+
+
+def build_store(config, save_dir, pipelines):
+    """Embed the configuration's chunks into a store at save_dir; returns (chunks, seconds)."""
+    model = config.get("model", DEFAULT_MODEL)
+    if model not in pipelines:
+        pipelines[model] = EmbeddingPipeline(model_name=model)
+    if "chunk_size" in config or "overlap" in config:
+        chunks = rechunk(PROCESSED_DIR, config.get("chunk_size", 512), config.get("overlap", 50))
+    else:
+        chunks = load_chunks(CHUNKS_DIR)
+
+    start = time.perf_counter()
+    store = FAISSVectorStore(pipelines[model], index_type=config.get("index_type", "ivf_flat"),
+                             rerank_factor=config.get("rerank_factor", 4))
+    store.add_chunks(chunks)
+    if config.get("small_to_big"):
+        store.small_to_big = SmallToBigIndex.build(pipelines[model], iter_parents(PROCESSED_DIR),
+                                                   config.get("child_size", 200))
+    store.save(save_dir)
+    return chunks, time.perf_counter() - start
+
+
+def percentiles(seconds):
+    ms = np.asarray(seconds) * 1000
+    return {"mean": float(ms.mean()), "p50": float(np.percentile(ms, 50)),
+            "p95": float(np.percentile(ms, 95)), "p99": float(np.percentile(ms, 99))}
+
+
+def evaluate(manager, queries, ks, repeats):
+    """Quality from the first pass, latency and QPS over all passes."""
+    tracer = Tracer(Registry())
+    max_k = max(ks)
+    documents = manager.documents
+    chunk_ids = {chunk.get("chunk_id") for chunk in documents}
+    n_relevant = {label["id"]: sum(is_relevant(c, label) for c in documents) for label in queries}
+
+    manager.retrieve(queries[0]["query"], k=max_k)  # warm-up
+    timings = {"encode": [], "search": [], "total": []}
+    per_query = []
+    start = time.perf_counter()
+    for repeat in range(repeats):
+        for label in queries:
+            with tracer.trace() as trace:
+                results = manager.retrieve(label["query"], k=max_k)
+            spans = trace.timings()
+            timings["encode"].append(spans.get("retriever.encode", 0.0))
+            timings["search"].append(spans.get("retriever.search", 0.0))
+            timings["total"].append(spans["total"])
+            if repeat == 0:
+                per_query.append((label, results))
+    wall = time.perf_counter() - start
+
+    metrics = {}
+    for k in ks:
+        hits, recalls, file_hits, gold_recalls, chars = [], [], [], [], []
+        for label, results in per_query:
+            top = results[:k]
+            chars.append(sum(len(c.get("content", "")) for c in top))
+            relevant = sum(is_relevant(c, label) for c in top)
+            hits.append(relevant > 0)
+            if n_relevant[label["id"]]:
+                recalls.append(relevant / min(n_relevant[label["id"]], k))
+            gold_files = {Path(f).stem for f in label["gold_files"]}
+            file_hits.append(any(source_stems(c) & gold_files for c in top))
+            gold = set(label.get("gold_chunks", []))
+            if gold and gold <= chunk_ids:
+                gold_recalls.append(len(gold & {c.get("chunk_id") for c in top}) / min(len(gold), k))
+        metrics[f"hit@{k}"] = float(np.mean(hits))
+        metrics[f"recall@{k}"] = float(np.mean(recalls)) if recalls else None
+        metrics[f"file_hit@{k}"] = float(np.mean(file_hits))
+        metrics[f"gold_chunk_recall@{k}"] = float(np.mean(gold_recalls)) if gold_recalls else None
+        metrics[f"context_chars@{k}"] = float(np.mean(chars))
+
+    ranks = []
+    for label, results in per_query:
+        rank = next((i for i, c in enumerate(results, 1) if is_relevant(c, label)), None)
+        ranks.append(rank)
+    metrics[f"mrr@{max_k}"] = float(np.mean([1 / r if r else 0.0 for r in ranks]))
+
+    return {
+        "metrics": metrics,
+        "latency_ms": {stage: percentiles(values) for stage, values in timings.items()},
+        "qps": len(timings["total"]) / wall,
+        "unanswerable": sorted(label["id"] for label in queries if not n_relevant[label["id"]]),
+        "per_query": {label["id"]: {"first_relevant_rank": rank,
+                                    "top": [c.get("chunk_id") for c in results]}
+                      for (label, results), rank in zip(per_query, ranks)},
+    }
+
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, dict):
+        return {key: _rounded(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_rounded(v) for v in value]
+    return value
+
+
+def print_report(report, baseline=None):
+    base = (baseline or {}).get("configs", {})
+    for name, result in report["configs"].items():
+        latency = result["latency_ms"]
+        print(f"\n[{name}] {result['config']}  chunks={result['n_chunks']}  qps={result['qps']:.1f}")
+        print(f"  encode p50/p95/p99 ms: {latency['encode']['p50']:.2f} / {latency['encode']['p95']:.2f} / "
+              f"{latency['encode']['p99']:.2f}")
+        print(f"  search p50/p95/p99 ms: {latency['search']['p50']:.3f} / {latency['search']['p95']:.3f} / "
+              f"{latency['search']['p99']:.3f}")
+        for metric, value in result["metrics"].items():
+            if value is None:
+                continue
+            old = base.get(name, {}).get("metrics", {}).get(metric)
+            fmt = ".1f" if metric.startswith("context_chars") else ".4f"
+            delta = f"  ({value - old:+{fmt}})" if old is not None else ""
+            print(f"  {metric:<24} {value:{fmt}}{delta}")
+        if result["unanswerable"]:
+            print(f"  no relevant chunk for: {', '.join(result['unanswerable'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", default=str(QUERIES))
+    parser.add_argument("--config", action="append", default=[], help="NAME:key=value,... (repeatable)")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--repeats", type=int, default=3, help="latency passes over the query set")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier JSON report to print metric deltas against")
+    parser.add_argument("--relabel", action="store_true", help="refresh gold_chunks from data/chunks and exit")
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+
+    if args.relabel:
+        unanswerable = relabel(queries, load_chunks(CHUNKS_DIR))
+        with open(args.queries, "w", encoding="utf-8") as f:
+            for label in queries:
+                f.write(json.dumps(label, ensure_ascii=False) + "\n")
+        print(f"Relabelled {len(queries)} queries; no relevant chunk for: {unanswerable or 'none'}")
+        return
+
+    configs = dict(parse_config(text) for text in args.config) if args.config else default_configs()
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "queries": {"path": os.path.relpath(args.queries, ROOT), "count": len(queries)},
+        "k": args.k,
+        "repeats": args.repeats,
+        "configs": {},
+    }
+
+    pipelines = {}
+    for name, config in configs.items():
+        print(f"\n=== {name}: {config} ===")
+        with tempfile.TemporaryDirectory() as tmp:
+            build_seconds = None
+            store_dir = config.get("store")
+            if store_dir is None:
+                _, build_seconds = build_store(config, tmp, pipelines)
+                store_dir = tmp
+            manager = VectorStoreManager(store_dir, model_name=config.get("model", DEFAULT_MODEL),
+                                         small_to_big=bool(config["small_to_big"]) if "small_to_big" in config else None,
+                                         max_parent_chars=config.get("max_parent_chars", 1500))
+            result = evaluate(manager, queries, args.k, args.repeats)
+        report["configs"][name] = {"config": config, "n_chunks": len(manager.documents),
+                                   "build_seconds": build_seconds, **result}
+
+    report = _rounded(report)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
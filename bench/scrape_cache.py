@@ -0,0 +1,97 @@
+"""
+Conditional fetching: cold run vs not-modified run vs edited pages, offline.
+
+Copies the saved fixtures to a temporary directory, serves them with
+fixture_server.py (ETag / Last-Modified per --validators) and runs
+scrapping_scripts/run_all_scripts.py four times into one output directory:
+    - cold:     empty fetch cache, every script runs
+    - warm:     nothing changed, every script should be skipped after 304s
+    - markup:   one page gets an HTML comment; its script re-runs, output "unchanged"
+    - content:  one page gets new paragraph text; its script re-runs, output "changed"
+Reports wall time and per-script status (from changed_pages.json) for each run.
+
+Capture fixtures once from the live site first:
+    python scrapping_scripts/run_all_scripts.py --capture scrapping_scripts/fixtures
+
+Usage:
+    python bench/scrape_cache.py [--fixtures scrapping_scripts/fixtures] [--validators both] [script_2 ...]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scrapping_scripts"))
+
+from fetch_cache import FetchCache  # noqa: E402
+from fixture_server import VALIDATORS, fixture_path, start_server  # noqa: E402
+from run_all_scripts import run_all_scripts  # noqa: E402
+
+
+def edit_fixture(path, old, new):
+    with open(path, "rb") as f:
+        body = f.read()
+    with open(path, "wb") as f:
+        f.write(body.replace(old, new, 1) if old else body + new)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=str(ROOT / "scrapping_scripts" / "fixtures"))
+    parser.add_argument("--validators", choices=VALIDATORS, default="both")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("scripts", nargs="*")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.fixtures):
+        raise SystemExit(f"No fixtures at {args.fixtures}; capture them first (see --help)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures_dir = os.path.join(tmp, "fixtures")
+        output_dir = os.path.join(tmp, "raw")
+        shutil.copytree(args.fixtures, fixtures_dir)
+        server, base_url = start_server(fixtures_dir, validators=args.validators)
+        try:
+            reports = {}
+
+            def run(name):
+                print(f"\n##### {name} #####")
+                reports[name] = asyncio.run(run_all_scripts(args.scripts, args.concurrency, base_url=base_url,
+                                                            output_dir=output_dir))
+
+            run("cold")
+            run("warm")
+
+            # The first page of the first script that recorded one
+            jobs = FetchCache(output_dir).jobs
+            target_job, target_url = next((name, url) for name, entry in sorted(jobs.items())
+                                          for url in entry["pages"])
+            target = fixture_path(target_url, fixtures_dir)
+            print(f"\nEditing {target_url} (used by {target_job})")
+
+            edit_fixture(target, None, b"\n<!-- markup-only edit -->\n")
+            run("markup")
+            edit_fixture(target, b"<p>", b"<p>Updated for the benchmark. ")
+            run("content")
+        finally:
+            server.shutdown()
+
+    print("\n" + "=" * 50)
+    print(f"{'run':<10} {'wall s':>8}  statuses")
+    for name, report in reports.items():
+        statuses = Counter(result["status"] for result in report["changed"].values())
+        print(f"{name:<10} {report['wall_time']:>8.2f}  "
+              + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items())))
+    for name in ("markup", "content"):
+        result = reports[name]["changed"].get(target_job, {})
+        print(f"{target_job} after {name} edit: {result.get('status')} "
+              f"({len(result.get('changed_pages', []))} pages changed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Spec engine: single page.evaluate DOM walk vs per-element Playwright calls.
+
+Every spec in scrapping_scripts/specs is scraped from the saved fixtures with
+both engine backends:
+    - handles:  query_selector / inner_text per element, like the old scripts
+    - evaluate: one in-page DOM walk per page
+Reports total and extraction time per spec, whether both backends agree, and
+whether the output matches the committed data/raw/<output> file.
+
+--check is the parity check for spec changes: every spec runs once per backend,
+each output that differs from data/raw/<output> is printed as a unified diff and
+the exit status is 1 if any did. The committed fixtures are reconstructed from
+data/raw (one page per URL the specs visit); re-capture them from the live site
+with:
+    python scrapping_scripts/run_all_scripts.py --capture scrapping_scripts/fixtures
+
+Usage:
+    python bench/scrape_engine.py [--fixtures scrapping_scripts/fixtures] [--repeats 3] [script_7 ...]
+    python bench/scrape_engine.py --check
+"""
+import argparse
+import difflib
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scrapping_scripts"))
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+
+import engine  # noqa: E402
+import scraper_utils  # noqa: E402
+from fixture_server import start_server  # noqa: E402
+
+LIVE_ORIGIN = "https://bankofmaharashtra.bank.in"
+
+
+def scrape(spec, browser, backend):
+    scraper_utils._timings.clear()
+    start = time.perf_counter()
+    out = engine.run_spec(spec, browser, backend)
+    total = time.perf_counter() - start
+    return "\n".join(out.lines), total, sum(scraper_utils._timings["extract"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=str(ROOT / "scrapping_scripts" / "fixtures"))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--check", action="store_true",
+                        help="run each spec once per backend, diff against data/raw and fail on any difference")
+    parser.add_argument("specs", nargs="*", help="spec names (default: every spec)")
+    args = parser.parse_args()
+    if args.check:
+        args.repeats = 1
+
+    if not os.path.isdir(args.fixtures):
+        raise SystemExit(f"No fixtures at {args.fixtures}; capture them first (see --help)")
+
+    server, base_url = start_server(os.path.abspath(args.fixtures))
+    os.environ["BOM_BASE_URL"] = base_url
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            print(f"{'spec':<14} {'handles s':>10} {'evaluate s':>11} {'extract h/e ms':>16} {'speedup':>8}  "
+                  f"{'agree':>5} {'= raw':>5}")
+            diffs = []
+            for spec_path in sorted(Path(engine.SPECS_DIR).glob("*.json")):
+                if args.specs and spec_path.stem not in args.specs:
+                    continue
+                spec = engine.load_spec(spec_path)
+                best = {}
+                for backend in ("handles", "evaluate"):
+                    runs = [scrape(spec, browser, backend) for _ in range(args.repeats)]
+                    best[backend] = min(runs, key=lambda run: run[1])
+
+                text, _, _ = best["evaluate"]
+                reference = ROOT / "data" / "raw" / spec["output"]
+                expected = reference.read_text(encoding="utf-8") if reference.exists() else ""
+                for backend in ("handles", "evaluate"):
+                    # URL: lines carry the fixture server's origin instead of the live site's
+                    live_text = best[backend][0].replace(base_url, LIVE_ORIGIN)
+                    if live_text != expected:
+                        diffs.append(difflib.unified_diff(expected.splitlines(True), live_text.splitlines(True),
+                                                          f"data/raw/{spec['output']}",
+                                                          f"{spec_path.stem} ({backend})"))
+                matches_raw = expected == text.replace(base_url, LIVE_ORIGIN)
+                h_total, e_total = best["handles"][1], best["evaluate"][1]
+                h_extract, e_extract = best["handles"][2], best["evaluate"][2]
+                print(f"{spec_path.stem:<14} {h_total:>10.2f} {e_total:>11.2f} "
+                      f"{h_extract * 1000:>7.0f}/{e_extract * 1000:<8.0f} {h_extract / e_extract:>7.1f}x  "
+                      f"{str(best['handles'][0] == text):>5} {str(matches_raw):>5}")
+            browser.close()
+    finally:
+        server.shutdown()
+
+    if args.check:
+        for diff in diffs:
+            sys.stdout.writelines(diff)
+            print()
+        if diffs:
+            raise SystemExit(f"{len(diffs)} spec output(s) differ from data/raw")
+
+
+if __name__ == "__main__":
+    main()
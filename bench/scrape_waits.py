@@ -0,0 +1,74 @@
+"""
+Fixed sleeps vs event-driven waits for the full scraper run, offline.
+
+Runs scrapping_scripts/run_all_scripts.py twice against the saved fixtures
+(served by fixture_server.py), writing output to temporary directories:
+    - fixed:  BOM_FIXED_WAITS=1, the old unconditional 1-2 s sleeps
+    - events: selector / pane-visible / network-idle waits
+then reports total wall time, time per action and whether both runs produced
+identical .txt files.
+
+Capture fixtures once from the live site first:
+    python scrapping_scripts/run_all_scripts.py --capture scrapping_scripts/fixtures
+
+Usage:
+    python bench/scrape_waits.py [--fixtures scrapping_scripts/fixtures] [--concurrency 4]
+"""
+import argparse
+import asyncio
+import filecmp
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scrapping_scripts"))
+
+from fixture_server import start_server  # noqa: E402
+from run_all_scripts import run_all_scripts  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=str(ROOT / "scrapping_scripts" / "fixtures"))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("scripts", nargs="*")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.fixtures):
+        raise SystemExit(f"No fixtures at {args.fixtures}; capture them first (see --help)")
+
+    server, base_url = start_server(os.path.abspath(args.fixtures))
+    try:
+        reports = {}
+        with tempfile.TemporaryDirectory() as fixed_dir, tempfile.TemporaryDirectory() as events_dir:
+            for name, output_dir, fixed in (("fixed", fixed_dir, True), ("events", events_dir, False)):
+                print(f"\n##### {name} waits #####")
+                reports[name] = asyncio.run(run_all_scripts(
+                    args.scripts, args.concurrency, base_url=base_url, output_dir=output_dir, fixed_waits=fixed
+                ))
+
+            names = sorted(os.listdir(fixed_dir))
+            _, mismatch, errors = filecmp.cmpfiles(fixed_dir, events_dir, names, shallow=False)
+    finally:
+        server.shutdown()
+
+    print("\n" + "=" * 50)
+    print(f"{'action':<12} {'fixed s':>9} {'events s':>9}")
+    actions = sorted(set(reports["fixed"]["actions"]) | set(reports["events"]["actions"]))
+    for action in actions:
+        fixed_s = reports["fixed"]["actions"].get(action, (0, 0.0))[1]
+        events_s = reports["events"]["actions"].get(action, (0, 0.0))[1]
+        print(f"{action:<12} {fixed_s:>9.2f} {events_s:>9.2f}")
+
+    fixed_total = reports["fixed"]["wall_time"]
+    events_total = reports["events"]["wall_time"]
+    print(f"{'wall time':<12} {fixed_total:>9.2f} {events_total:>9.2f}  "
+          f"({fixed_total / events_total:.2f}x faster)")
+    print(f"Output files: {len(names)} compared, {len(mismatch) + len(errors)} differ"
+          + (f" ({', '.join(mismatch + errors)})" if mismatch or errors else ""))
+
+
+if __name__ == "__main__":
+    main()
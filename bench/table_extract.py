@@ -0,0 +1,84 @@
+"""
+Table extraction: one evaluate per table vs per-row/per-cell Playwright calls.
+
+Opens each page from the saved fixtures and serializes every top-level table on
+it (nested sub-tables and lists included) with both table_extract backends:
+    - handles:  query_selector_all / inner_text per row, cell and list, like the old scripts
+    - evaluate: serialize_table, one round trip per table
+Reports per-page table count, extraction time for each backend and whether both
+produced identical JSON (so the rendered text is identical too).
+
+Capture fixtures once from the live site first:
+    python scrapping_scripts/run_all_scripts.py --capture scrapping_scripts/fixtures
+
+Usage:
+    python bench/table_extract.py [--fixtures scrapping_scripts/fixtures] [--repeats 3]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scrapping_scripts"))
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+
+import table_extract  # noqa: E402
+from fixture_server import start_server  # noqa: E402
+from scraper_utils import goto, new_page  # noqa: E402
+
+PAGES = {
+    "script_2": "https://bankofmaharashtra.in/maha-super-flexi-housing-loan-scheme",
+    "script_5": "https://bankofmaharashtra.in/mahabank-vehicle-loan-scheme-for-two-wheelers-loans",
+    "script_6": "https://bankofmaharashtra.in/mahabank-vehicle-loan-scheme-for-second-hand-car",
+    "script_16_ROI": "https://bankofmaharashtra.in/retail-interest-rates",
+}
+# Outermost tables only; nested ones are serialized as part of their parent
+TOP_LEVEL_TABLES = "table:not(table table)"
+
+BACKENDS = {"handles": table_extract.serialize_table_handles, "evaluate": table_extract.serialize_table}
+
+
+def extract_all(tables, serialize):
+    start = time.perf_counter()
+    data = [serialize(table) for table in tables]
+    return data, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=str(ROOT / "scrapping_scripts" / "fixtures"))
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.fixtures):
+        raise SystemExit(f"No fixtures at {args.fixtures}; capture them first (see --help)")
+
+    server, base_url = start_server(os.path.abspath(args.fixtures))
+    os.environ["BOM_BASE_URL"] = base_url
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            print(f"{'page':<14} {'tables':>6} {'handles ms':>11} {'evaluate ms':>12} {'speedup':>8} {'agree':>6}")
+            for name, url in PAGES.items():
+                page = new_page(browser)
+                goto(page, url)
+                tables = page.query_selector_all(TOP_LEVEL_TABLES)
+                best = {}
+                for backend, serialize in BACKENDS.items():
+                    runs = [extract_all(tables, serialize) for _ in range(args.repeats)]
+                    best[backend] = min(runs, key=lambda run: run[1])
+                h_data, h_time = best["handles"]
+                e_data, e_time = best["evaluate"]
+                print(f"{name:<14} {len(tables):>6} {h_time * 1000:>11.0f} {e_time * 1000:>12.1f} "
+                      f"{h_time / max(e_time, 1e-9):>7.0f}x {str(h_data == e_data):>6}")
+                page.context.close()
+            browser.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Character-budget vs token-budget chunking for all-MiniLM-L6-v2.
+
+For each strategy over data/processed_data, reports:
+    - number of chunks and mean word-pieces per chunk
+    - chunks longer than the model's max sequence length (silently truncated)
+    - fill ratio (mean tokens / max tokens)
+    - embedding throughput (chunks/s and useful tokens/s)
+
+Usage:
+    python bench/token_chunking.py [--chunk-size 512] [--overlap 50] [--overlap-tokens 32]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "rag_pipeline"))
+
+from chunking import JSONLChunkingPipeline, TokenBudgetChunker  # noqa: E402
+
+
+def chunk_corpus(pipeline: JSONLChunkingPipeline) -> list:
+    texts = []
+    for jsonl_file in sorted((ROOT / "data" / "processed_data").glob("*.jsonl")):
+        texts.extend(chunk["content"] for chunk in pipeline.process_jsonl_file(str(jsonl_file)))
+    return texts
+
+
+def measure(name: str, texts: list, model: SentenceTransformer, batch_size: int) -> dict:
+    tokenizer = model.tokenizer
+    max_tokens = model.max_seq_length
+    lengths = np.array([len(ids) for ids in tokenizer(texts)["input_ids"]])
+    kept = np.minimum(lengths, max_tokens)
+
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    start = time.perf_counter()
+    model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "strategy": name,
+        "chunks": len(texts),
+        "mean_tokens": round(float(lengths.mean()), 1),
+        "truncated": int((lengths > max_tokens).sum()),
+        "tokens_lost": int((lengths - kept).sum()),
+        "fill_ratio": round(float(kept.mean() / max_tokens), 3),
+        "chunks_per_s": round(len(texts) / elapsed, 1),
+        "tokens_per_s": round(float(kept.sum()) / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--overlap-tokens", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    model = SentenceTransformer(args.model, device="cpu")
+
+    char_texts = chunk_corpus(JSONLChunkingPipeline(chunk_size=args.chunk_size, overlap=args.overlap))
+    token_chunker = TokenBudgetChunker(tokenizer=model.tokenizer, max_seq_length=model.max_seq_length,
+                                       overlap_tokens=args.overlap_tokens)
+    token_texts = chunk_corpus(JSONLChunkingPipeline(chunker=token_chunker))
+
+    rows = [
+        measure(f"chars={args.chunk_size}", char_texts, model, args.batch_size),
+        measure(f"tokens={token_chunker.max_tokens}", token_texts, model, args.batch_size),
+    ]
+
+    columns = list(rows[0].keys())
+    print(" ".join(f"{c:>14}" for c in columns))
+    for row in rows:
+        print(" ".join(f"{row[c]!s:>14}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
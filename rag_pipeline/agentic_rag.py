@@ -1,29 +1,65 @@
+import asyncio
 import json
 import os
-from typing import Any, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Union
 from pathlib import Path
 import faiss
+import numpy as np
 from sentence_transformers import SentenceTransformer
-import google.generativeai as genai
 from langgraph.graph import StateGraph, END
 from typing_extensions import TypedDict
+import threading
 import time
 import google.api_core.exceptions 
 from dotenv import load_dotenv
+from answer_cache import AnswerCache, content_hash
+from embedding import exact_rerank, load_faq_index, resolve_store_dir, verify_manifest
+from llm import GeminiProvider, LLMProvider, RateLimiter, providers_from_env
+from metrics import Registry, Tracer, serve_metrics, span
+from singleflight import SingleFlight, normalize_query
+from small_to_big import SmallToBigIndex
     
 load_dotenv()
 
-# helper to wrap generate_content with retry/backoff for 429s
-def _safe_generate(self, prompt: str, retries: int = 2, backoff: float = 1.5):
+# LLM nodes; each can be served by a different provider (see llm.py)
+LLM_NODES = ("reformer", "responder")
+
+REFORM_PROMPT = """Rewrite this user query to be clear and specific about Bank of Maharashtra loan products. Keep it concise.
+Query: "{query}"
+Rewritten:"""
+
+ANSWER_PROMPT = """You are a helpful assistant for Bank of Maharashtra loan products.
+Use only the provided context. Give a clear, concise, but descriptive answer (2–4 sentences), and include key comparisons or conditions if relevant.
+
+Context:
+{context}
+
+User Query: {query}
+
+Answer with a short, well-structured explanation:"""
+
+
+def format_context(context: List[Dict]) -> str:
+    return "\n\n".join([f"[Source {i+1}] {c['content']}" for i, c in enumerate(context)])
+
+
+# helper to wrap the stage's provider with retry/backoff for 429s
+# (traced as "<stage>.llm" per attempt and "<stage>.backoff" per sleep)
+def _safe_generate(self, prompt: str, retries: int = 2, backoff: float = 1.5, stage: str = "responder"):
     last_exc = None
+    llm = self.llms[stage]
     for attempt in range(retries + 1):
         try:
-            return self.client.generate_content(prompt)
+            with span(f"{stage}.llm"):
+                return llm.generate(prompt)
         except google.api_core.exceptions.ResourceExhausted as exc:
             last_exc = exc
+            self.tracer.count("llm_rate_limited", stage)
             # avoid hammering the free-tier; back off
             sleep_s = backoff ** attempt
-            time.sleep(sleep_s)
+            with span(f"{stage}.backoff"):
+                time.sleep(sleep_s)
         except Exception as exc:
             last_exc = exc
             break
@@ -36,77 +72,350 @@ class RAGState(TypedDict):
     needs_reform: bool
     context: Optional[List[Dict]]
     response: Optional[str]
+    faq_match: Optional[Dict]        # FAQ pair answered directly, if any
+    cached_answer: Optional[Dict]    # precomputed answer served, if any (see answer_cache.py)
+    query_embedding: Optional[Any]   # embedding of embedded_query, reused by the retriever
+    embedded_query: Optional[str]
+
+
+class _StoreSnapshot:
+    """One loaded store version; never mutated after construction."""
+    
+    def __init__(self, version: Optional[str], index, metadata: List[Dict],
+                 vectors: Optional[np.ndarray], rerank_factor: int, faq_index=None,
+                 faqs: Optional[List[Dict]] = None, small_to_big: Optional[SmallToBigIndex] = None):
+        self.version = version
+        self.index = index
+        self.metadata = metadata
+        self.vectors = vectors
+        self.rerank_factor = rerank_factor
+        self.faq_index = faq_index
+        self.faqs = faqs or []
+        self.small_to_big = small_to_big
+        self.chunk_hashes: Optional[Dict[str, str]] = None
 
 
 class VectorStoreManager:
-    """Manages FAISS vector store loading and retrieval."""
+    """
+    Manages FAISS vector store loading and retrieval.
     
-    def __init__(self, vector_store_dir: str, model_name: str = "all-MiniLM-L6-v2"):
+    The loaded store is held as a single immutable snapshot. Hot reload builds
+    the new snapshot off to the side and swaps the reference, so queries that
+    already grabbed the old one finish on it and it is freed right after.
+    """
+    
+    def __init__(self, vector_store_dir: str, model_name: str = "all-MiniLM-L6-v2",
+                 auto_reload: bool = False, reload_interval: float = 5.0,
+                 small_to_big: Optional[bool] = None, max_parent_chars: int = 1500):
+        """
+        Args:
+            small_to_big: Search sentence-level children and return their sections (see
+                          small_to_big.py); None uses it whenever the store version has one
+            max_parent_chars: Sections longer than this are cut to a window around the match
+        """
         self.vector_store_dir = vector_store_dir
         self.model_name = model_name
+        self.small_to_big = small_to_big
+        self.max_parent_chars = max_parent_chars
         self.embedding_model = SentenceTransformer(model_name, device="cpu")
-        self.index = None
-        self.metadata = []
-        self._load_vector_store()
+        self._reload_lock = threading.Lock()
+        self._stop_reload = threading.Event()
+        self._reload_thread = None
+        self._snapshot = self._load_vector_store()
+        if auto_reload:
+            self.start_auto_reload(reload_interval)
+    
+    @property
+    def version(self) -> Optional[str]:
+        return self._snapshot.version
+    
+    @property
+    def index(self):
+        return self._snapshot.index
+    
+    @property
+    def metadata(self) -> List[Dict]:
+        return self._snapshot.metadata
+    
+    @property
+    def vectors(self) -> Optional[np.ndarray]:
+        return self._snapshot.vectors
     
-    def _load_vector_store(self):
-        """Load FAISS index and metadata."""
-        index_path = os.path.join(self.vector_store_dir, "faiss_index.bin")
-        metadata_path = os.path.join(self.vector_store_dir, "metadata.jsonl")
+    @property
+    def documents(self) -> List[Dict]:
+        """What search() returns: chunk metadata, or the sections in small-to-big mode."""
+        snapshot = self._snapshot
+        if snapshot.small_to_big is not None:
+            return list(snapshot.small_to_big.parents.values())
+        return snapshot.metadata
+    
+    def _load_vector_store(self) -> _StoreSnapshot:
+        """Load FAISS index and metadata of the current version."""
+        store_dir, version = resolve_store_dir(self.vector_store_dir)
+        index_path = os.path.join(store_dir, "faiss_index.bin")
+        metadata_path = os.path.join(store_dir, "metadata.jsonl")
+        config_path = os.path.join(store_dir, "config.json")
+        vectors_path = os.path.join(store_dir, "vectors.npy")
         
         if not os.path.exists(index_path) or not os.path.exists(metadata_path):
-            raise FileNotFoundError(f"Vector store files not found in {self.vector_store_dir}")
+            raise FileNotFoundError(f"Vector store files not found in {store_dir}")
+        
+        verify_manifest(store_dir)
+        
+        index = faiss.read_index(index_path)
         
-        self.index = faiss.read_index(index_path)
+        rerank_factor = 4
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                rerank_factor = json.load(f).get('rerank_factor', rerank_factor)
         
+        # Compressed indexes ship the original vectors for exact re-ranking
+        vectors = None
+        if os.path.exists(vectors_path):
+            vectors = np.load(vectors_path, mmap_mode='r')
+        
+        metadata = []
         with open(metadata_path, 'r', encoding='utf-8') as f:
             for line in f:
                 if line.strip():
-                    self.metadata.append(json.loads(line))
+                    metadata.append(json.loads(line))
+        
+        if index.ntotal != len(metadata):
+            raise ValueError(f"Index has {index.ntotal} vectors but metadata has {len(metadata)} chunks")
+        
+        faq_index, faqs = load_faq_index(store_dir)
+        small_to_big = SmallToBigIndex.load(store_dir) if self.small_to_big is not False else None
+        if self.small_to_big and small_to_big is None:
+            raise FileNotFoundError(f"small_to_big requested but {store_dir} has no child index")
+        return _StoreSnapshot(version, index, metadata, vectors, rerank_factor, faq_index, faqs, small_to_big)
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Swap to the current store version if it differs from the loaded one.
+        
+        Returns:
+            True if a new version was loaded
+        """
+        with self._reload_lock:
+            _, version = resolve_store_dir(self.vector_store_dir)
+            if version is None or version == self._snapshot.version:
+                return False
+            
+            # Single reference assignment; the old snapshot is freed once in-flight queries drop it
+            self._snapshot = self._load_vector_store()
+            print(f"Vector store reloaded: version {self._snapshot.version}")
+            return True
+    
+    def start_auto_reload(self, interval: float = 5.0) -> None:
+        """Poll the store's CURRENT pointer in a daemon thread and hot-swap on change."""
+        if self._reload_thread is not None:
+            return
+        self._stop_reload.clear()
+        
+        def poll():
+            while not self._stop_reload.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as exc:
+                    # A broken or half-pruned version must not take down the server
+                    print(f"Vector store reload failed, keeping version {self.version}: {exc}")
+        
+        self._reload_thread = threading.Thread(target=poll, name="vector-store-reload", daemon=True)
+        self._reload_thread.start()
+    
+    def stop_auto_reload(self) -> None:
+        """Stop the background reload thread."""
+        if self._reload_thread is None:
+            return
+        self._stop_reload.set()
+        self._reload_thread.join()
+        self._reload_thread = None
+    
+    def encode(self, query: str) -> np.ndarray:
+        """Query embedding of shape (1, embedding_dim)."""
+        return self.encode_batch([query])
+    
+    def encode_batch(self, queries: List[str], batch_size: int = 64) -> np.ndarray:
+        """Query embeddings of shape (len(queries), embedding_dim), encoded in one call."""
+        embeddings = self.embedding_model.encode(queries, batch_size=batch_size, convert_to_numpy=True)
+        return embeddings.astype('float32').reshape(len(queries), -1)
+    
+    def chunk_hashes(self) -> Dict[str, str]:
+        """{chunk_id: content_hash} of the loaded version, computed once per version."""
+        snapshot = self._snapshot
+        if snapshot.chunk_hashes is None:
+            hashes = {chunk['chunk_id']: content_hash(chunk)
+                      for chunk in snapshot.metadata if 'chunk_id' in chunk}
+            if snapshot.small_to_big is not None:
+                hashes.update((parent_id, content_hash(parent))
+                              for parent_id, parent in snapshot.small_to_big.parents.items())
+            snapshot.chunk_hashes = hashes
+        return snapshot.chunk_hashes
+    
+    @property
+    def has_faqs(self) -> bool:
+        return self._snapshot.faq_index is not None
+    
+    def match_faq(self, query_embedding: np.ndarray) -> Optional[Dict]:
+        """
+        Closest FAQ question to the query.
+        
+        Returns:
+            The FAQ pair plus its cosine 'score', or None if the store has no FAQ index
+        """
+        return self.match_faqs(query_embedding)[0]
+    
+    def match_faqs(self, query_embeddings: np.ndarray) -> List[Optional[Dict]]:
+        """match_faq for each row of query_embeddings, in one index search."""
+        snapshot = self._snapshot
+        if snapshot.faq_index is None:
+            return [None] * len(query_embeddings)
+        query_embeddings = np.array(query_embeddings, dtype='float32')
+        faiss.normalize_L2(query_embeddings)
+        scores, indices = snapshot.faq_index.search(query_embeddings, 1)
+        return [{**snapshot.faqs[int(idx[0])], 'score': float(score[0])}
+                if 0 <= idx[0] < len(snapshot.faqs) else None
+                for idx, score in zip(indices, scores)]
+    
+    def retrieve(self, query: str, k: int = 5, query_embedding: Optional[np.ndarray] = None) -> List[Dict]:
+        """Retrieve top-k similar chunks for the query (query_embedding: encode(query), if already computed)."""
+        if query_embedding is None:
+            with span("retriever.encode"):
+                query_embedding = self.encode(query)
+        
+        return self.search(query_embedding, k)[0]
     
-    def retrieve(self, query: str, k: int = 5) -> List[Dict]:
-        """Retrieve top-k similar chunks for the query."""
-        query_embedding = self.embedding_model.encode([query], convert_to_numpy=True)[0]
-        query_embedding = query_embedding.astype('float32').reshape(1, -1)
+    def search(self, query_embeddings: np.ndarray, k: int = 5) -> List[List[Dict]]:
+        """Top-k chunks (or sections, in small-to-big mode) for each row of query_embeddings, in one index search."""
+        snapshot = self._snapshot  # one consistent version for the whole batch
+        
+        if snapshot.small_to_big is not None:
+            with span("retriever.search"):
+                return snapshot.small_to_big.search(query_embeddings, k, max_parent_chars=self.max_parent_chars)
         
-        distances, indices = self.index.search(query_embedding, k)
+        with span("retriever.search"):
+            if snapshot.vectors is not None:
+                _, candidates = snapshot.index.search(query_embeddings, k * snapshot.rerank_factor)
+                rows = [exact_rerank(query_embedding, row, snapshot.vectors, k)
+                        for query_embedding, row in zip(query_embeddings, candidates)]
+            else:
+                distances, indices = snapshot.index.search(query_embeddings, k)
+                rows = zip(indices, distances)
         
         results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx < len(self.metadata):
-                chunk = self.metadata[idx].copy()
-                chunk['similarity_score'] = float(1 / (1 + distance))
-                results.append(chunk)
+        for ids, dists in rows:
+            chunks = []
+            for idx, distance in zip(ids, dists):
+                if 0 <= idx < len(snapshot.metadata):
+                    chunk = snapshot.metadata[idx].copy()
+                    chunk['similarity_score'] = float(1 / (1 + distance))
+                    chunks.append(chunk)
+            results.append(chunks)
         
         return results
 
 
 class AgenticRAGPipeline:
-    def __init__(self, vector_store_dir: str, gemini_api_key: str, model_name: str = "gemini-2.5-flash"):
-        self.vector_store = VectorStoreManager(vector_store_dir)
+    def __init__(self, vector_store_dir: str, gemini_api_key: Optional[str] = None,
+                 model_name: str = "gemini-2.5-flash", auto_reload: bool = False, tracing: bool = True,
+                 registry: Optional[Registry] = None, llm: Optional[LLMProvider] = None,
+                 node_llms: Optional[Dict[str, LLMProvider]] = None, coalesce: bool = True,
+                 faq_threshold: Optional[float] = 0.9, answer_cache_dir: Optional[str] = None,
+                 answer_cache_threshold: float = 0.85, query_log: Optional[str] = None,
+                 small_to_big: Optional[bool] = None):
+        """
+        Args:
+            tracing: Time every node and stage (see metrics.py); results then carry
+                     "timings" and the registry's histograms are updated
+            registry: Metrics registry to record into (metrics.REGISTRY by default)
+            llm: Provider for every LLM node; Gemini (model_name, gemini_api_key) by default
+            node_llms: Per-node providers ("reformer", "responder") overriding llm, e.g. a
+                       small local model for reformulation and Gemini for answers
+            coalesce: Concurrent identical queries (see singleflight.normalize_query) share
+                      one run of the workflow; the others get its result with "coalesced": True
+            faq_threshold: Cosine similarity to an indexed FAQ question at or above which
+                           its official answer is returned without retrieval or generation
+                           (None disables the FAQ node)
+            answer_cache_dir: Precomputed answers for frequent query clusters (see answer_cache.py),
+                              looked up before retrieval and served while their chunks are unchanged
+            answer_cache_threshold: Cosine similarity to a cluster centroid needed to serve its answer
+            query_log: JSONL file every incoming query is appended to, the input of answer_cache.py
+            small_to_big: Retrieve whole sections through the sentence-level child index
+                          (see small_to_big.py); None uses it whenever the store has one
+        """
+        self.vector_store = VectorStoreManager(vector_store_dir, auto_reload=auto_reload, small_to_big=small_to_big)
+        self.tracer = Tracer(registry, enabled=tracing)
         self.model_name = model_name
-        genai.configure(api_key=gemini_api_key)
-        self.client = genai.GenerativeModel(model_name)
+        node_llms = dict(node_llms or {})
+        if llm is None and not all(node in node_llms for node in LLM_NODES):
+            llm = GeminiProvider(model_name, api_key=gemini_api_key)
+        self.llms = {node: node_llms.get(node, llm) for node in LLM_NODES}
         self._safe_generate = _safe_generate.__get__(self)
+        self._inflight = SingleFlight() if coalesce else None
+        self.faq_threshold = faq_threshold
+        self.answer_cache = AnswerCache.load(answer_cache_dir, answer_cache_threshold) if answer_cache_dir else None
+        self.query_log = query_log
+        self._query_log_lock = threading.Lock()
         self.graph = self._build_graph()
 
     def _build_graph(self):
         workflow = StateGraph(RAGState)
-        workflow.add_node("analyzer", self._analyzer)
-        workflow.add_node("reformer", self._reformer)
-        workflow.add_node("retriever", self._retriever)
-        workflow.add_node("responder", self._responder)
-        workflow.set_entry_point("analyzer")
+        workflow.add_node("faq", self.tracer.wrap_node("faq", self._faq))
+        workflow.add_node("analyzer", self.tracer.wrap_node("analyzer", self._analyzer))
+        workflow.add_node("reformer", self.tracer.wrap_node("reformer", self._reformer))
+        workflow.add_node("retriever", self.tracer.wrap_node("retriever", self._retriever))
+        workflow.add_node("responder", self.tracer.wrap_node("responder", self._responder))
+        if self.answer_cache is not None:
+            workflow.add_node("answer_cache", self.tracer.wrap_node("answer_cache", self._answer_cache))
+        lookup = "answer_cache" if self.answer_cache is not None else "retriever"
+        workflow.set_entry_point("faq")
+        workflow.add_conditional_edges(
+            "faq",
+            lambda s: "answered" if s["faq_match"] else "rag",
+            {"answered": END, "rag": "analyzer"},
+        )
         workflow.add_conditional_edges(
             "analyzer",
             lambda s: "reform" if s["needs_reform"] else "retrieve",
-            {"reform": "reformer", "retrieve": "retriever"},
+            {"reform": "reformer", "retrieve": lookup},
         )
-        workflow.add_edge("reformer", "retriever")
+        workflow.add_edge("reformer", lookup)
+        if self.answer_cache is not None:
+            workflow.add_conditional_edges(
+                "answer_cache",
+                lambda s: "answered" if s["cached_answer"] else "retrieve",
+                {"answered": END, "retrieve": "retriever"},
+            )
         workflow.add_edge("retriever", "responder")
         workflow.add_edge("responder", END)
         return workflow.compile()
 
+    def _faq(self, state: RAGState) -> RAGState:
+        # Official FAQ answer for near-identical questions: no retrieval, no LLM call
+        if self.faq_threshold is None or not self.vector_store.has_faqs:
+            return state
+        q = state["query"].strip()
+        with span("faq.encode"):
+            state["query_embedding"] = self.vector_store.encode(q)
+            state["embedded_query"] = q
+        with span("faq.search"):
+            match = self.vector_store.match_faq(state["query_embedding"])
+        return self._apply_faq(state, match)
+
+    def _apply_faq(self, state: RAGState, match: Optional[Dict]) -> RAGState:
+        if match is not None and match["score"] >= self.faq_threshold:
+            self.tracer.count("faq_answered", "faq")
+            state["faq_match"] = match
+            state["response"] = match["answer"]
+            state["context"] = [{
+                "content": f"Q: {match['question']}\nA: {match['answer']}",
+                "file_name": match["file_name"],
+                "url": match.get("url"),
+                "kind": "faq",
+                "similarity_score": match["score"],
+            }]
+        return state
+
     def _analyzer(self, state: RAGState) -> RAGState:
         q = state["query"].strip()
         # Minimal heuristic: if very short or has no space (likely too terse), reformulate
@@ -117,45 +426,85 @@ class AgenticRAGPipeline:
 
     def _reformer(self, state: RAGState) -> RAGState:
         q = state["query"]
-        prompt = f"""Rewrite this user query to be clear and specific about Bank of Maharashtra loan products. Keep it concise.
-Query: "{q}"
-Rewritten:"""
-        resp = self._safe_generate(prompt)
+        prompt = REFORM_PROMPT.format(query=q)
+        resp = self._safe_generate(prompt, stage="reformer")
         rewritten = resp.text.strip() or q
         state["working_query"] = rewritten
         return state
 
+    def _answer_cache(self, state: RAGState) -> RAGState:
+        wq = state["working_query"]
+        if state["embedded_query"] != wq:
+            with span("answer_cache.encode"):
+                state["query_embedding"] = self.vector_store.encode(wq)
+                state["embedded_query"] = wq
+        with span("answer_cache.search"):
+            result, entry = self.answer_cache.lookup(state["query_embedding"], self.vector_store.chunk_hashes())
+        self.tracer.count("answer_cache", result)
+        if result == "hit":
+            state["cached_answer"] = entry
+            state["response"] = entry["response"]
+        return state
+
     def _retriever(self, state: RAGState) -> RAGState:
         wq = state["working_query"]
-        state["context"] = self.vector_store.retrieve(wq, k=5)
+        # Reuse the embedding an earlier node computed for this exact text
+        query_embedding = state["query_embedding"] if state["embedded_query"] == wq else None
+        state["context"] = self.vector_store.retrieve(wq, k=5, query_embedding=query_embedding)
         return state
 
     def _responder(self, state: RAGState) -> RAGState:
         wq = state["working_query"]
         context = state["context"] or []
-        context_text = "\n\n".join([f"[Source {i+1}] {c['content']}" for i, c in enumerate(context)])
-        prompt = f"""You are a helpful assistant for Bank of Maharashtra loan products.
-Use only the provided context. Give a clear, concise, but descriptive answer (2–4 sentences), and include key comparisons or conditions if relevant.
-
-Context:
-{context_text}
-
-User Query: {wq}
-
-Answer with a short, well-structured explanation:"""
-        resp = self._safe_generate(prompt)
+        prompt = ANSWER_PROMPT.format(context=format_context(context), query=wq)
+        resp = self._safe_generate(prompt, stage="responder")
         state["response"] = resp.text
         return state
 
+    def _log_query(self, query: str) -> None:
+        if self.query_log is None:
+            return
+        line = json.dumps({"ts": time.time(), "query": query}) + "\n"
+        with self._query_log_lock:
+            with open(self.query_log, "a", encoding="utf-8") as f:
+                f.write(line)
+
     def process_query(self, query: str) -> Dict[str, Any]:
-        init: RAGState = {
+        self._log_query(query)
+        if self._inflight is None:
+            return self._run_query(query)
+        result, shared = self._inflight.do(normalize_query(query), lambda: self._run_query(query))
+        return self._coalesced(query, result, "sync") if shared else result
+
+    async def aprocess_query(self, query: str) -> Dict[str, Any]:
+        """process_query for asyncio servers; the workflow runs in a worker thread."""
+        self._log_query(query)
+        if self._inflight is None:
+            return await asyncio.to_thread(self._run_query, query)
+        result, shared = await self._inflight.ado(normalize_query(query),
+                                                  lambda: asyncio.to_thread(self._run_query, query))
+        return self._coalesced(query, result, "async") if shared else result
+
+    def _coalesced(self, query: str, result: Dict[str, Any], entry: str) -> Dict[str, Any]:
+        self.tracer.count("query_coalesced", entry)
+        return {**result, "query": query, "context": list(result["context"]), "coalesced": True}
+
+    @staticmethod
+    def _initial_state(query: str) -> RAGState:
+        return {
             "query": query,
             "working_query": query,
             "needs_reform": False,
             "context": None,
             "response": None,
+            "faq_match": None,
+            "cached_answer": None,
+            "query_embedding": None,
+            "embedded_query": None,
         }
-        result = self.graph.invoke(init)
+
+    @staticmethod
+    def _output(result: RAGState) -> Dict[str, Any]:
         return {
             "query": result["query"],
             "working_query": result["working_query"],
@@ -163,8 +512,174 @@ Answer with a short, well-structured explanation:"""
             "context_count": len(result.get("context", [])) if result.get("context") else 0,
             "response": result.get("response"),
             "context": result.get("context", []) if result.get("context") else [],
+            "faq_match": result.get("faq_match"),
+            "cached_answer": ({key: result["cached_answer"][key] for key in ("query", "score", "built_at")}
+                              if result.get("cached_answer") else None),
         }
 
+    def _run_query(self, query: str) -> Dict[str, Any]:
+        with self.tracer.trace() as trace:
+            result = self.graph.invoke(self._initial_state(query))
+        output = self._output(result)
+        if trace is not None:
+            output["timings"] = trace.timings()
+            output["node_waits"] = dict(trace.node_waits)
+            output["llm_rate_limited"] = trace.counts.get("llm_rate_limited", 0)
+        return output
+
+    def process_batch(self, queries: Iterable[Union[str, Dict]], output: Optional[str] = None,
+                      concurrency: int = 4, rpm: Optional[float] = None,
+                      batch_size: int = 64) -> List[Dict[str, Any]]:
+        """
+        Answer many queries with the same nodes as process_query, but stage by stage
+        across a batch: one encode and one FAQ search for the whole batch, the
+        analyzer over all of it, reformulations in parallel, one encode of the
+        rewritten queries and one index search. Answer generation runs in a pool
+        of `concurrency` LLM workers. The next batch is prepared while the pool
+        works through the previous one, and duplicate queries in a batch are
+        answered once.
+
+        Args:
+            queries: Query strings, or {"id", "query"} dicts (ids default to the position)
+            output: JSONL file each result is appended to as it completes. Ids already
+                    in it are skipped, so an interrupted run resumes where it stopped.
+                    Failed queries are recorded with "error" and retried on the next run.
+            concurrency: LLM calls in flight at most
+            rpm: LLM calls per minute at most, across all workers (unlimited if None)
+            batch_size: Queries encoded and searched together
+
+        Returns:
+            The results produced by this call, in input order
+        """
+        items = [(item.get("id", i), item["query"]) if isinstance(item, dict) else (i, item)
+                 for i, item in enumerate(queries)]
+        done = _completed_ids(output) if output else set()
+        items = [(query_id, query) for query_id, query in items if query_id not in done]
+        if done:
+            print(f"Resuming: {len(done)} queries already answered in {output}")
+
+        limiter = RateLimiter(rpm) if rpm else None
+        results: Dict[Any, Dict[str, Any]] = {}
+        write_lock = threading.Lock()
+
+        def llm_call(node, state):
+            if limiter is not None:
+                limiter.acquire()
+            return node(state)
+
+        def finish(ids, query_list, state=None, error=None):
+            base = self._output(state) if state is not None else None
+            with write_lock:
+                for n, (query_id, query) in enumerate(zip(ids, query_list)):
+                    if error is not None:
+                        result = {"query": query, "error": f"{type(error).__name__}: {error}"}
+                    else:
+                        result = {**base, "query": query}
+                        if n:
+                            result["coalesced"] = True
+                    result = {"id": query_id, **result}
+                    results[query_id] = result
+                    if output:
+                        with open(output, "a", encoding="utf-8") as f:
+                            f.write(json.dumps(result) + "\n")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            pending = set()
+            for start in range(0, len(items), batch_size):
+                # Identical queries in the batch share one state
+                groups: Dict[str, List] = {}
+                for query_id, query in items[start:start + batch_size]:
+                    group = groups.setdefault(normalize_query(query), [[], []])
+                    group[0].append(query_id)
+                    group[1].append(query)
+                keys = list(groups)
+                states = {key: self._initial_state(groups[key][1][0]) for key in keys}
+
+                # FAQ: one encode and one search for the batch
+                if self.faq_threshold is not None and self.vector_store.has_faqs:
+                    texts = [states[key]["query"].strip() for key in keys]
+                    embeddings = self.vector_store.encode_batch(texts)
+                    for key, text, embedding, match in zip(keys, texts, embeddings, self.vector_store.match_faqs(embeddings)):
+                        states[key]["query_embedding"] = embedding.reshape(1, -1)
+                        states[key]["embedded_query"] = text
+                        self._apply_faq(states[key], match)
+                for key in [key for key in keys if states[key]["faq_match"]]:
+                    finish(*groups[key], states[key])
+                    keys.remove(key)
+
+                for key in keys:
+                    self._analyzer(states[key])
+                reforms = {pool.submit(llm_call, self._reformer, states[key]): key
+                           for key in keys if states[key]["needs_reform"]}
+                for future, key in reforms.items():
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        finish(*groups[key], error=exc)
+                        keys.remove(key)
+
+                # Encode whatever the FAQ pass did not already embed, in one call
+                stale = [key for key in keys if states[key]["embedded_query"] != states[key]["working_query"]]
+                if stale:
+                    embeddings = self.vector_store.encode_batch([states[key]["working_query"] for key in stale])
+                    for key, embedding in zip(stale, embeddings):
+                        states[key]["query_embedding"] = embedding.reshape(1, -1)
+                        states[key]["embedded_query"] = states[key]["working_query"]
+
+                if self.answer_cache is not None:
+                    for key in list(keys):
+                        if self._answer_cache(states[key])["cached_answer"]:
+                            finish(*groups[key], states[key])
+                            keys.remove(key)
+
+                if keys:
+                    contexts = self.vector_store.search(
+                        np.vstack([states[key]["query_embedding"] for key in keys]), k=5)
+                    for key, context in zip(keys, contexts):
+                        states[key]["context"] = context
+
+                for key in keys:
+                    # Bounded backlog: wait for answers before queueing more than 2 x concurrency
+                    while len(pending) >= 2 * concurrency:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    future = pool.submit(llm_call, self._responder, states[key])
+                    future.add_done_callback(
+                        lambda f, group=groups[key], state=states[key]:
+                            finish(*group, state) if f.exception() is None else finish(*group, error=f.exception()))
+                    pending.add(future)
+
+                print(f"Batch: {min(start + batch_size, len(items))}/{len(items)} queries prepared")
+            wait(pending)
+
+        return [results[query_id] for query_id, _ in items if query_id in results]
+
+
+def _completed_ids(path: str) -> set:
+    """
+    Ids answered without error in a process_batch output file. Failed and
+    half-written lines are dropped from the file so they are retried.
+    """
+    if not os.path.exists(path):
+        return set()
+    kept, dirty = [], False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                dirty = True
+                continue
+            if "error" in result:
+                dirty = True
+                continue
+            kept.append(line if line.endswith("\n") else line + "\n")
+    if dirty:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(kept)
+        os.replace(tmp_path, path)
+    return {json.loads(line)["id"] for line in kept}
+
 
 # if __name__ == "__main__":
 #     vector_store_path = "../data/vector_store"
@@ -199,16 +714,23 @@ if __name__ == "__main__":
     vector_store_path = os.path.join(os.path.dirname(__file__), "..", "data", "vector_store")
     api_key = os.getenv("GEMINI_API_KEY")
 
-    if not api_key:
-        print("🚨 ERROR: GEMINI_API_KEY environment variable not set.")
+    if not api_key and not os.getenv("RAG_LLM"):
+        print("🚨 ERROR: GEMINI_API_KEY environment variable not set (or choose a provider with RAG_LLM).")
         # Optionally exit or prompt for input
         exit(1)
     
     # --- Initialization ---
     try:
-        pipeline = AgenticRAGPipeline(vector_store_path, api_key)
+        data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        pipeline = AgenticRAGPipeline(vector_store_path, api_key, node_llms=providers_from_env(),
+                                      answer_cache_dir=os.path.join(data_dir, "answer_cache"),
+                                      query_log=os.getenv("RAG_QUERY_LOG"))
+        metrics_port = os.getenv("RAG_METRICS_PORT")
+        if metrics_port:
+            serve_metrics(pipeline.tracer.registry, int(metrics_port))
+            print(f"Metrics: http://127.0.0.1:{metrics_port}/metrics")
         print("--- Loan Product Assistant Initialized ---")
-        print("Model: Gemini 2.5 Flash | RAG Backend: FAISS")
+        print(f"Models: {', '.join(f'{node}={llm!r}' for node, llm in pipeline.llms.items())} | RAG Backend: FAISS")
         print("Ask a question about Bank of Maharashtra loan products.")
         print("Type 'quit' or 'stop' to exit.\n")
     except Exception as e:
@@ -234,9 +756,17 @@ if __name__ == "__main__":
             result = pipeline.process_query(user_input)
             
             print("\n*** RAG WORKFLOW LOG ***")
+            if result.get('cached_answer'):
+                print(f"| Precomputed Answer: {result['cached_answer']['query']} "
+                      f"(score {result['cached_answer']['score']:.3f})")
+            if result.get('faq_match'):
+                print(f"| FAQ Answer: {result['faq_match']['question']} (score {result['faq_match']['score']:.3f})")
             print(f"| Needs Reform: {result.get('needs_reform', False)}")
             print(f"| Working Query: {result.get('working_query', '')}")
             print(f"| Context Chunks Retrieved: {result.get('context_count', 0)}")
+            if result.get('timings'):
+                print("| Timings: " + ", ".join(f"{name}={seconds * 1000:.0f}ms"
+                                                for name, seconds in result['timings'].items()))
             print("*************************")
             print(f"💡 Assistant: {result.get('response', 'No response')}\n")
 
@@ -0,0 +1,286 @@
+"""
+Precomputed answers for the most frequent query intents.
+
+Offline (python rag_pipeline/answer_cache.py --queries data/query_log.jsonl):
+historical queries are embedded and clustered with spherical k-means. For the
+largest clusters, the member closest to the centroid is run through the full
+pipeline, throttled to --rpm pipeline runs per minute to respect the LLM quota,
+and the answer is stored under the centroid along with the content hash of
+every chunk it was generated from. An answer is vetted when it was generated
+from retrieved context (not an FAQ or an empty answer); only vetted answers are
+served, and "vetted" can be flipped by hand in answers.jsonl after review.
+
+Online, AgenticRAGPipeline looks up the nearest centroid before retrieval. An
+answer is served only while every chunk it was built from still exists in the
+live store with the same content, so re-scraped pages invalidate it without
+rebuilding the cache; the next offline run regenerates just the stale entries.
+
+Layout of the cache directory:
+    centroids.npy     unit-normalized centroids, one row per entry
+    answers.jsonl     one entry per centroid (query, response, chunk_hashes, ...)
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from singleflight import normalize_query
+
+CENTROIDS_FILE = "centroids.npy"
+ANSWERS_FILE = "answers.jsonl"
+
+
+def content_hash(chunk: Dict) -> str:
+    """Fingerprint of a chunk's text; an answer built on it is stale once this changes."""
+    return hashlib.sha256(chunk['content'].encode('utf-8')).hexdigest()[:16]
+
+
+def read_query_log(path: str) -> List[str]:
+    """Queries from a JSONL log ({"query": ...} per line, as written by AgenticRAGPipeline(query_log=...)) or a plain text file."""
+    queries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            query = json.loads(line).get('query', '') if line.startswith('{') else line
+            if query.strip():
+                queries.append(query.strip())
+    return queries
+
+
+class AnswerCache:
+    """Nearest-centroid lookup of precomputed answers."""
+
+    def __init__(self, centroids: np.ndarray, entries: List[Dict], threshold: float = 0.85):
+        """
+        Args:
+            centroids: Unit-normalized centroids (n_entries, embedding_dim), aligned with entries
+            entries: Answer entries (see build_answer_cache)
+            threshold: Minimum cosine similarity between the query and a centroid to serve its answer
+        """
+        self.centroids = np.ascontiguousarray(centroids, dtype='float32')
+        self.entries = entries
+        self.threshold = threshold
+        self.index = faiss.IndexFlatIP(self.centroids.shape[1])
+        self.index.add(self.centroids)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def load(cache_dir: str, threshold: float = 0.85) -> Optional['AnswerCache']:
+        """The cache saved in cache_dir, or None if there is none."""
+        centroids_path = os.path.join(cache_dir, CENTROIDS_FILE)
+        answers_path = os.path.join(cache_dir, ANSWERS_FILE)
+        if not os.path.exists(centroids_path) or not os.path.exists(answers_path):
+            return None
+        with open(answers_path, 'r', encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        centroids = np.load(centroids_path)
+        if len(centroids) != len(entries) or not entries:
+            return None
+        return AnswerCache(centroids, entries, threshold)
+
+    def save(self, cache_dir: str) -> None:
+        """Write both files via temporary names, answers last, so a reader never pairs mismatched files."""
+        os.makedirs(cache_dir, exist_ok=True)
+        centroids_tmp = os.path.join(cache_dir, f".{CENTROIDS_FILE}.tmp.npy")
+        answers_tmp = os.path.join(cache_dir, f".{ANSWERS_FILE}.tmp")
+        np.save(centroids_tmp, self.centroids)
+        with open(answers_tmp, 'w', encoding='utf-8') as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry) + '\n')
+        os.replace(centroids_tmp, os.path.join(cache_dir, CENTROIDS_FILE))
+        os.replace(answers_tmp, os.path.join(cache_dir, ANSWERS_FILE))
+
+    @staticmethod
+    def is_fresh(entry: Dict, chunk_hashes: Dict[str, str]) -> bool:
+        """True while every chunk the answer was generated from is unchanged in the store."""
+        return all(chunk_hashes.get(chunk_id) == digest for chunk_id, digest in entry['chunk_hashes'].items())
+
+    def lookup(self, query_embedding: np.ndarray, chunk_hashes: Dict[str, str]) -> Tuple[str, Optional[Dict]]:
+        """
+        Nearest centroid to the query.
+
+        Args:
+            query_embedding: Query embedding of shape (1, embedding_dim)
+            chunk_hashes: {chunk_id: content_hash} of the live store
+
+        Returns:
+            ("hit", entry with 'score'), ("stale", entry) when its chunks changed, or ("miss", None)
+        """
+        query_embedding = np.array(query_embedding, dtype='float32').reshape(1, -1)
+        faiss.normalize_L2(query_embedding)
+        scores, indices = self.index.search(query_embedding, 1)
+        idx, score = int(indices[0][0]), float(scores[0][0])
+        if not 0 <= idx < len(self.entries) or score < self.threshold:
+            return "miss", None
+        entry = self.entries[idx]
+        if not entry.get('vetted'):
+            return "miss", None
+        if not self.is_fresh(entry, chunk_hashes):
+            return "stale", entry
+        return "hit", {**entry, 'score': score}
+
+
+def cluster_queries(queries: List[str], embed, n_clusters: int, seed: int = 0) -> List[Dict]:
+    """
+    Spherical k-means over the distinct queries, weighted by how often each was asked.
+
+    Args:
+        queries: Logged queries (repeats count towards cluster size)
+        embed: Callable mapping a list of texts to an (n, dim) array
+        n_clusters: Number of clusters (capped at the number of distinct queries)
+
+    Returns:
+        Clusters, largest first: {"centroid", "size", "representative", "examples"}
+    """
+    counts: Dict[str, int] = {}
+    texts: Dict[str, str] = {}
+    for query in queries:
+        key = normalize_query(query)
+        counts[key] = counts.get(key, 0) + 1
+        texts.setdefault(key, query)
+    keys = list(counts)
+    if not keys:
+        return []
+
+    embeddings = np.asarray(embed([texts[key] for key in keys]), dtype='float32')
+    faiss.normalize_L2(embeddings)
+    weights = np.array([counts[key] for key in keys], dtype='float32')
+    k = min(n_clusters, len(keys))
+
+    kmeans = faiss.Kmeans(embeddings.shape[1], k, niter=25, spherical=True, seed=seed)
+    kmeans.train(embeddings, weights=weights)
+    centroids = kmeans.centroids.copy()
+    faiss.normalize_L2(centroids)
+    assign = faiss.IndexFlatIP(centroids.shape[1])
+    assign.add(centroids)
+    _, labels = assign.search(embeddings, 1)
+
+    clusters = []
+    for c in range(k):
+        members = np.flatnonzero(labels[:, 0] == c)
+        if not len(members):
+            continue
+        member_sims = embeddings[members] @ centroids[c]
+        order = members[np.argsort(-member_sims)]
+        clusters.append({
+            "centroid": centroids[c],
+            "size": int(weights[members].sum()),
+            "representative": texts[keys[order[0]]],
+            "examples": [texts[keys[i]] for i in order[:5]],
+        })
+    clusters.sort(key=lambda cluster: -cluster["size"])
+    return clusters
+
+
+def build_answer_cache(pipeline, clusters: Iterable[Dict], chunk_hashes: Dict[str, str],
+                       previous: Optional[AnswerCache] = None, rpm: float = 10.0,
+                       threshold: float = 0.85) -> AnswerCache:
+    """
+    Run the pipeline for each cluster's representative query and collect the answers.
+
+    Entries of the previous cache for the same representative whose chunks are
+    unchanged are kept as they are (including a manual "vetted" decision)
+    instead of spending LLM quota on them again.
+
+    Args:
+        pipeline: AgenticRAGPipeline built without an answer cache
+        clusters: Output of cluster_queries
+        chunk_hashes: {chunk_id: content_hash} of the store the pipeline serves from
+        previous: Existing cache to reuse fresh entries from
+        rpm: Pipeline runs per minute at most (each run makes up to two LLM calls)
+    """
+    reusable = {}
+    if previous is not None:
+        for entry in previous.entries:
+            if AnswerCache.is_fresh(entry, chunk_hashes):
+                reusable[entry['query']] = entry
+
+    interval = 60.0 / rpm if rpm > 0 else 0.0
+    centroids, entries = [], []
+    last_run = None
+    for i, cluster in enumerate(clusters):
+        query = cluster["representative"]
+        entry = reusable.get(query)
+        if entry is None:
+            if last_run is not None and interval:
+                time.sleep(max(0.0, last_run + interval - time.perf_counter()))
+            last_run = time.perf_counter()
+            try:
+                result = pipeline.process_query(query)
+            except Exception as exc:
+                print(f"  [{i + 1}] failed, skipped: {query!r}: {exc}")
+                continue
+            context = [chunk for chunk in result["context"] if 'chunk_id' in chunk]
+            entry = {
+                "query": query,
+                "working_query": result["working_query"],
+                "response": result["response"],
+                "chunk_hashes": {chunk['chunk_id']: chunk_hashes.get(chunk['chunk_id'], content_hash(chunk))
+                                 for chunk in context},
+                "vetted": bool(result["response"] and context and not result.get("faq_match")),
+                "built_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            status = "built" if entry["vetted"] else "built, not vetted"
+        else:
+            status = "reused"
+        entry = {**entry, "cluster_size": cluster["size"], "examples": cluster["examples"]}
+        print(f"  [{i + 1}] {status} ({cluster['size']} queries): {query!r}")
+        centroids.append(cluster["centroid"])
+        entries.append(entry)
+
+    return AnswerCache(np.vstack(centroids), entries, threshold) if entries else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute answers for the most frequent query clusters.")
+    root = os.path.join(os.path.dirname(__file__), "..")
+    parser.add_argument("--queries", required=True, help="query log (JSONL with 'query', or one query per line)")
+    parser.add_argument("--store", default=os.path.join(root, "data", "vector_store"))
+    parser.add_argument("--output", default=os.path.join(root, "data", "answer_cache"))
+    parser.add_argument("--clusters", type=int, default=500, help="k-means clusters")
+    parser.add_argument("--top", type=int, default=300, help="answer the largest N clusters")
+    parser.add_argument("--min-cluster-size", type=int, default=2, help="skip intents asked fewer times")
+    parser.add_argument("--rpm", type=float, default=10.0, help="pipeline runs per minute (LLM quota)")
+    parser.add_argument("--rebuild", action="store_true", help="regenerate every answer, even fresh ones")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from agentic_rag import AgenticRAGPipeline
+    from llm import providers_from_env
+
+    queries = read_query_log(args.queries)
+    print(f"Clustering {len(queries)} logged queries...")
+    pipeline = AgenticRAGPipeline(args.store, node_llms=providers_from_env(), coalesce=False, answer_cache_dir=None)
+    store = pipeline.vector_store
+    clusters = cluster_queries(queries, lambda texts: store.embedding_model.encode(texts, convert_to_numpy=True),
+                               args.clusters, seed=args.seed)
+    clusters = [cluster for cluster in clusters if cluster["size"] >= args.min_cluster_size][:args.top]
+    covered = sum(cluster["size"] for cluster in clusters)
+    print(f"{len(clusters)} clusters cover {covered}/{len(queries)} queries "
+          f"({covered / max(len(queries), 1):.0%})")
+
+    previous = None if args.rebuild else AnswerCache.load(args.output)
+    cache = build_answer_cache(pipeline, clusters, store.chunk_hashes(), previous, rpm=args.rpm)
+    if cache is None:
+        print("No answers built.")
+        return 1
+    cache.save(args.output)
+    vetted = sum(bool(entry.get("vetted")) for entry in cache.entries)
+    print(f"Answer cache saved to {args.output}: {len(cache)} entries, {vetted} vetted "
+          f"(store version {store.version})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Answer a file of queries with AgenticRAGPipeline.process_batch.
+
+Input is JSONL with "query" (and optionally "id") per line, or one query per
+line. Results are appended to --output as they complete; re-running the same
+command after an interruption skips the queries already answered.
+
+Usage:
+    python rag_pipeline/batch_query.py compliance_questions.jsonl --output answers.jsonl \
+        --concurrency 8 --rpm 60
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from agentic_rag import AgenticRAGPipeline
+from llm import providers_from_env
+
+
+def read_queries(path):
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line) if line.startswith("{") else {"query": line}
+            items.append({"id": item.get("id", i), "query": item["query"]})
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer a file of queries in batches (resumable).")
+    parser.add_argument("queries", help="JSONL with 'query' (and optional 'id'), or one query per line")
+    parser.add_argument("--output", required=True, help="JSONL results; existing ids are skipped")
+    parser.add_argument("--store", default=os.path.join(os.path.dirname(__file__), "..", "data", "vector_store"))
+    parser.add_argument("--concurrency", type=int, default=4, help="LLM calls in flight")
+    parser.add_argument("--rpm", type=float, default=None, help="LLM calls per minute at most")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    items = read_queries(args.queries)
+    pipeline = AgenticRAGPipeline(args.store, node_llms=providers_from_env(), tracing=False)
+    start = time.perf_counter()
+    results = pipeline.process_batch(items, output=args.output, concurrency=args.concurrency,
+                                     rpm=args.rpm, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    errors = sum("error" in result for result in results)
+    print(f"{len(results)} queries answered in {elapsed:.1f}s ({len(results) / max(elapsed, 1e-9):.2f}/s), "
+          f"{errors} errors; results in {args.output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
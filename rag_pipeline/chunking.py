@@ -1,10 +1,15 @@
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 import re
 
 
+_SENTENCE_BREAK = re.compile(r'([.!?])\s+')
+
+
 class RecursiveChunker:
     """
     Recursive chunking strategy that preserves semantic boundaries.
@@ -22,8 +27,12 @@ class RecursiveChunker:
     
     def split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences using regex patterns."""
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-        return [s.strip() for s in sentences if s.strip()]
+        # Equivalent to re.split(r'(?<=[.!?])\s+', ...) but avoids a lookbehind
+        # at every position: split on the punctuation and glue it back on.
+        parts = _SENTENCE_BREAK.split(text.strip())
+        sentences = [parts[i] + parts[i + 1] for i in range(0, len(parts) - 1, 2)]
+        sentences.append(parts[-1])
+        return [s for s in map(str.strip, sentences) if s]
     
     def split_into_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs."""
@@ -34,36 +43,44 @@ class RecursiveChunker:
         """
         Recursively chunk text while preserving semantic boundaries.
         Strategy: Sentences -> Paragraphs -> Fixed size
+        
+        Sentences are packed by length only; each chunk string (overlap
+        included) is built exactly once, so cost is linear in the text size.
         """
         if not text or len(text) <= self.chunk_size:
             return [text] if text else []
         
-        chunks = []
-        current_chunk = ""
-        
         sentences = self.split_into_sentences(text)
         
-        for sentence in sentences:
-            test_chunk = current_chunk + " " + sentence if current_chunk else sentence
+        # (parts, length) per chunk, where the chunk is " ".join(parts)
+        pieces = []
+        run_start = 0
+        run_len = -1  # -1 marks an empty run
+        
+        chunk_size = self.chunk_size
+        
+        for idx, length in enumerate(map(len, sentences)):
+            candidate_len = length if run_len < 0 else run_len + 1 + length
             
-            if len(test_chunk) <= self.chunk_size:
-                current_chunk = test_chunk
+            if candidate_len <= chunk_size:
+                if run_len < 0:
+                    run_start = idx
+                run_len = candidate_len
             else:
-                if current_chunk:
-                    chunks.append(current_chunk)
+                if run_len >= 0:
+                    pieces.append((sentences[run_start:idx], run_len))
                 
-                if len(sentence) > self.chunk_size:
-                    long_chunks = self._chunk_long_sentence(sentence)
-                    chunks.extend(long_chunks)
-                    current_chunk = ""
+                if length > chunk_size:
+                    pieces.extend(([part], len(part)) for part in self._chunk_long_sentence(sentences[idx]))
+                    run_len = -1
                 else:
-                    current_chunk = sentence
+                    run_start = idx
+                    run_len = length
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        if run_len >= 0:
+            pieces.append((sentences[run_start:], run_len))
         
-        chunks = self._add_overlap(chunks)
-        return chunks
+        return self._join_with_overlap(pieces)
     
     def _chunk_long_sentence(self, text: str) -> List[str]:
         """Chunk very long sentences by fixed size."""
@@ -72,105 +89,380 @@ class RecursiveChunker:
             chunks.append(text[i:i + self.chunk_size])
         return chunks
     
+    def _join_with_overlap(self, pieces: List[Tuple[List[str], int]]) -> List[str]:
+        """
+        Build final chunk strings, prefixing each with the tail of the previous chunk.
+        
+        The tail is located by offset inside the previous *output* string (which
+        ends with the previous base chunk), so base chunks are never materialised
+        separately.
+        """
+        chunks = []
+        prev_base_len = 0
+        
+        for parts, base_len in pieces:
+            if chunks:
+                prev = chunks[-1]
+                # Same semantics as base[-overlap:] on the previous base chunk
+                tail_start = slice(-self.overlap, None).indices(prev_base_len)[0]
+                tail = prev[len(prev) - prev_base_len + tail_start:]
+                chunks.append(" ".join([tail] + parts))
+            else:
+                chunks.append(" ".join(parts))
+            prev_base_len = base_len
+        
+        return chunks
+    
     def _add_overlap(self, chunks: List[str]) -> List[str]:
         """Add overlap between consecutive chunks for context preservation."""
-        if len(chunks) <= 1:
-            return chunks
+        return self._join_with_overlap([([chunk], len(chunk)) for chunk in chunks])
+    
+    def measure(self, texts: List[str]) -> List[int]:
+        """Size of each text in the chunker's unit (characters)."""
+        return [len(text) for text in texts]
+    
+    def chunk_rows(self, heading: str, rows: List[str]) -> List[str]:
+        """
+        Pack whole table rows into chunks, repeating the heading (section title) at
+        the top of every chunk so no chunk loses which table it came from. A row too
+        big for a chunk on its own is chunked as text under the heading.
+        """
+        prefix = f"{heading}\n" if heading else ""
+        sizes = self.measure([prefix] + rows)
+        prefix_size, row_sizes = sizes[0], sizes[1:]
+        
+        chunks = []
+        current: List[str] = []
+        current_size = prefix_size
+        
+        for row, size in zip(rows, row_sizes):
+            if current and current_size + 1 + size > self.chunk_size:
+                chunks.append(prefix + "\n".join(current))
+                current, current_size = [], prefix_size
+            
+            if prefix_size + size > self.chunk_size:
+                chunks.extend(self.chunk_text(prefix + row))
+                continue
+            
+            current.append(row)
+            current_size += size + 1
+        
+        if current:
+            chunks.append(prefix + "\n".join(current))
+        
+        return chunks
+
+
+class TokenBudgetChunker(RecursiveChunker):
+    """
+    Sentence-packing chunker measured in model word-pieces instead of characters.
+    Chunks are packed up to the embedding model's max sequence length, so nothing
+    is silently truncated at embed time and batched encodes carry little padding.
+    
+    Token counts are computed with the model's fast tokenizer in one batched call
+    per text and cached per sentence. For WordPiece models (all-MiniLM-L6-v2) the
+    count of space-joined sentences is exactly the sum of the sentence counts.
+    """
+    
+    def __init__(self, tokenizer=None, model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 max_seq_length: int = 256, overlap_tokens: int = 32, cache_size: int = 100_000):
+        """
+        Args:
+            tokenizer: A Hugging Face fast tokenizer (e.g. SentenceTransformer(...).tokenizer);
+                       loaded from model_name when omitted
+            model_name: Tokenizer to load when none is given
+            max_seq_length: Model max sequence length, special tokens included
+            overlap_tokens: Token budget for trailing sentences repeated from the previous chunk
+            cache_size: Maximum number of cached sentence token counts
+        """
+        if tokenizer is None:
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+        
+        self.tokenizer = tokenizer
+        self.max_tokens = max_seq_length - tokenizer.num_special_tokens_to_add()
+        self.overlap_tokens = overlap_tokens
+        self.cache_size = cache_size
+        self._token_counts: Dict[str, int] = {}
+        super().__init__(chunk_size=self.max_tokens, overlap=overlap_tokens)
+    
+    def count_tokens(self, sentences: List[str]) -> List[int]:
+        """Token counts (without special tokens), tokenizing only uncached sentences in one batch."""
+        missing = [s for s in dict.fromkeys(sentences) if s not in self._token_counts]
+        if missing:
+            if len(self._token_counts) + len(missing) > self.cache_size:
+                self._token_counts.clear()
+            encoded = self.tokenizer(missing, add_special_tokens=False)['input_ids']
+            self._token_counts.update(zip(missing, map(len, encoded)))
+        return [self._token_counts[s] for s in sentences]
+    
+    def measure(self, texts: List[str]) -> List[int]:
+        """Size of each text in word-pieces."""
+        return self.count_tokens(texts)
+    
+    def chunk_text(self, text: str) -> List[str]:
+        """Pack whole sentences into chunks of at most max_tokens word-pieces."""
+        if not text:
+            return []
+        
+        sentences = self.split_into_sentences(text)
+        counts = self.count_tokens(sentences)
         
-        overlapped_chunks = [chunks[0]]
+        if sum(counts) <= self.max_tokens:
+            return [text]
         
-        for i in range(1, len(chunks)):
-            prev_chunk = chunks[i - 1]
-            curr_chunk = chunks[i]
+        chunks = []
+        current: List[Tuple[str, int]] = []
+        current_tokens = 0
+        
+        for sentence, n_tokens in zip(sentences, counts):
+            if n_tokens > self.max_tokens:
+                if current:
+                    chunks.append(current)
+                chunks.extend([(part, self.max_tokens)] for part in self._chunk_long_sentence(sentence))
+                current, current_tokens = [], 0
+                continue
             
-            overlap_text = prev_chunk[-self.overlap:] if len(prev_chunk) >= self.overlap else prev_chunk
-            combined = overlap_text + " " + curr_chunk
-            overlapped_chunks.append(combined)
+            if current_tokens + n_tokens <= self.max_tokens:
+                current.append((sentence, n_tokens))
+                current_tokens += n_tokens
+                continue
+            
+            chunks.append(current)
+            current, current_tokens = self._overlap_seed(current, self.max_tokens - n_tokens)
+            current.append((sentence, n_tokens))
+            current_tokens += n_tokens
+        
+        if current:
+            chunks.append(current)
         
-        return overlapped_chunks
+        return [" ".join(sentence for sentence, _ in chunk) for chunk in chunks]
+    
+    def _overlap_seed(self, previous: List[Tuple[str, int]], room: int) -> Tuple[List[Tuple[str, int]], int]:
+        """Trailing sentences of the previous chunk that fit both the overlap budget and the room left."""
+        budget = min(self.overlap_tokens, room)
+        seed = []
+        used = 0
+        for sentence, n_tokens in reversed(previous):
+            if used + n_tokens > budget:
+                break
+            seed.append((sentence, n_tokens))
+            used += n_tokens
+        seed.reverse()
+        return seed, used
+    
+    def _chunk_long_sentence(self, text: str) -> List[str]:
+        """Split a sentence longer than the budget at word-piece boundaries."""
+        offsets = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)['offset_mapping']
+        parts = []
+        for i in range(0, len(offsets), self.max_tokens):
+            window = offsets[i:i + self.max_tokens]
+            start = window[0][0]
+            end = offsets[i + self.max_tokens][0] if i + self.max_tokens < len(offsets) else len(text)
+            parts.append(text[start:end].strip())
+        return [p for p in parts if p]
 
 
 class JSONLChunkingPipeline:
     """Pipeline to chunk JSONL documents for RAG."""
     
-    def __init__(self, chunk_size: int = 512, overlap: int = 50):
-        self.chunker = RecursiveChunker(chunk_size=chunk_size, overlap=overlap)
+    def __init__(self, chunk_size: int = 512, overlap: int = 50,
+                 chunker: Optional[RecursiveChunker] = None):
+        """
+        Args:
+            chunk_size: Target chunk size in characters
+            overlap: Character overlap between chunks
+            chunker: Pre-configured chunker (e.g. TokenBudgetChunker); overrides chunk_size/overlap
+        """
+        self.chunker = chunker or RecursiveChunker(chunk_size=chunk_size, overlap=overlap)
     
-    def process_jsonl_file(self, file_path: str) -> List[Dict]:
+    def iter_jsonl_records(self, file_path: str, start_line: int = 1,
+                           end_line: Optional[int] = None) -> Iterator[Dict]:
         """
-        Process a JSONL file and return chunks with metadata.
+        Lazily read records from a JSONL file, skipping blank and malformed lines.
         
         Args:
             file_path: Path to JSONL file
+            start_line: First line number to read (1-based, inclusive)
+            end_line: Line number to stop before (exclusive); None reads to the end
             
-        Returns:
-            List of chunk dictionaries with metadata
+        Yields:
+            Parsed record dictionaries
         """
-        chunks_with_metadata = []
-        chunk_id = 0
-        
         with open(file_path, 'r', encoding='utf-8') as f:
             for line_num, line in enumerate(f, 1):
+                if line_num < start_line:
+                    continue
+                if end_line is not None and line_num >= end_line:
+                    break
                 if not line.strip():
                     continue
                 
                 try:
-                    record = json.loads(line)
+                    yield json.loads(line)
                 except json.JSONDecodeError as e:
                     print(f"Error parsing line {line_num} in {file_path}: {e}")
-                    continue
-                
-                content = record.get('content', '')
-                if not content:
-                    continue
-                
+    
+    def iter_chunks(self, records: Iterable[Dict], file_path: str) -> Iterator[Dict]:
+        """
+        Chunk a stream of records, yielding chunks with metadata as they are produced.
+        
+        Records from structured scraper output carry kind / section / url: tables
+        ("table" with rows) are packed by whole rows under their section title, and
+        those fields are copied onto the chunks. Plain sectioned records chunk as text.
+        
+        Args:
+            records: Iterable of processed records (e.g. from iter_jsonl_records or
+                     utils/preprocess_text.iter_records)
+            file_path: Source path; its stem prefixes every chunk_id
+            
+        Yields:
+            Chunk dictionaries with metadata
+        """
+        chunk_id = 0
+        
+        for record in records:
+            content = record.get('content', '')
+            if not content:
+                continue
+            
+            if record.get('kind') == 'table' and record.get('rows'):
+                text_chunks = self.chunker.chunk_rows(record.get('section') or '', record['rows'])
+            else:
                 text_chunks = self.chunker.chunk_text(content)
-                
-                for chunk_idx, chunk_text in enumerate(text_chunks):
-                    chunk_metadata = {
-                        'chunk_id': f"{Path(file_path).stem}_chunk_{chunk_id}",
-                        'original_file': record.get('file_name', Path(file_path).name),
-                        'section_index': record.get('section_index', 0),
-                        'chunk_index': chunk_idx,
-                        'content': chunk_text,
-                        'scraped_date': record.get('scraped_date', ''),
-                        'original_id': record.get('id', '')
-                    }
-                    chunks_with_metadata.append(chunk_metadata)
-                    chunk_id += 1
-        
-        return chunks_with_metadata
-    
-    def process_directory(self, input_dir: str, output_dir: str) -> None:
+            structure = {key: record[key] for key in ('kind', 'section', 'url') if key in record}
+            
+            for chunk_idx, chunk_text in enumerate(text_chunks):
+                yield {
+                    'chunk_id': f"{Path(file_path).stem}_chunk_{chunk_id}",
+                    'original_file': record.get('file_name', Path(file_path).name),
+                    'section_index': record.get('section_index', 0),
+                    'chunk_index': chunk_idx,
+                    'content': chunk_text,
+                    'scraped_date': record.get('scraped_date', ''),
+                    'original_id': record.get('id', ''),
+                    **structure
+                }
+                chunk_id += 1
+    
+    def process_jsonl_file(self, file_path: str) -> List[Dict]:
+        """
+        Process a JSONL file and return chunks with metadata.
+        
+        Args:
+            file_path: Path to JSONL file
+            
+        Returns:
+            List of chunk dictionaries with metadata
+        """
+        return list(self.iter_chunks(self.iter_jsonl_records(file_path), file_path))
+    
+    def process_file(self, file_path: str, output_dir: str) -> int:
+        """
+        Chunk one JSONL file into <output_dir>/chunks_<stem>.jsonl, streaming to disk.
+        
+        Args:
+            file_path: Path to JSONL file
+            output_dir: Directory to save chunked data
+            
+        Returns:
+            Number of chunks written
+        """
+        output_file = Path(output_dir) / f"chunks_{Path(file_path).stem}.jsonl"
+        records = self.iter_jsonl_records(file_path)
+        
+        n_chunks = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for chunk in self.iter_chunks(records, file_path):
+                f.write(json.dumps(chunk) + '\n')
+                n_chunks += 1
+        
+        return n_chunks
+    
+    def process_directory(self, input_dir: str, output_dir: str, workers: int = 1,
+                          lines_per_task: int = 2000) -> None:
         """
         Process all JSONL files in a directory and save chunks.
+        Chunks are streamed straight to disk, so memory stays flat per file.
         
         Args:
             input_dir: Directory containing JSONL files
             output_dir: Directory to save chunked data
+            workers: Number of worker processes; > 1 fans files (and line ranges
+                     of large files) across a process pool
+            lines_per_task: Maximum JSONL lines handed to one worker task
         """
         os.makedirs(output_dir, exist_ok=True)
         
-        jsonl_files = list(Path(input_dir).glob('*.jsonl'))
-        total_chunks = 0
+        jsonl_files = sorted(Path(input_dir).glob('*.jsonl'))
         
         print(f"Processing {len(jsonl_files)} JSONL files...")
         
-        for jsonl_file in sorted(jsonl_files):
-            print(f"  Chunking: {jsonl_file.name}")
-            chunks = self.process_jsonl_file(str(jsonl_file))
-            
-            output_file = Path(output_dir) / f"chunks_{jsonl_file.stem}.jsonl"
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                for chunk in chunks:
-                    f.write(json.dumps(chunk) + '\n')
-            
-            total_chunks += len(chunks)
-            print(f"    Generated {len(chunks)} chunks")
+        if workers > 1:
+            total_chunks = self._process_files_parallel(jsonl_files, output_dir, workers, lines_per_task)
+        else:
+            total_chunks = 0
+            for jsonl_file in jsonl_files:
+                print(f"  Chunking: {jsonl_file.name}")
+                start = time.perf_counter()
+                n_chunks = self.process_file(str(jsonl_file), output_dir)
+                total_chunks += n_chunks
+                print(f"    Generated {n_chunks} chunks ({time.perf_counter() - start:.3f}s)")
         
         print(f"\nTotal chunks generated: {total_chunks}")
         print(f"Chunks saved to: {output_dir}")
+    
+    def _process_files_parallel(self, jsonl_files: List[Path], output_dir: str,
+                                workers: int, lines_per_task: int) -> int:
+        """
+        Chunk files across a process pool.
+        
+        Each file is split into line ranges; ranges are chunked independently and
+        renumbered in line order, so chunk_ids are identical to the serial path.
+        """
+        tasks = []
+        for jsonl_file in jsonl_files:
+            with open(jsonl_file, 'r', encoding='utf-8') as f:
+                n_lines = sum(1 for _ in f)
+            ranges = [(start, start + lines_per_task) for start in range(1, n_lines + 1, lines_per_task)]
+            tasks.append((jsonl_file, ranges or [(1, 1)]))
+        
+        total_chunks = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (jsonl_file, [executor.submit(_chunk_line_range, self, str(jsonl_file), start, end)
+                              for start, end in ranges])
+                for jsonl_file, ranges in tasks
+            ]
+            
+            for jsonl_file, parts in futures:
+                output_file = Path(output_dir) / f"chunks_{jsonl_file.stem}.jsonl"
+                n_chunks = 0
+                busy = 0.0
+                
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    for part in parts:
+                        chunks, elapsed = part.result()
+                        busy += elapsed
+                        for chunk in chunks:
+                            chunk['chunk_id'] = f"{jsonl_file.stem}_chunk_{n_chunks}"
+                            f.write(json.dumps(chunk) + '\n')
+                            n_chunks += 1
+                
+                total_chunks += n_chunks
+                print(f"  Chunked: {jsonl_file.name} -> {n_chunks} chunks "
+                      f"({busy:.3f}s across {len(parts)} task(s))")
+        
+        return total_chunks
+
+
+def _chunk_line_range(pipeline: JSONLChunkingPipeline, file_path: str,
+                      start_line: int, end_line: int) -> Tuple[List[Dict], float]:
+    """Process-pool worker: chunk one line range of a JSONL file and time it."""
+    start = time.perf_counter()
+    records = pipeline.iter_jsonl_records(file_path, start_line, end_line)
+    chunks = list(pipeline.iter_chunks(records, file_path))
+    return chunks, time.perf_counter() - start
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""
+Near-duplicate chunk removal at index build time.
+
+Several scrapers start from the same pages and share menus, intro text and FAQ
+blocks, so the same passage is chunked once per source. Before indexing, each
+chunk's word 5-shingles are MinHashed and bucketed with LSH banding; a chunk
+whose LSH candidates include a kept chunk with estimated Jaccard similarity
+>= jaccard and embedding cosine similarity >= cosine is dropped in favour of it.
+Every check is against the kept (canonical) chunk itself, so near-duplicates
+never chain into one group through a series of small edits.
+
+The canonical chunk is the first of its group in build order (sorted source
+files) and records every dropped copy under "duplicates":
+    {"chunk_id", "original_file", "url"?}
+so retrieval can still attribute it to all of its sources.
+"""
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+_PRIME = (1 << 61) - 1
+
+
+def shingles(text: str, k: int = 5) -> set:
+    """Lower-cased word k-shingles (a text shorter than k words is one shingle)."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class MinHasher:
+    """MinHash signatures from num_perm universal hashes (a * x + b) mod 2**61 - 1."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # a < 2**31 and crc32 values < 2**32 keep a * x + b within uint64
+        self.a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, shingle_set: set) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+                             dtype=np.uint64, count=len(shingle_set))
+        return ((np.outer(hashes, self.a) + self.b) % np.uint64(_PRIME)).min(axis=0)
+
+
+class NearDuplicateIndex:
+    """Incremental LSH index of canonical chunks."""
+
+    def __init__(self, jaccard: float = 0.8, cosine: float = 0.95, num_perm: int = 128,
+                 bands: int = 16, shingle_size: int = 5):
+        """
+        Args:
+            jaccard: Minimum estimated Jaccard similarity of the shingle sets
+            cosine: Minimum cosine similarity of the embeddings
+            num_perm: MinHash signature length (must be divisible by bands)
+            bands: LSH bands; 16 bands of 8 rows put the candidate threshold near 0.7
+            shingle_size: Words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.jaccard = jaccard
+        self.cosine = cosine
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self.signatures: List[np.ndarray] = []
+        self.embeddings: List[np.ndarray] = []
+        self.candidate_pairs = 0
+
+    def add(self, text: str, embedding: np.ndarray) -> Optional[int]:
+        """
+        Match text against the canonical chunks added so far.
+
+        Returns:
+            Position (in add order) of the canonical chunk it duplicates, or None
+            if it is new, in which case it becomes canonical itself
+        """
+        shingle_set = shingles(text, self.shingle_size)
+        embedding = np.asarray(embedding, dtype="float32")
+        embedding = embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+        if not shingle_set:
+            # Nothing to compare (e.g. a "--- | ---" row): always kept, never a candidate
+            self._keep(None, embedding)
+            return None
+
+        signature = self.hasher.signature(shingle_set)
+        keys = [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+        candidates = set()
+        for band, key in enumerate(keys):
+            candidates.update(self.buckets[band].get(key, ()))
+        self.candidate_pairs += len(candidates)
+
+        for position in sorted(candidates):
+            if (float(np.mean(self.signatures[position] == signature)) >= self.jaccard
+                    and float(self.embeddings[position] @ embedding) >= self.cosine):
+                return position
+
+        position = self._keep(signature, embedding)
+        for band, key in enumerate(keys):
+            self.buckets[band].setdefault(key, []).append(position)
+        return None
+
+    def _keep(self, signature: Optional[np.ndarray], embedding: np.ndarray) -> int:
+        self.signatures.append(signature)
+        self.embeddings.append(embedding)
+        return len(self.signatures) - 1
+
+
+def _pointer(chunk: Dict) -> Dict:
+    pointer = {"chunk_id": chunk.get("chunk_id"), "original_file": chunk.get("original_file")}
+    if chunk.get("url"):
+        pointer["url"] = chunk["url"]
+    return pointer
+
+
+def deduplicate(chunks: List[Dict], embeddings: np.ndarray, jaccard: float = 0.8,
+                cosine: float = 0.95) -> Tuple[List[Dict], np.ndarray, Dict]:
+    """
+    Drop near-duplicate chunks, keeping one canonical chunk per group.
+
+    Args:
+        chunks: Chunk dictionaries in build order, aligned with embeddings
+        embeddings: (n_chunks, embedding_dim)
+        jaccard: Minimum estimated shingle Jaccard similarity (text check)
+        cosine: Minimum embedding cosine similarity (semantic check)
+
+    Returns:
+        (kept chunks with "duplicates" provenance, their embeddings, report) where
+        report holds chunk counts, groups merged and float32 vector bytes before/after
+    """
+    index = NearDuplicateIndex(jaccard=jaccard, cosine=cosine)
+    kept_rows: List[int] = []
+    kept: List[Dict] = []
+    for row, chunk in enumerate(chunks):
+        position = index.add(chunk["content"], embeddings[row])
+        if position is None:
+            kept_rows.append(row)
+            kept.append(dict(chunk))
+        else:
+            kept[position].setdefault("duplicates", []).append(_pointer(chunk))
+
+    dim = embeddings.shape[1] if len(embeddings) else 0
+    report = {
+        "chunks_before": len(chunks),
+        "chunks_after": len(kept),
+        "removed": len(chunks) - len(kept),
+        "groups": sum("duplicates" in chunk for chunk in kept),
+        "cross_source_groups": sum(
+            any(dup["original_file"] != chunk.get("original_file") for dup in chunk.get("duplicates", ()))
+            for chunk in kept
+        ),
+        "candidate_pairs": index.candidate_pairs,
+        "vector_bytes_before": len(chunks) * dim * 4,
+        "vector_bytes_after": len(kept) * dim * 4,
+        "reduction": round(1 - len(kept) / len(chunks), 4) if chunks else 0.0,
+        "jaccard": jaccard,
+        "cosine": cosine,
+    }
+    return kept, embeddings[kept_rows], report
+
+
+def format_report(report: Dict) -> str:
+    return (f"Near-duplicate removal: {report['chunks_before']} -> {report['chunks_after']} chunks "
+            f"({report['removed']} removed, {report['reduction']:.1%}; {report['groups']} groups, "
+            f"{report['cross_source_groups']} spanning sources); vectors "
+            f"{report['vector_bytes_before'] / 2**20:.2f} -> {report['vector_bytes_after'] / 2**20:.2f} MiB")
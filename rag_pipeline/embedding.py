@@ -1,12 +1,231 @@
+import hashlib
 import json
 import os
+import shutil
+import sys
+import time
+from datetime import datetime
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional
+from itertools import islice
 import faiss
 from sentence_transformers import SentenceTransformer
 import pickle
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from preprocess_text import iter_faq_pairs, raw_sources
+from small_to_big import SmallToBigIndex
+from dedup import deduplicate, format_report
+
+
+# Index layouts accepted by EmbeddingPipeline.create_faiss_index.
+# 'ivf_flat' keeps full float32 vectors resident (the original layout);
+# the others store compressed codes and rely on exact re-ranking.
+INDEX_TYPES = ("ivf_flat", "ivf_pq", "sq8", "fp16")
+COMPRESSED_INDEX_TYPES = ("ivf_pq", "sq8", "fp16")
+
+
+# Versioned store layout:
+#   <store_dir>/CURRENT                    name of the live version (swapped atomically)
+#   <store_dir>/versions/<version>/        faiss_index.bin, metadata.jsonl, config.json (incl. dedup report),
+#                                          [vectors.npy], [faq_index.bin, faq.jsonl],
+#                                          [child_index.bin, children.jsonl, parents.jsonl], manifest.json
+# A store_dir without CURRENT is read as a legacy flat directory.
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+MANIFEST_FILE = "manifest.json"
+FAQ_INDEX_FILE = "faq_index.bin"
+FAQ_FILE = "faq.jsonl"
+# A superseded version is only deleted once it has not been live for this long,
+# so a reader still loading or mapping it is not cut off mid-read
+PRUNE_GRACE_SECONDS = 300
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_current_version(store_dir: str) -> Optional[str]:
+    """Name of the live version, or None for a legacy (unversioned) store."""
+    current_path = os.path.join(store_dir, CURRENT_FILE)
+    if not os.path.exists(current_path):
+        return None
+    with open(current_path, 'r', encoding='utf-8') as f:
+        return f.read().strip() or None
+
+
+def resolve_store_dir(store_dir: str) -> Tuple[str, Optional[str]]:
+    """
+    Resolve a store directory to the directory holding the live files.
+    
+    Returns:
+        Tuple of (directory, version); version is None for a legacy store
+    """
+    version = read_current_version(store_dir)
+    if version is None:
+        return store_dir, None
+    return os.path.join(store_dir, VERSIONS_DIR, version), version
+
+
+def verify_manifest(version_dir: str) -> None:
+    """Check every file listed in the version manifest against its size and sha256."""
+    manifest_path = os.path.join(version_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    for name, expected in manifest['files'].items():
+        path = os.path.join(version_dir, name)
+        if not os.path.exists(path) or os.path.getsize(path) != expected['size'] \
+                or _sha256(path) != expected['sha256']:
+            raise ValueError(f"Vector store file failed checksum: {path}")
+
+
+def begin_version(store_dir: str) -> Tuple[str, str]:
+    """
+    Reserve a new version and its staging directory under store_dir/versions.
+    
+    Returns:
+        Tuple of (version, staging_dir)
+    """
+    version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    staging_dir = os.path.join(store_dir, VERSIONS_DIR, f".{version}.staging")
+    os.makedirs(staging_dir, exist_ok=True)
+    return version, staging_dir
+
+
+def commit_version(store_dir: str, version: str, staging_dir: str, keep_versions: int = 3) -> str:
+    """
+    Seal a staged version with a checksum manifest and make it the live one.
+    
+    The staging directory is renamed into place, then CURRENT is replaced with
+    os.replace, so readers always see one complete, verified version.
+    Older versions beyond keep_versions are pruned, except the version that was
+    live until this call and any superseded less than PRUNE_GRACE_SECONDS ago;
+    those are left for a later publish.
+    
+    Returns:
+        Path of the published version directory
+    """
+    files = {
+        name: {'size': os.path.getsize(os.path.join(staging_dir, name)),
+               'sha256': _sha256(os.path.join(staging_dir, name))}
+        for name in sorted(os.listdir(staging_dir))
+    }
+    with open(os.path.join(staging_dir, MANIFEST_FILE), 'w') as f:
+        json.dump({'version': version, 'created': datetime.now().isoformat(), 'files': files}, f, indent=2)
+    
+    version_dir = os.path.join(store_dir, VERSIONS_DIR, version)
+    os.replace(staging_dir, version_dir)
+    previous = read_current_version(store_dir)
+    
+    current_tmp = os.path.join(store_dir, f".{CURRENT_FILE}.tmp")
+    with open(current_tmp, 'w', encoding='utf-8') as f:
+        f.write(version + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(current_tmp, os.path.join(store_dir, CURRENT_FILE))
+    print(f"Published vector store version: {version}")
+    
+    versions_dir = os.path.join(store_dir, VERSIONS_DIR)
+    versions = sorted(v for v in os.listdir(versions_dir) if not v.startswith('.'))
+    for i, old in enumerate(versions[:-keep_versions] if keep_versions > 0 else []):
+        if old in (version, previous):
+            continue
+        # The next version's manifest was written just before it went live
+        successor_manifest = os.path.join(versions_dir, versions[i + 1], MANIFEST_FILE)
+        if (os.path.exists(successor_manifest)
+                and time.time() - os.path.getmtime(successor_manifest) < PRUNE_GRACE_SECONDS):
+            continue
+        shutil.rmtree(os.path.join(versions_dir, old), ignore_errors=True)
+    
+    return version_dir
+
+
+def exact_rerank(query_embedding: np.ndarray, candidate_ids: np.ndarray,
+                 vectors: np.ndarray, k: int) -> Tuple[List[int], List[float]]:
+    """
+    Re-rank a short list of candidates with exact L2 distances.
+    
+    Args:
+        query_embedding: Query vector of shape (embedding_dim,)
+        candidate_ids: Candidate row ids returned by a compressed index (-1 = empty slot)
+        vectors: Original float32 vectors (typically a read-only memmap of vectors.npy)
+        k: Number of results to keep
+        
+    Returns:
+        Tuple of (row ids, squared L2 distances), nearest first
+    """
+    # Sorted row ids keep memmap reads sequential on disk
+    ids = sorted({int(i) for i in candidate_ids if 0 <= i < len(vectors)})
+    if not ids:
+        return [], []
+    
+    candidates = np.asarray(vectors[ids], dtype='float32')
+    diffs = candidates - query_embedding.astype('float32').reshape(1, -1)
+    distances = np.einsum('ij,ij->i', diffs, diffs)
+    
+    top = np.argsort(distances)[:k]
+    return [ids[i] for i in top], [float(distances[i]) for i in top]
+
+
+def build_faq_index(embedding_pipeline: 'EmbeddingPipeline', faqs: Iterable[Dict],
+                    embeddings: Optional[np.ndarray] = None) -> Tuple[Optional[faiss.Index], List[Dict]]:
+    """
+    Index the question side of FAQ pairs for direct answering.
+    
+    Questions are unit-normalized in an exact inner-product index, so search
+    scores are cosine similarities. Repeated questions keep their first answer.
+    
+    Args:
+        embedding_pipeline: Embeds the questions unless embeddings are given
+        faqs: FAQ pairs (see preprocess_text.iter_faq_pairs)
+        embeddings: Precomputed question embeddings aligned with faqs (e.g. cached per source)
+    
+    Returns:
+        Tuple of (index, faqs aligned with its rows); (None, []) without FAQs
+    """
+    unique = {}
+    for row, faq in enumerate(faqs):
+        unique.setdefault(" ".join(faq['question'].casefold().split()), (row, faq))
+    rows = [row for row, _ in unique.values()]
+    faqs = [faq for _, faq in unique.values()]
+    if not faqs:
+        return None, []
+    
+    if embeddings is None:
+        embeddings = embedding_pipeline.embed_texts([faq['question'] for faq in faqs])
+    else:
+        embeddings = embeddings[rows]
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+    faiss.normalize_L2(embeddings)
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+    return index, faqs
+
+
+def iter_raw_faqs(raw_dir: str) -> Iterator[Dict]:
+    """FAQ pairs of every raw source in raw_dir (see preprocess_text.iter_faq_pairs)."""
+    for raw_path in raw_sources(raw_dir).values():
+        yield from iter_faq_pairs(raw_path)
+
+
+def load_faq_index(version_dir: str) -> Tuple[Optional[faiss.Index], List[Dict]]:
+    """FAQ index and pairs saved in a store directory; (None, []) if it has none."""
+    index_path = os.path.join(version_dir, FAQ_INDEX_FILE)
+    faq_path = os.path.join(version_dir, FAQ_FILE)
+    if not os.path.exists(index_path) or not os.path.exists(faq_path):
+        return None, []
+    with open(faq_path, 'r', encoding='utf-8') as f:
+        faqs = [json.loads(line) for line in f if line.strip()]
+    return faiss.read_index(index_path), faqs
+
 
 class EmbeddingPipeline:
     """
@@ -48,34 +267,71 @@ class EmbeddingPipeline:
         )
         return embeddings
     
-    def create_faiss_index(self, embeddings: np.ndarray, use_gpu: bool = False) -> faiss.Index:
+    def create_faiss_index(self, embeddings: np.ndarray, use_gpu: bool = False,
+                           index_type: str = "ivf_flat", pq_m: int = 48,
+                           pq_nbits: int = 8, nprobe: int = 8) -> faiss.Index:
         """
         Create FAISS index from embeddings.
         Uses IVF (Inverted File) for scalable similarity search.
         
+        Compressed layouts for memory-constrained deployments:
+            'ivf_pq': IVF with product quantization (pq_m bytes per vector at 8 bits)
+            'sq8':    scalar-quantized int8 codes (1 byte per dimension)
+            'fp16':   scalar-quantized float16 codes (2 bytes per dimension)
+        
         Args:
             embeddings: Numpy array of embeddings
             use_gpu: Whether to use GPU (requires faiss-gpu)
+            index_type: One of INDEX_TYPES
+            pq_m: Number of PQ sub-quantizers (rounded down to a divisor of the dimension)
+            pq_nbits: Bits per PQ code (reduced automatically for tiny corpora)
+            nprobe: IVF cells probed per query (saved with the index by write_index)
             
         Returns:
             FAISS index object
         """
-        print(f"Creating FAISS index for {len(embeddings)} embeddings...")
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index_type '{index_type}'. Expected one of {INDEX_TYPES}")
+        
+        print(f"Creating FAISS index ({index_type}) for {len(embeddings)} embeddings...")
         
         embeddings = embeddings.astype('float32')
         
         n_embeddings = len(embeddings)
         embedding_dim = embeddings.shape[1]
-        
-        if n_embeddings < 100:
-            index = faiss.IndexFlatL2(embedding_dim)
+        n_clusters = min(int(np.sqrt(n_embeddings)), 100)
+        use_ivf = n_embeddings >= 100
+        
+        if index_type == "ivf_flat":
+            if not use_ivf:
+                index = faiss.IndexFlatL2(embedding_dim)
+            else:
+                quantizer = faiss.IndexFlatL2(embedding_dim)
+                index = faiss.IndexIVFFlat(quantizer, embedding_dim, n_clusters)
+        elif index_type == "ivf_pq":
+            m = max(d for d in range(1, min(pq_m, embedding_dim) + 1) if embedding_dim % d == 0)
+            # k-means needs at least 2**nbits training points per sub-quantizer
+            nbits = max(1, min(pq_nbits, int(np.log2(max(n_embeddings, 2)))))
+            if not use_ivf:
+                index = faiss.IndexPQ(embedding_dim, m, nbits)
+            else:
+                quantizer = faiss.IndexFlatL2(embedding_dim)
+                index = faiss.IndexIVFPQ(quantizer, embedding_dim, n_clusters, m, nbits)
         else:
-            n_clusters = min(int(np.sqrt(n_embeddings)), 100)
-            quantizer = faiss.IndexFlatL2(embedding_dim)
-            index = faiss.IndexIVFFlat(quantizer, embedding_dim, n_clusters)
+            qtype = (faiss.ScalarQuantizer.QT_8bit if index_type == "sq8"
+                     else faiss.ScalarQuantizer.QT_fp16)
+            if not use_ivf:
+                index = faiss.IndexScalarQuantizer(embedding_dim, qtype)
+            else:
+                quantizer = faiss.IndexFlatL2(embedding_dim)
+                index = faiss.IndexIVFScalarQuantizer(quantizer, embedding_dim, n_clusters, qtype)
+        
+        if not index.is_trained:
             index.train(embeddings)
         
         index.add(embeddings)
+        if use_ivf:
+            index.nprobe = min(nprobe, n_clusters)
         
         print(f"FAISS index created with {index.ntotal} vectors")
         return index
@@ -84,11 +340,34 @@ class EmbeddingPipeline:
 class FAISSVectorStore:
     """Manages FAISS vector store with metadata."""
     
-    def __init__(self, embedding_pipeline: EmbeddingPipeline):
+    def __init__(self, embedding_pipeline: EmbeddingPipeline, index_type: str = "ivf_flat",
+                 rerank_factor: int = 4):
+        """
+        Args:
+            embedding_pipeline: EmbeddingPipeline instance
+            index_type: FAISS layout, one of INDEX_TYPES
+            rerank_factor: For compressed layouts, fetch k * rerank_factor candidates
+                           and re-rank them exactly against the original vectors
+        """
         self.embedding_pipeline = embedding_pipeline
+        self.index_type = index_type
+        self.rerank_factor = rerank_factor
         self.index = None
+        self.vectors = None
         self.metadata = []
         self.id_to_metadata = {}
+        self.faq_index = None
+        self.faqs = []
+        self.small_to_big = None  # optional SmallToBigIndex, saved alongside
+        self.dedup_report = None  # set by add_deduplicated, recorded in config.json
+    
+    def add_faqs(self, faqs: Iterable[Dict], embeddings: Optional[np.ndarray] = None) -> None:
+        """
+        Index FAQ pairs (see preprocess_text.iter_faq_pairs) for direct answering;
+        saved as faq_index.bin / faq.jsonl next to the chunk index. Pass the
+        question embeddings, aligned with faqs, to skip embedding them here.
+        """
+        self.faq_index, self.faqs = build_faq_index(self.embedding_pipeline, faqs, embeddings)
     
     def add_chunks(self, chunks: List[Dict]) -> None:
         """
@@ -99,18 +378,40 @@ class FAISSVectorStore:
         """
         texts = [chunk['content'] for chunk in chunks]
         embeddings = self.embedding_pipeline.embed_texts(texts)
+        self.add_embeddings(chunks, embeddings)
+    
+    def add_embeddings(self, chunks: List[Dict], embeddings: np.ndarray) -> None:
+        """
+        Add chunks whose embeddings were computed elsewhere (e.g. cached per file).
+        
+        Args:
+            chunks: List of chunk dictionaries, aligned with embeddings
+            embeddings: Numpy array of embeddings (n_chunks, embedding_dim)
+        """
+        embeddings = embeddings.astype('float32')
         
         if self.index is None:
-            self.index = self.embedding_pipeline.create_faiss_index(embeddings)
+            self.index = self.embedding_pipeline.create_faiss_index(embeddings, index_type=self.index_type)
         else:
-            embeddings = embeddings.astype('float32')
             self.index.add(embeddings)
         
+        if self.index_type in COMPRESSED_INDEX_TYPES:
+            self.vectors = embeddings if self.vectors is None else np.vstack([self.vectors, embeddings])
+        
         for idx, chunk in enumerate(chunks):
             chunk_id = chunk.get('chunk_id', f"chunk_{len(self.metadata)}")
             self.id_to_metadata[len(self.metadata)] = chunk_id
             self.metadata.append(chunk)
     
+    def add_deduplicated(self, chunks: List[Dict], embeddings: np.ndarray) -> None:
+        """
+        add_embeddings after dropping near-duplicate chunks (see dedup.py); each
+        kept chunk lists the copies it replaced under "duplicates".
+        """
+        chunks, embeddings, self.dedup_report = deduplicate(chunks, embeddings)
+        print(format_report(self.dedup_report))
+        self.add_embeddings(chunks, embeddings)
+    
     def search(self, query: str, k: int = 5) -> List[Tuple[Dict, float]]:
         """
         Search for similar chunks.
@@ -128,6 +429,12 @@ class FAISSVectorStore:
         query_embedding = self.embedding_pipeline.embed_texts([query])[0]
         query_embedding = query_embedding.astype('float32').reshape(1, -1)
         
+        if self.vectors is not None:
+            _, candidates = self.index.search(query_embedding, k * self.rerank_factor)
+            ids, dists = exact_rerank(query_embedding[0], candidates[0], self.vectors, k)
+            return [(self.metadata[idx], distance) for idx, distance in zip(ids, dists)
+                    if idx < len(self.metadata)]
+        
         distances, indices = self.index.search(query_embedding, k)
         
         results = []
@@ -152,72 +459,241 @@ class FAISSVectorStore:
         index_path = os.path.join(save_dir, "faiss_index.bin")
         metadata_path = os.path.join(save_dir, "metadata.jsonl")
         config_path = os.path.join(save_dir, "config.json")
+        vectors_path = os.path.join(save_dir, "vectors.npy")
         
         faiss.write_index(self.index, index_path)
         print(f"FAISS index saved to: {index_path}")
         
+        if self.vectors is not None:
+            np.save(vectors_path, self.vectors)
+            print(f"Original vectors saved to: {vectors_path}")
+        elif os.path.exists(vectors_path):
+            os.remove(vectors_path)
+        
         with open(metadata_path, 'w', encoding='utf-8') as f:
             for metadata in self.metadata:
                 f.write(json.dumps(metadata) + '\n')
         print(f"Metadata saved to: {metadata_path}")
         
+        self._write_config(config_path, len(self.metadata))
+        self._save_faqs(save_dir)
+        self._save_small_to_big(save_dir)
+    
+    def _save_faqs(self, save_dir: str) -> None:
+        """Write the FAQ index, or drop a stale one when there are no FAQs."""
+        index_path = os.path.join(save_dir, FAQ_INDEX_FILE)
+        faq_path = os.path.join(save_dir, FAQ_FILE)
+        if self.faq_index is None:
+            for path in (index_path, faq_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+        
+        faiss.write_index(self.faq_index, index_path)
+        with open(faq_path, 'w', encoding='utf-8') as f:
+            for faq in self.faqs:
+                f.write(json.dumps(faq) + '\n')
+        print(f"FAQ index saved to: {index_path} ({len(self.faqs)} questions)")
+    
+    def _save_small_to_big(self, save_dir: str) -> None:
+        if self.small_to_big is not None:
+            self.small_to_big.save(save_dir)
+        else:
+            SmallToBigIndex.remove(save_dir)
+    
+    def publish(self, store_dir: str, keep_versions: int = 3) -> str:
+        """
+        Save as a new immutable version under store_dir and atomically make it live.
+        
+        Args:
+            store_dir: Versioned store directory (e.g. data/vector_store)
+            keep_versions: Number of versions to retain
+            
+        Returns:
+            Path of the published version directory
+        """
+        version, staging_dir = begin_version(store_dir)
+        self.save(staging_dir)
+        return commit_version(store_dir, version, staging_dir, keep_versions)
+    
+    def _write_config(self, config_path: str, num_chunks: int) -> None:
+        """Write config.json describing the saved index."""
         config = {
             'model_name': self.embedding_pipeline.model_name,
             'embedding_dim': self.embedding_pipeline.embedding_dim,
             'num_vectors': self.index.ntotal,
-            'num_chunks': len(self.metadata)
+            'num_chunks': num_chunks,
+            'index_type': self.index_type,
+            'rerank_factor': self.rerank_factor
         }
+        if self.dedup_report is not None:
+            config['dedup'] = self.dedup_report
         with open(config_path, 'w') as f:
             json.dump(config, f, indent=2)
         print(f"Config saved to: {config_path}")
     
+    def build_from_stream(self, chunks: Iterable[Dict], save_dir: str,
+                          batch_size: int = 256, train_size: int = 4096) -> int:
+        """
+        Embed and index a stream of chunks in bounded batches, writing metadata
+        (and the original vectors for compressed layouts) to disk as it goes.
+        
+        Peak memory is one batch plus the index itself. Metadata is not kept in
+        memory, so reload with FAISSVectorStore.load() to query the result.
+        
+        Args:
+            chunks: Iterable of chunk dictionaries with 'content' key
+            save_dir: Directory to save index and metadata
+            batch_size: Number of chunks embedded and added per batch
+            train_size: Number of leading chunks used to train IVF/PQ quantizers
+            
+        Returns:
+            Number of chunks indexed (0 if the stream was empty)
+        """
+        os.makedirs(save_dir, exist_ok=True)
+        
+        index_path = os.path.join(save_dir, "faiss_index.bin")
+        metadata_path = os.path.join(save_dir, "metadata.jsonl")
+        config_path = os.path.join(save_dir, "config.json")
+        vectors_path = os.path.join(save_dir, "vectors.npy")
+        raw_vectors_path = os.path.join(save_dir, "vectors.f32.tmp")
+        
+        keep_vectors = self.index_type in COMPRESSED_INDEX_TYPES
+        stream = iter(chunks)
+        n_chunks = 0
+        
+        # Peek before touching save_dir so an empty stream leaves an existing store intact
+        batch = list(islice(stream, max(train_size, batch_size)))
+        if not batch:
+            return 0
+        
+        vectors_file = open(raw_vectors_path, 'wb') if keep_vectors else None
+        try:
+            with open(metadata_path, 'w', encoding='utf-8') as metadata_file:
+                while batch:
+                    embeddings = self.embedding_pipeline.embed_texts(
+                        [chunk['content'] for chunk in batch]
+                    ).astype('float32')
+                    
+                    if self.index is None:
+                        self.index = self.embedding_pipeline.create_faiss_index(
+                            embeddings, index_type=self.index_type
+                        )
+                    else:
+                        self.index.add(embeddings)
+                    
+                    if vectors_file is not None:
+                        vectors_file.write(embeddings.tobytes())
+                    for chunk in batch:
+                        metadata_file.write(json.dumps(chunk) + '\n')
+                    
+                    n_chunks += len(batch)
+                    batch = list(islice(stream, batch_size))
+        finally:
+            if vectors_file is not None:
+                vectors_file.close()
+        
+        faiss.write_index(self.index, index_path)
+        print(f"FAISS index saved to: {index_path}")
+        print(f"Metadata saved to: {metadata_path}")
+        
+        if keep_vectors:
+            self._finalize_vectors(raw_vectors_path, vectors_path, n_chunks, batch_size)
+            print(f"Original vectors saved to: {vectors_path}")
+        elif os.path.exists(vectors_path):
+            os.remove(vectors_path)
+        
+        self._write_config(config_path, n_chunks)
+        self._save_faqs(save_dir)
+        self._save_small_to_big(save_dir)
+        return n_chunks
+    
+    def _finalize_vectors(self, raw_path: str, npy_path: str, n_vectors: int, block: int) -> None:
+        """Copy raw float32 rows into a .npy file block by block, then drop the raw file."""
+        dim = self.embedding_pipeline.embedding_dim
+        raw = np.memmap(raw_path, dtype='float32', mode='r', shape=(n_vectors, dim))
+        out = np.lib.format.open_memmap(npy_path, mode='w+', dtype='float32', shape=(n_vectors, dim))
+        for start in range(0, n_vectors, block):
+            out[start:start + block] = raw[start:start + block]
+        out.flush()
+        del raw, out
+        os.remove(raw_path)
+    
     @staticmethod
     def load(save_dir: str, embedding_pipeline: EmbeddingPipeline) -> 'FAISSVectorStore':
         """
         Load FAISS index and metadata.
         
         Args:
-            save_dir: Directory containing saved index and metadata
+            save_dir: Store directory (versioned or legacy) or a version directory
             embedding_pipeline: EmbeddingPipeline instance
             
         Returns:
             Loaded FAISSVectorStore instance
         """
-        vector_store = FAISSVectorStore(embedding_pipeline)
+        save_dir, _ = resolve_store_dir(save_dir)
+        verify_manifest(save_dir)
         
         index_path = os.path.join(save_dir, "faiss_index.bin")
         metadata_path = os.path.join(save_dir, "metadata.jsonl")
+        config_path = os.path.join(save_dir, "config.json")
+        vectors_path = os.path.join(save_dir, "vectors.npy")
+        
+        config = {}
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+        
+        vector_store = FAISSVectorStore(
+            embedding_pipeline,
+            index_type=config.get('index_type', 'ivf_flat'),
+            rerank_factor=config.get('rerank_factor', 4)
+        )
         
         vector_store.index = faiss.read_index(index_path)
         print(f"FAISS index loaded from: {index_path}")
         
+        if os.path.exists(vectors_path):
+            # Memory-mapped: only the re-ranked short list is paged in
+            vector_store.vectors = np.load(vectors_path, mmap_mode='r')
+            print(f"Original vectors mapped from: {vectors_path}")
+        
         with open(metadata_path, 'r', encoding='utf-8') as f:
             for line in f:
                 metadata = json.loads(line)
                 vector_store.metadata.append(metadata)
         print(f"Metadata loaded: {len(vector_store.metadata)} chunks")
         
+        vector_store.faq_index, vector_store.faqs = load_faq_index(save_dir)
+        vector_store.small_to_big = SmallToBigIndex.load(save_dir)
+        
         return vector_store
 
 
 class EmbeddingPipelineExecutor:
     """Main executor for the embedding pipeline."""
     
-    def __init__(self, chunks_dir: str, output_dir: str, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, chunks_dir: str, output_dir: str, model_name: str = "all-MiniLM-L6-v2",
+                 index_type: str = "ivf_flat", raw_dir: Optional[str] = None, dedup: bool = True):
         """
         Args:
             chunks_dir: Directory containing chunked JSONL files
             output_dir: Directory to save FAISS index and metadata
             model_name: Sentence Transformers model name
+            index_type: FAISS layout, one of INDEX_TYPES ('ivf_pq'/'sq8'/'fp16' for compact indexes)
+            raw_dir: Raw scraper output to take FAQ pairs from for the FAQ index (none if omitted)
+            dedup: Drop near-duplicate chunks before indexing (in-memory builds only; a
+                   streaming build writes metadata before later duplicates are seen)
         """
         self.chunks_dir = chunks_dir
         self.output_dir = output_dir
+        self.raw_dir = raw_dir
+        self.dedup = dedup
         self.embedding_pipeline = EmbeddingPipeline(model_name=model_name)
-        self.vector_store = FAISSVectorStore(self.embedding_pipeline)
+        self.vector_store = FAISSVectorStore(self.embedding_pipeline, index_type=index_type)
     
-    def load_chunks_from_directory(self) -> List[Dict]:
-        """Load all chunks from JSONL files in chunks directory."""
-        all_chunks = []
+    def iter_chunks_from_directory(self) -> Iterator[Dict]:
+        """Lazily yield chunks from JSONL files in chunks directory, one line at a time."""
         chunk_files = list(Path(self.chunks_dir).glob('chunks_*.jsonl'))
         
         print(f"Loading chunks from {len(chunk_files)} files...")
@@ -226,34 +702,70 @@ class EmbeddingPipelineExecutor:
             with open(chunk_file, 'r', encoding='utf-8') as f:
                 for line in f:
                     if line.strip():
-                        chunk = json.loads(line)
-                        all_chunks.append(chunk)
+                        yield json.loads(line)
+    
+    def load_chunks_from_directory(self) -> List[Dict]:
+        """Load all chunks from JSONL files in chunks directory."""
+        all_chunks = list(self.iter_chunks_from_directory())
         
         print(f"Total chunks loaded: {len(all_chunks)}")
         return all_chunks
     
-    def execute(self) -> None:
-        """Execute the complete embedding pipeline."""
+    def execute(self, streaming: bool = False, batch_size: int = 256) -> None:
+        """
+        Execute the complete embedding pipeline.
+        
+        Args:
+            streaming: Embed and index chunks in bounded batches instead of loading
+                       the whole corpus first (constant memory regardless of corpus size)
+            batch_size: Chunks per batch in streaming mode
+        """
         print("=" * 60)
         print("RAG EMBEDDING PIPELINE")
         print("=" * 60)
         
-        chunks = self.load_chunks_from_directory()
-        
-        if not chunks:
-            print("No chunks found. Run chunking.py first.")
-            return
+        if self.raw_dir:
+            self.vector_store.add_faqs(iter_raw_faqs(self.raw_dir))
         
-        self.vector_store.add_chunks(chunks)
-        self.vector_store.save(self.output_dir)
+        if streaming:
+            if self.dedup:
+                print("Streaming build: near-duplicate removal skipped.")
+            version, staging_dir = begin_version(self.output_dir)
+            n_chunks = self.vector_store.build_from_stream(
+                self.iter_chunks_from_directory(), staging_dir, batch_size=batch_size
+            )
+            
+            if not n_chunks:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                print("No chunks found. Run chunking.py first.")
+                return
+            commit_version(self.output_dir, version, staging_dir)
+        else:
+            chunks = self.load_chunks_from_directory()
+            
+            if not chunks:
+                print("No chunks found. Run chunking.py first.")
+                return
+            
+            if self.dedup:
+                embeddings = self.embedding_pipeline.embed_texts([chunk['content'] for chunk in chunks])
+                self.vector_store.add_deduplicated(chunks, embeddings)
+            else:
+                self.vector_store.add_chunks(chunks)
+            self.vector_store.publish(self.output_dir)
+            n_chunks = len(self.vector_store.metadata)
         
         print("\n" + "=" * 60)
         print("EMBEDDING PIPELINE COMPLETED SUCCESSFULLY")
         print("=" * 60)
         print(f"Vector store saved to: {self.output_dir}")
-        print(f"Total chunks embedded: {len(chunks)}")
+        print(f"Total chunks embedded: {n_chunks}")
         print(f"Embedding model: {self.embedding_pipeline.model_name}")
         print(f"Embedding dimension: {self.embedding_pipeline.embedding_dim}")
+        print(f"Index type: {self.vector_store.index_type}")
+        print(f"FAQ questions indexed: {len(self.vector_store.faqs)}")
+        if self.vector_store.dedup_report is not None:
+            print(format_report(self.vector_store.dedup_report))
 
 
 if __name__ == "__main__":
@@ -263,6 +775,7 @@ if __name__ == "__main__":
     executor = EmbeddingPipelineExecutor(
         chunks_dir=chunks_directory,
         output_dir=output_directory,
-        model_name="all-MiniLM-L6-v2"
+        model_name="all-MiniLM-L6-v2",
+        raw_dir="../data/raw"
     )
     executor.execute()
@@ -0,0 +1,303 @@
+"""
+Local stand-in for the Gemini generate_content API, for load tests without a key.
+
+FakeLLMServer speaks the REST shape of the Gemini API:
+    POST /v1beta/models/<model>:generateContent
+    POST /v1beta/models/<model>:streamGenerateContent?alt=sse
+    GET  /stats
+with a configurable latency distribution (lognormal around a median), injected
+429 RESOURCE_EXHAUSTED errors, a cap on concurrently served requests (excess
+requests queue, like a provider-side rate limiter) and streamed responses split
+into chunks.
+
+Everything random is derived from (seed, prompt, how many times that prompt was
+seen), so a run is reproducible regardless of how requests interleave.
+
+FakeGeminiClient has the generate_content(prompt, stream=False) surface of
+genai.GenerativeModel (usage_metadata included) and raises
+google.api_core.exceptions.ResourceExhausted on 429, so retry/backoff behaves
+as with the real service. Use it through llm.py:
+    pipeline = AgenticRAGPipeline(store_dir, llm=make_provider("fake:http://127.0.0.1:8089"))
+
+Usage:
+    python rag_pipeline/fake_llm.py --port 8089 --latency-ms 800 --sigma 0.4 --error-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+
+_ROUTE = re.compile(r"^/v1beta/models/([^/:]+):(generateContent|streamGenerateContent)$")
+
+
+class FakeLLMConfig:
+    """Latency, error and response-shape knobs for FakeLLMServer."""
+
+    def __init__(self, latency_ms: float = 800.0, sigma: float = 0.4, min_latency_ms: float = 0.0,
+                 max_latency_ms: float = 30000.0, error_rate: float = 0.0, max_concurrency: int = 0,
+                 response_words: int = 60, stream_chunks: int = 4, seed: int = 0):
+        """
+        Args:
+            latency_ms: Median service time per request
+            sigma: Lognormal shape; 0 gives a fixed latency
+            min_latency_ms / max_latency_ms: Clip for sampled latencies
+            error_rate: Probability a request is answered 429 RESOURCE_EXHAUSTED
+            max_concurrency: Requests served at once; others wait for a slot (0 = unlimited)
+            response_words: Words in each generated answer
+            stream_chunks: Chunks a streamed answer is split into
+            seed: Base seed for all sampled values
+        """
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.min_latency_ms = min_latency_ms
+        self.max_latency_ms = max_latency_ms
+        self.error_rate = error_rate
+        self.max_concurrency = max_concurrency
+        self.response_words = response_words
+        self.stream_chunks = stream_chunks
+        self.seed = seed
+
+
+class FakeLLMServer:
+    """Threaded HTTP server answering generateContent requests per FakeLLMConfig."""
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None, port: int = 0, host: str = "127.0.0.1"):
+        self.config = config or FakeLLMConfig()
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        self._slots = threading.Semaphore(self.config.max_concurrency) if self.config.max_concurrency > 0 else None
+        self.stats = {"requests": 0, "rate_limited": 0, "streamed": 0, "in_flight": 0, "max_in_flight": 0,
+                      "queue_wait_s": 0.0, "max_queue_wait_s": 0.0, "service_s": 0.0}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeLLMServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def sample(self, prompt: str) -> Tuple[random.Random, bool, float]:
+        """(rng, rate_limited, latency seconds) for the next request with this prompt."""
+        with self._lock:
+            n = self._seen.get(prompt, 0)
+            self._seen[prompt] = n + 1
+        digest = hashlib.sha256(f"{self.config.seed}:{n}:{prompt}".encode("utf-8")).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big"))
+        rate_limited = rng.random() < self.config.error_rate
+        latency_ms = self.config.latency_ms * math.exp(self.config.sigma * rng.gauss(0.0, 1.0))
+        latency_ms = min(max(latency_ms, self.config.min_latency_ms), self.config.max_latency_ms)
+        return rng, rate_limited, latency_ms / 1000
+
+    def answer(self, rng: random.Random, prompt: str) -> str:
+        words = re.findall(r"[A-Za-z][A-Za-z.%-]*", prompt) or ["answer"]
+        return " ".join(rng.choice(words) for _ in range(self.config.response_words))
+
+    def _acquire_slot(self) -> float:
+        start = time.perf_counter()
+        if self._slots is not None:
+            self._slots.acquire()
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+            self.stats["queue_wait_s"] += waited
+            self.stats["max_queue_wait_s"] = max(self.stats["max_queue_wait_s"], waited)
+        return waited
+
+    def _release_slot(self, service_s: float) -> None:
+        with self._lock:
+            self.stats["in_flight"] -= 1
+            self.stats["service_s"] += service_s
+        if self._slots is not None:
+            self._slots.release()
+
+    def _handler(self):
+        server = self
+
+        class FakeLLMHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send_json(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path != "/stats":
+                    self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+                    return
+                with server._lock:
+                    self._send_json(200, dict(server.stats))
+
+            def do_POST(self):
+                path, _, query = self.path.partition("?")
+                match = _ROUTE.match(path)
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not match:
+                    self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+                    return
+                model, method = match.groups()
+                prompt = "".join(part.get("text", "") for content in request.get("contents", [])
+                                 for part in content.get("parts", []))
+
+                rng, rate_limited, latency = server.sample(prompt)
+                with server._lock:
+                    server.stats["requests"] += 1
+                    server.stats["rate_limited"] += rate_limited
+                    server.stats["streamed"] += method == "streamGenerateContent"
+
+                server._acquire_slot()
+                start = time.perf_counter()
+                try:
+                    if rate_limited:
+                        # A quota rejection is fast, not a full generation
+                        time.sleep(min(latency, 0.05))
+                        self._send_json(429, {"error": {
+                            "code": 429, "status": "RESOURCE_EXHAUSTED",
+                            "message": "Resource has been exhausted (e.g. check quota)."}})
+                        return
+                    text = server.answer(rng, prompt)
+                    if method == "streamGenerateContent" and "alt=sse" in query:
+                        self._stream(text, latency, len(prompt.split()))
+                    else:
+                        time.sleep(latency)
+                        self._send_json(200, _response(text, len(prompt.split())))
+                finally:
+                    server._release_slot(time.perf_counter() - start)
+
+            def _stream(self, text, latency, prompt_tokens):
+                words = text.split()
+                n_chunks = max(1, min(server.config.stream_chunks, len(words)))
+                size = math.ceil(len(words) / n_chunks)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for i in range(0, len(words), size):
+                    time.sleep(latency / n_chunks)
+                    chunk = " ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+                    self.wfile.write(f"data: {json.dumps(_response(chunk, prompt_tokens))}\r\n\r\n".encode("utf-8"))
+                    self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        return FakeLLMHandler
+
+
+def _response(text: str, prompt_tokens: int) -> Dict:
+    output_tokens = len(text.split())
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                        "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": output_tokens,
+                          "totalTokenCount": prompt_tokens + output_tokens},
+    }
+
+
+class FakeUsage:
+    def __init__(self, usage: Dict):
+        self.prompt_token_count = usage.get("promptTokenCount", 0)
+        self.candidates_token_count = usage.get("candidatesTokenCount", 0)
+
+
+class FakeResponse:
+    """The .text and .usage_metadata of a generate_content response."""
+
+    def __init__(self, payload: Dict):
+        self.text = _text(payload)
+        self.usage_metadata = FakeUsage(payload.get("usageMetadata", {}))
+
+
+class FakeGeminiClient:
+    """Minimal genai.GenerativeModel look-alike talking to a FakeLLMServer."""
+
+    def __init__(self, base_url: str, model_name: str = "gemini-2.5-flash", timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.timeout = timeout
+
+    def _post(self, method: str, prompt: str, query: str = ""):
+        body = json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}]}).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.base_url}/v1beta/models/{self.model_name}:{method}{query}", data=body,
+            headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                import google.api_core.exceptions
+                raise google.api_core.exceptions.ResourceExhausted(e.read().decode("utf-8", "replace"))
+            raise
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        if stream:
+            return self._stream(prompt)
+        with self._post("generateContent", prompt) as response:
+            payload = json.loads(response.read())
+        return FakeResponse(payload)
+
+    def _stream(self, prompt: str) -> Iterator[FakeResponse]:
+        with self._post("streamGenerateContent", prompt, "?alt=sse") as response:
+            for line in response:
+                line = line.strip()
+                if line.startswith(b"data: "):
+                    yield FakeResponse(json.loads(line[len(b"data: "):]))
+
+
+def _text(payload: Dict) -> str:
+    return "".join(part.get("text", "") for candidate in payload.get("candidates", [])[:1]
+                   for part in candidate.get("content", {}).get("parts", []))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Gemini generateContent API.")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="median service time")
+    parser.add_argument("--sigma", type=float, default=0.4, help="lognormal shape (0 = fixed latency)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="requests served at once (0 = unlimited)")
+    parser.add_argument("--response-words", type=int, default=60)
+    parser.add_argument("--stream-chunks", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(latency_ms=args.latency_ms, sigma=args.sigma, error_rate=args.error_rate,
+                           max_concurrency=args.max_concurrency, response_words=args.response_words,
+                           stream_chunks=args.stream_chunks, seed=args.seed)
+    server = FakeLLMServer(config, port=args.port, host=args.host)
+    print(f"Fake Gemini API at {server.url} (stats: {server.url}/stats)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
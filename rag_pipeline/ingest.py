@@ -0,0 +1,366 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from preprocess_text import file_sha256, iter_faq_pairs, process_file, raw_sources, source_scraped_date
+from chunking import JSONLChunkingPipeline
+
+
+STATE_FILE = ".ingest_state.json"
+
+
+def _prepare_source(raw_path: str, processed_dir: str, chunks_dir: str, chunk_size: int,
+                    overlap: int, previous: Dict) -> Dict:
+    """
+    Process-pool worker: raw .txt / structured .jsonl -> processed JSONL -> chunks JSONL for one source.
+    Re-chunking is skipped when the processed output hashes the same as last time.
+    """
+    stem = Path(raw_path).stem
+    processed_path = os.path.join(processed_dir, f"{stem}.jsonl")
+    chunks_path = os.path.join(chunks_dir, f"chunks_{stem}.jsonl")
+
+    process_file(raw_path, processed_dir, source_scraped_date(raw_path))
+    processed_sha = file_sha256(processed_path)
+
+    if processed_sha == previous.get("processed") and os.path.exists(chunks_path):
+        chunks_sha = previous["chunks"]
+    else:
+        JSONLChunkingPipeline(chunk_size=chunk_size, overlap=overlap).process_file(processed_path, chunks_dir)
+        chunks_sha = file_sha256(chunks_path)
+
+    return {"processed": processed_sha, "chunks": chunks_sha}
+
+
+class IncrementalIngestion:
+    """
+    Incremental raw -> processed -> chunks -> vectors -> vector store DAG.
+
+    Content hashes of every stage's artifact are recorded per source in
+    data/.ingest_state.json; only sources whose artifacts changed are pushed
+    downstream. Sources are preprocessed and chunked concurrently across a
+    process pool while the main process embeds whichever sources are ready.
+    Embeddings are cached per source, so publishing a new index only re-embeds
+    changed sources. The state also records what the last successful publish
+    was built from, so a run whose publish failed is retried by the next run.
+    """
+
+    def __init__(self, data_dir: str = "../data", chunk_size: int = 512, overlap: int = 50,
+                 model_name: str = "all-MiniLM-L6-v2", index_type: str = "ivf_flat",
+                 workers: Optional[int] = None, small_to_big: bool = False, dedup: bool = True):
+        """
+        Args:
+            data_dir: Root data directory (raw/, processed_data/, chunks/, vector_store/)
+            chunk_size: Target chunk size in characters
+            overlap: Character overlap between chunks
+            model_name: Sentence Transformers model name
+            index_type: FAISS layout, one of embedding.INDEX_TYPES
+            workers: Worker processes for preprocess + chunk (default: CPU count)
+            small_to_big: Also publish a sentence-level child index over the processed
+                          sections (see small_to_big.py); re-embedded on every publish
+            dedup: Drop near-duplicate chunks across sources when publishing (see dedup.py);
+                   the per-source caches stay complete, so toggling it republishes
+                   without re-embedding
+        """
+        self.data_dir = data_dir
+        self.raw_dir = os.path.join(data_dir, "raw")
+        self.processed_dir = os.path.join(data_dir, "processed_data")
+        self.chunks_dir = os.path.join(data_dir, "chunks")
+        self.cache_dir = os.path.join(data_dir, "vector_cache")
+        self.store_dir = os.path.join(data_dir, "vector_store")
+        self.state_path = os.path.join(data_dir, STATE_FILE)
+        self.params = {
+            "chunk_size": chunk_size,
+            "overlap": overlap,
+            "model_name": model_name,
+            "index_type": index_type,
+        }
+        self.workers = workers or os.cpu_count() or 1
+        self.small_to_big = small_to_big
+        self.dedup = dedup
+        self._embedding_pipeline = None
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict:
+        if not os.path.exists(self.state_path):
+            return {"params": None, "sources": {}}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_state(self, state: Dict) -> None:
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def _published_fingerprint(self, sources: Dict) -> Dict:
+        """What a published store is built from: the params, publish options and each source's raw and chunk hashes."""
+        return {
+            "params": self.params,
+            "dedup": self.dedup,
+            "small_to_big": self.small_to_big,
+            "sources": {stem: [entry["raw"]["sha256"], entry["vectors"]] for stem, entry in sorted(sources.items())},
+        }
+
+    def _artifact_paths(self, stem: str):
+        return (os.path.join(self.processed_dir, f"{stem}.jsonl"),
+                os.path.join(self.chunks_dir, f"chunks_{stem}.jsonl"),
+                os.path.join(self.cache_dir, f"{stem}.npy"),
+                os.path.join(self.cache_dir, f"{stem}.faq.json"),
+                os.path.join(self.cache_dir, f"{stem}.faq.npy"))
+
+    def _remove_artifacts(self, stem: str) -> None:
+        for path in self._artifact_paths(stem):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _stale_stems(self, raw_files: Dict) -> set:
+        """Stems with artifacts on disk but no raw source any more."""
+        stems = {path.stem for path in Path(self.processed_dir).glob("*.jsonl")}
+        stems.update(path.stem[len("chunks_"):] for path in Path(self.chunks_dir).glob("chunks_*.jsonl"))
+        stems.update(path.name.split(".")[0] for path in Path(self.cache_dir).glob("*.npy"))
+        return stems - set(raw_files)
+
+    def _artifacts_present(self, stem: str) -> bool:
+        return (os.path.exists(os.path.join(self.processed_dir, f"{stem}.jsonl"))
+                and os.path.exists(os.path.join(self.chunks_dir, f"chunks_{stem}.jsonl"))
+                and os.path.exists(os.path.join(self.cache_dir, f"{stem}.npy")))
+
+    def _raw_changed(self, raw_path: str, entry: Optional[Dict]) -> Optional[Dict]:
+        """Return the new raw fingerprint if the source changed, else None."""
+        stat = os.stat(raw_path)
+        stem = Path(raw_path).stem
+        if entry and self._artifacts_present(stem):
+            raw = entry["raw"]
+            if raw["mtime_ns"] == stat.st_mtime_ns and raw["size"] == stat.st_size:
+                return None
+            sha = file_sha256(raw_path)
+            if sha == raw["sha256"]:
+                raw.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                return None
+        else:
+            sha = file_sha256(raw_path)
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha}
+
+    # ------------------------------------------------------------------
+    # Embedding stage
+    # ------------------------------------------------------------------
+
+    def _embedding(self):
+        """Load the embedding model only when something actually needs embedding."""
+        if self._embedding_pipeline is None:
+            from embedding import EmbeddingPipeline
+            self._embedding_pipeline = EmbeddingPipeline(model_name=self.params["model_name"])
+        return self._embedding_pipeline
+
+    def _read_chunks(self, stem: str):
+        with open(os.path.join(self.chunks_dir, f"chunks_{stem}.jsonl"), 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _embed_source(self, stem: str) -> None:
+        import numpy as np
+
+        texts = [chunk['content'] for chunk in self._read_chunks(stem)]
+        embeddings = (self._embedding().embed_texts(texts).astype('float32') if texts
+                      else np.zeros((0, self._embedding().embedding_dim), dtype='float32'))
+
+        cache_path = os.path.join(self.cache_dir, f"{stem}.npy")
+        tmp_path = cache_path + ".tmp.npy"
+        np.save(tmp_path, embeddings)
+        os.replace(tmp_path, cache_path)
+
+    # ------------------------------------------------------------------
+    # Publish stage
+    # ------------------------------------------------------------------
+
+    def _faq_vectors(self, stem: str, raw_path: str):
+        """FAQ pairs of one source and their question embeddings, re-embedded only when the questions changed."""
+        import numpy as np
+
+        faqs = list(iter_faq_pairs(raw_path))
+        questions = [faq['question'] for faq in faqs]
+        questions_path = os.path.join(self.cache_dir, f"{stem}.faq.json")
+        vectors_path = os.path.join(self.cache_dir, f"{stem}.faq.npy")
+        if os.path.exists(questions_path) and os.path.exists(vectors_path):
+            with open(questions_path, 'r', encoding='utf-8') as f:
+                if json.load(f) == questions:
+                    return faqs, np.load(vectors_path)
+
+        embeddings = (self._embedding().embed_texts(questions).astype('float32') if questions
+                      else np.zeros((0, self._embedding().embedding_dim), dtype='float32'))
+        np.save(vectors_path + ".tmp.npy", embeddings)
+        os.replace(vectors_path + ".tmp.npy", vectors_path)
+        with open(questions_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(questions, f)
+        os.replace(questions_path + ".tmp", questions_path)
+        return faqs, embeddings
+
+    def _index_pipeline(self, embedding_dim: int):
+        """
+        The loaded model if this run needed one; otherwise an index-building-only
+        pipeline (no model load), since every vector comes from the cache.
+        """
+        if self._embedding_pipeline is not None:
+            return self._embedding_pipeline
+        from embedding import EmbeddingPipeline
+        pipeline = EmbeddingPipeline.__new__(EmbeddingPipeline)
+        pipeline.model_name = self.params["model_name"]
+        pipeline.embedding_dim = embedding_dim
+        return pipeline
+
+    def _publish(self, raw_files: Dict) -> int:
+        """Build the index from cached vectors (plus the FAQ index) and publish it as a new store version."""
+        import numpy as np
+        from embedding import FAISSVectorStore
+
+        chunks, blocks = [], []
+        faqs, faq_blocks = [], []
+        for stem in sorted(raw_files):
+            chunks.extend(self._read_chunks(stem))
+            blocks.append(np.load(os.path.join(self.cache_dir, f"{stem}.npy")))
+            source_faqs, source_vectors = self._faq_vectors(stem, raw_files[stem])
+            faqs.extend(source_faqs)
+            faq_blocks.append(source_vectors)
+        vectors = np.vstack(blocks)
+
+        vector_store = FAISSVectorStore(self._index_pipeline(vectors.shape[1]), index_type=self.params["index_type"])
+        if self.dedup:
+            vector_store.add_deduplicated(chunks, vectors)
+        else:
+            vector_store.add_embeddings(chunks, vectors)
+        vector_store.add_faqs(faqs, np.vstack(faq_blocks))
+        if self.small_to_big:
+            from small_to_big import SmallToBigIndex, iter_parents
+            vector_store.small_to_big = SmallToBigIndex.build(self._embedding(), iter_parents(self.processed_dir))
+        vector_store.publish(self.store_dir)
+
+        return len(vector_store.metadata)
+
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+
+    def _manifest_unchanged(self, manifest_path: Optional[str]) -> set:
+        """Sources the scrapers' changed_pages.json reports as not modified since they were last written."""
+        if not manifest_path or not os.path.exists(manifest_path):
+            return set()
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return {Path(output).stem for output in manifest.get("unchanged_outputs", [])}
+
+    def run(self, force: bool = False, changed_manifest: Optional[str] = None) -> Dict:
+        """
+        Bring every stage up to date with data/raw.
+
+        Args:
+            force: Ignore recorded hashes and rebuild everything
+            changed_manifest: Scraper changed_pages.json; sources it lists as unchanged
+                are not even stat'ed or hashed if their artifacts are present
+
+        Returns:
+            Summary dict with changed/removed sources and whether a store was published
+        """
+        start = time.perf_counter()
+        state = self._load_state()
+        raw_files = raw_sources(self.raw_dir)
+        if force or state.get("params") != self.params:
+            state = {"params": self.params, "sources": {}}
+            # Forgotten sources would otherwise never show up as removed
+            for stem in self._stale_stems(raw_files):
+                self._remove_artifacts(stem)
+        sources = state["sources"]
+
+        not_modified = self._manifest_unchanged(changed_manifest) if not force else set()
+        changed = {}
+        for stem, raw_path in raw_files.items():
+            if stem in not_modified and stem in sources and self._artifacts_present(stem):
+                continue
+            fingerprint = self._raw_changed(raw_path, sources.get(stem))
+            if fingerprint is not None:
+                changed[stem] = fingerprint
+        removed = sorted(set(sources) - set(raw_files))
+
+        if (not changed and not removed and os.path.exists(self.store_dir)
+                and state.get("published") == self._published_fingerprint(sources)):
+            self._save_state(state)
+            print(f"Ingestion up to date ({len(raw_files)} sources, {time.perf_counter() - start:.3f}s)")
+            return {"changed": [], "removed": [], "published": False}
+
+        for directory in (self.processed_dir, self.chunks_dir, self.cache_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        for stem in removed:
+            self._remove_artifacts(stem)
+            del sources[stem]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(_prepare_source, raw_files[stem], self.processed_dir, self.chunks_dir,
+                                self.params["chunk_size"], self.params["overlap"],
+                                sources.get(stem, {})): stem
+                for stem in sorted(changed)
+            }
+            # Embed each source as soon as its chunks are ready, overlapping with other workers
+            for future in as_completed(futures):
+                stem = futures[future]
+                artifacts = future.result()
+                previous = sources.get(stem, {})
+                cache_path = os.path.join(self.cache_dir, f"{stem}.npy")
+
+                if artifacts["chunks"] != previous.get("vectors") or not os.path.exists(cache_path):
+                    print(f"  Embedding changed source: {stem}")
+                    self._embed_source(stem)
+                else:
+                    print(f"  Unchanged chunks, reusing vectors: {stem}")
+
+                sources[stem] = {"raw": changed[stem], "vectors": artifacts["chunks"], **artifacts}
+                self._save_state(state)
+
+        n_chunks = self._publish(raw_files) if raw_files else 0
+        state["published"] = self._published_fingerprint(sources)
+        self._save_state(state)
+
+        print(f"Published {n_chunks} chunks from {len(raw_files)} sources "
+              f"({len(changed)} changed, {len(removed)} removed) in {time.perf_counter() - start:.2f}s")
+        return {"changed": sorted(changed), "removed": removed, "published": bool(raw_files)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally rebuild the vector store from data/raw.")
+    parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(__file__), "..", "data"))
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--index-type", default="ivf_flat")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="ignore recorded hashes and rebuild everything")
+    parser.add_argument("--small-to-big", action="store_true",
+                        help="also publish a sentence-level child index over the sections")
+    parser.add_argument("--no-dedup", action="store_true", help="keep near-duplicate chunks in the index")
+    parser.add_argument("--changed-manifest", default=None,
+                        help="scraper changed_pages.json; skip sources it reports unchanged")
+    args = parser.parse_args(argv)
+
+    IncrementalIngestion(
+        data_dir=args.data_dir,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        model_name=args.model,
+        index_type=args.index_type,
+        workers=args.workers,
+        small_to_big=args.small_to_big,
+        dedup=not args.no_dedup,
+    ).run(force=args.force, changed_manifest=args.changed_manifest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+LLM providers for the RAG workflow.
+
+Every backend implements the same small interface, so each graph node can use a
+different model (e.g. a small local CPU model for query reformulation and Gemini
+for answers):
+    generate(prompt) -> LLMResponse          blocking call
+    agenerate(prompt) -> LLMResponse         asyncio; a worker thread unless the backend is natively async
+    stream(prompt) -> Iterator[str]          text chunks as they are produced
+    generate_batch(prompts) -> [LLMResponse] true batching where supports_batching, else concurrent calls
+
+Providers:
+    GeminiProvider        google-generativeai (remote; 429s raise ResourceExhausted)
+    ClientProvider        any object with generate_content(prompt, stream=False), e.g. fake_llm.FakeGeminiClient
+    LlamaCppProvider      local GGUF model through llama-cpp-python (optional dependency)
+    TransformersProvider  local Hugging Face seq2seq/causal model on CPU, batched generate
+
+make_provider(spec) builds one from a "kind:target" string:
+    gemini:gemini-2.5-flash
+    fake:http://127.0.0.1:8089
+    llamacpp:/models/qwen2.5-0.5b-instruct-q4_k_m.gguf
+    transformers:google/flan-t5-small
+
+BatchingProvider coalesces concurrent generate() calls from separate queries
+into generate_batch() calls for providers that batch natively.
+"""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+
+class LLMResponse:
+    """Generated text plus token usage (approximate where the backend reports none)."""
+
+    def __init__(self, text: str, provider: str, model: str, input_tokens: int = 0, output_tokens: int = 0):
+        self.text = text
+        self.provider = provider
+        self.model = model
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+
+
+def _approx_tokens(text: str) -> int:
+    return len(text.split())
+
+
+class LLMProvider(ABC):
+    """Base class: subclasses implement generate(); the rest has working defaults."""
+
+    name = "base"
+    supports_batching = False
+
+    def __init__(self, model: str, cost_per_1k_input: float = 0.0, cost_per_1k_output: float = 0.0,
+                 batch_concurrency: int = 4):
+        """
+        Args:
+            model: Model identifier, reported on every response
+            cost_per_1k_input / cost_per_1k_output: Price per 1000 tokens, for cost accounting
+            batch_concurrency: Concurrent calls generate_batch makes when batching is not native
+        """
+        self.model = model
+        self.cost_per_1k_input = cost_per_1k_input
+        self.cost_per_1k_output = cost_per_1k_output
+        self.batch_concurrency = batch_concurrency
+
+    def __repr__(self):
+        return f"{self.name}:{self.model}"
+
+    @abstractmethod
+    def generate(self, prompt: str) -> LLMResponse:
+        """Blocking call returning the full response."""
+
+    async def agenerate(self, prompt: str) -> LLMResponse:
+        return await asyncio.to_thread(self.generate, prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        yield self.generate(prompt).text
+
+    def generate_batch(self, prompts: List[str]) -> List[LLMResponse]:
+        if len(prompts) <= 1 or self.batch_concurrency <= 1:
+            return [self.generate(prompt) for prompt in prompts]
+        with ThreadPoolExecutor(max_workers=min(self.batch_concurrency, len(prompts))) as executor:
+            return list(executor.map(self.generate, prompts))
+
+    def cost(self, response: LLMResponse) -> float:
+        return (response.input_tokens * self.cost_per_1k_input
+                + response.output_tokens * self.cost_per_1k_output) / 1000
+
+
+class ClientProvider(LLMProvider):
+    """Adapter for a genai.GenerativeModel-like client (generate_content, optional usage_metadata)."""
+
+    name = "client"
+
+    def __init__(self, client, model: Optional[str] = None, **kwargs):
+        super().__init__(model or getattr(client, "model_name", type(client).__name__), **kwargs)
+        self.client = client
+
+    def _response(self, prompt: str, response) -> LLMResponse:
+        text = response.text
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text, self.name, self.model,
+            getattr(usage, "prompt_token_count", None) or _approx_tokens(prompt),
+            getattr(usage, "candidates_token_count", None) or _approx_tokens(text),
+        )
+
+    def generate(self, prompt: str) -> LLMResponse:
+        return self._response(prompt, self.client.generate_content(prompt))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self.client.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+
+class GeminiProvider(ClientProvider):
+    """Gemini through google-generativeai."""
+
+    name = "gemini"
+
+    def __init__(self, model: str = "gemini-2.5-flash", api_key: Optional[str] = None, **kwargs):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+        super().__init__(genai.GenerativeModel(model), model=model, **kwargs)
+
+    async def agenerate(self, prompt: str) -> LLMResponse:
+        return self._response(prompt, await self.client.generate_content_async(prompt))
+
+
+class LlamaCppProvider(LLMProvider):
+    """
+    Local GGUF model through llama-cpp-python. One llama.cpp context serves one
+    request at a time, so calls are serialized.
+    """
+
+    name = "llamacpp"
+
+    def __init__(self, model_path: str, n_ctx: int = 4096, n_threads: Optional[int] = None,
+                 max_tokens: int = 256, temperature: float = 0.2, **kwargs):
+        from llama_cpp import Llama
+
+        kwargs.setdefault("batch_concurrency", 1)
+        super().__init__(os.path.basename(model_path), **kwargs)
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str) -> LLMResponse:
+        with self._lock:
+            out = self.llm(prompt, max_tokens=self.max_tokens, temperature=self.temperature)
+        usage = out.get("usage", {})
+        return LLMResponse(out["choices"][0]["text"].strip(), self.name, self.model,
+                           usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        with self._lock:
+            for chunk in self.llm(prompt, max_tokens=self.max_tokens, temperature=self.temperature, stream=True):
+                yield chunk["choices"][0]["text"]
+
+
+class TransformersProvider(LLMProvider):
+    """
+    Local Hugging Face model on CPU (seq2seq such as flan-t5, or causal LM).
+    Prompts in a batch are padded together and generated in one forward loop.
+    """
+
+    name = "transformers"
+    supports_batching = True
+
+    def __init__(self, model: str = "google/flan-t5-small", max_new_tokens: int = 128,
+                 device: str = "cpu", **kwargs):
+        import torch
+        from transformers import AutoConfig, AutoModelForCausalLM, AutoModelForSeq2SeqLM, AutoTokenizer
+
+        super().__init__(model, **kwargs)
+        self.torch = torch
+        self.seq2seq = AutoConfig.from_pretrained(model).is_encoder_decoder
+        self.tokenizer = AutoTokenizer.from_pretrained(model, padding_side="left")
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        model_cls = AutoModelForSeq2SeqLM if self.seq2seq else AutoModelForCausalLM
+        self.hf_model = model_cls.from_pretrained(model).to(device).eval()
+        self.device = device
+        self.max_new_tokens = max_new_tokens
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str) -> LLMResponse:
+        return self.generate_batch([prompt])[0]
+
+    def generate_batch(self, prompts: List[str]) -> List[LLMResponse]:
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, truncation=True).to(self.device)
+        with self._lock, self.torch.inference_mode():
+            outputs = self.hf_model.generate(**inputs, max_new_tokens=self.max_new_tokens,
+                                             pad_token_id=self.tokenizer.pad_token_id)
+        if not self.seq2seq:
+            outputs = outputs[:, inputs["input_ids"].shape[1]:]
+        texts = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        input_counts = inputs["attention_mask"].sum(dim=1).tolist()
+        output_counts = (outputs != self.tokenizer.pad_token_id).sum(dim=1).tolist()
+        return [LLMResponse(text.strip(), self.name, self.model, n_in, n_out)
+                for text, n_in, n_out in zip(texts, input_counts, output_counts)]
+
+
+class BatchingProvider(LLMProvider):
+    """
+    Groups generate() calls arriving within max_wait_ms of each other (from
+    concurrent queries) into one generate_batch() call on the wrapped provider.
+    """
+
+    def __init__(self, provider: LLMProvider, max_batch: int = 8, max_wait_ms: float = 10.0):
+        super().__init__(provider.model, provider.cost_per_1k_input, provider.cost_per_1k_output)
+        self.name = provider.name
+        self.provider = provider
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[tuple] = []
+        self._cond = threading.Condition()
+        threading.Thread(target=self._run, name=f"llm-batch-{provider.name}", daemon=True).start()
+
+    def generate(self, prompt: str) -> LLMResponse:
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((prompt, future))
+            self._cond.notify()
+        return future.result()
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return self.provider.stream(prompt)
+
+    def generate_batch(self, prompts: List[str]) -> List[LLMResponse]:
+        return self.provider.generate_batch(prompts)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = time.perf_counter() + self.max_wait
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            try:
+                responses = list(self.provider.generate_batch([prompt for prompt, _ in batch]))
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), response in zip(batch, responses):
+                future.set_result(response)
+            if len(responses) < len(batch):
+                # zip() stopped early; unanswered callers would otherwise wait forever
+                exc = RuntimeError(f"{self.provider!r} returned {len(responses)} responses "
+                                   f"for a batch of {len(batch)} prompts")
+                for _, future in batch[len(responses):]:
+                    future.set_exception(exc)
+
+
+class RateLimiter:
+    """Spaces acquire() calls from any number of threads to at most rpm per minute."""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.perf_counter()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def make_provider(spec: str, **kwargs) -> LLMProvider:
+    """Build a provider from "kind:target" (see module docstring); batching providers get a BatchingProvider."""
+    kind, _, target = spec.partition(":")
+    if kind == "gemini":
+        return GeminiProvider(target or "gemini-2.5-flash", **kwargs)
+    if kind == "fake":
+        from fake_llm import FakeGeminiClient
+        return ClientProvider(FakeGeminiClient(target or "http://127.0.0.1:8089"), **kwargs)
+    if kind == "llamacpp":
+        return LlamaCppProvider(target, **kwargs)
+    if kind == "transformers":
+        return BatchingProvider(TransformersProvider(target or "google/flan-t5-small", **kwargs))
+    raise ValueError(f"Unknown LLM provider {kind!r}; expected gemini, fake, llamacpp or transformers")
+
+
+def providers_from_env(default: str = "gemini:gemini-2.5-flash", nodes=("reformer", "responder")) -> Dict[str, LLMProvider]:
+    """
+    Per-node providers from RAG_LLM (all nodes) and RAG_LLM_<NODE> overrides,
+    e.g. RAG_LLM_REFORMER=transformers:google/flan-t5-small. Nodes sharing a spec
+    share one provider instance.
+    """
+    base = os.getenv("RAG_LLM", default)
+    built: Dict[str, LLMProvider] = {}
+    providers = {}
+    for node in nodes:
+        spec = os.getenv(f"RAG_LLM_{node.upper()}", base)
+        if spec not in built:
+            built[spec] = make_provider(spec)
+        providers[node] = built[spec]
+    return providers
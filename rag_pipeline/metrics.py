@@ -0,0 +1,294 @@
+"""
+Latency tracing and Prometheus-style metrics for the RAG workflow.
+
+A QueryTrace collects the spans of one process_query call: one per graph node
+("faq", "analyzer", "reformer", "retriever", "responder") and finer stages
+inside the nodes ("retriever.encode", "retriever.search", "responder.llm",
+"responder.backoff", ...). For every node it also records the wait between the
+previous node finishing (or the query starting) and the node starting, i.e. the
+time the query sat in the graph runtime's queue.
+
+Every finished span is also observed into the histograms of a Registry, which
+renders the Prometheus text exposition format for a /metrics endpoint (see
+serve_metrics).
+
+Spans are only recorded while a trace is active. Outside one, span() returns a
+shared no-op context manager, so a pipeline with tracing disabled pays a single
+ContextVar lookup per instrumented stage.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_NULL_SPAN = nullcontext()
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("rag_trace", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, one series per label-value tuple."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}  # labels -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, (list(counts), total, count))
+                            for labels, (counts, total, count) in self._series.items())
+        for labelvalues, (counts, total, count) in series:
+            labels = list(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', repr(float(bound)))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter, one series per label-value tuple."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._series[labelvalues] = self._series.get(labelvalues, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for labelvalues, value in series:
+            lines.append(f"{self.name}{_format_labels(zip(self.labelnames, labelvalues))} {value}")
+        return lines
+
+
+class Registry:
+    """Named metrics, rendered together for /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+            return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class QueryTrace:
+    """Spans of one query: (name, start offset s, duration s), in finishing order."""
+
+    def __init__(self, tracer: 'Tracer'):
+        self.tracer = tracer
+        self.start = time.perf_counter()
+        self.total: Optional[float] = None
+        self.spans: List[Tuple[str, float, float]] = []
+        self.node_waits: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._last_node_end = self.start
+
+    @contextmanager
+    def span(self, name: str, node: bool = False):
+        start = time.perf_counter()
+        if node:
+            wait = max(0.0, start - self._last_node_end)
+            self.node_waits[name] = self.node_waits.get(name, 0.0) + wait
+            self.tracer.node_wait_seconds.observe(wait, name)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            duration = end - start
+            self.spans.append((name, start - self.start, duration))
+            if node:
+                self._last_node_end = end
+                self.tracer.node_seconds.observe(duration, name)
+            else:
+                self.tracer.stage_seconds.observe(duration, name)
+
+    def count(self, name: str) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def timings(self) -> Dict[str, float]:
+        """Seconds per span name (repeated spans, e.g. LLM attempts, are summed) plus "total"."""
+        timings: Dict[str, float] = {}
+        for name, _, duration in self.spans:
+            timings[name] = timings.get(name, 0.0) + duration
+        if self.total is not None:
+            timings["total"] = self.total
+        return timings
+
+
+class Tracer:
+    """Creates per-query traces and owns the workflow's metrics in a Registry."""
+
+    def __init__(self, registry: Optional[Registry] = None, enabled: bool = True):
+        """
+        Args:
+            registry: Where the histograms live; the module-wide REGISTRY by default
+            enabled: False makes trace() yield None and leaves graph nodes unwrapped;
+                     counters (count()) are kept either way
+        """
+        self.registry = registry or REGISTRY
+        self.enabled = enabled
+        self.query_seconds = self.registry.histogram(
+            "rag_query_seconds", "End-to-end process_query wall time in seconds")
+        self.node_seconds = self.registry.histogram(
+            "rag_node_seconds", "Wall time per workflow node in seconds", ["node"])
+        self.node_wait_seconds = self.registry.histogram(
+            "rag_node_wait_seconds", "Delay between a node becoming runnable and starting, in seconds", ["node"])
+        self.stage_seconds = self.registry.histogram(
+            "rag_stage_seconds", "Wall time of stages inside workflow nodes in seconds", ["stage"])
+        self._counters = {
+            "llm_rate_limited": self.registry.counter(
+                "rag_llm_rate_limited_total", "LLM calls rejected as rate limited (429) and retried", ["stage"]),
+            "query_coalesced": self.registry.counter(
+                "rag_query_coalesced_total", "Queries answered by an identical query already in flight", ["entry"]),
+            "faq_answered": self.registry.counter(
+                "rag_faq_answered_total", "Queries answered from the FAQ index without retrieval or generation", ["stage"]),
+            "answer_cache": self.registry.counter(
+                "rag_answer_cache_total", "Precomputed answer lookups by result (hit, stale, miss)", ["result"]),
+        }
+
+    def counter(self, name: str) -> Counter:
+        return self._counters[name]
+
+    def count(self, name: str, label: str) -> None:
+        """
+        Increment one of the counters, whether or not tracing is enabled; the
+        current query's trace (if any) also records it.
+        """
+        self._counters[name].inc(label)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.count(name)
+
+    @contextmanager
+    def trace(self):
+        """Trace one query; yields the QueryTrace, or None when tracing is disabled."""
+        if not self.enabled:
+            yield None
+            return
+        trace = QueryTrace(self)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            trace.total = time.perf_counter() - trace.start
+            self.query_seconds.observe(trace.total)
+
+    def wrap_node(self, name: str, fn: Callable) -> Callable:
+        """A graph node timed as a node span; the node itself when tracing is disabled."""
+        if not self.enabled:
+            return fn
+
+        def traced(state):
+            trace = _current_trace.get()
+            if trace is None:
+                return fn(state)
+            with trace.span(name, node=True):
+                return fn(state)
+
+        traced.__name__ = getattr(fn, "__name__", name)
+        return traced
+
+
+def span(name: str):
+    """Time a stage of the current query; a no-op outside a trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return trace.span(name)
+
+
+def serve_metrics(registry: Optional[Registry] = None, port: int = 9100,
+                  host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve registry.render() at /metrics from a daemon thread.
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="rag-metrics", daemon=True).start()
+    return server
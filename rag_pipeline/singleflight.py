@@ -0,0 +1,87 @@
+"""
+Single-flight deduplication of identical in-flight calls.
+
+While a call for a key is running, later calls for the same key do not start
+their own computation; they wait for the running one and get its result (or
+its exception). Nothing is cached: once the call finishes, the next call for
+the key computes again.
+
+Sync (do) and async (ado) callers share the same in-flight table, so a query
+arriving through process_query can be answered by one already running for
+aprocess_query and vice versa. The shared record is a concurrent.futures.Future;
+async waiters await it through asyncio.wrap_future without blocking their loop.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Coalescing key for a user query: case-folded, whitespace collapsed, trailing punctuation dropped."""
+    return " ".join(query.casefold().split()).rstrip("?!. ")
+
+
+class SingleFlight:
+    """In-flight call table; leaders and coalesced count calls that ran and calls that waited."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.leaders += 1
+            return future, True
+
+    def _settle(self, key: Hashable, future: Future, result: Any = None, exc: BaseException = None) -> None:
+        # Unregister first, so calls arriving after completion start a fresh computation
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn() unless a call for key is already in flight, then wait for that one.
+
+        Returns:
+            (result, shared) where shared is True if the result came from another caller's call
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._settle(key, future, exc=exc)
+            raise
+        self._settle(key, future, result)
+        return result, False
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Async do(): await fn() unless a call for key is in flight (sync or async), then await that one."""
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._settle(key, future, exc=exc)
+            raise
+        self._settle(key, future, result)
+        return result, False
@@ -0,0 +1,259 @@
+"""
+Small-to-big retrieval: sentence-level children matched, whole sections returned.
+
+Every processed section (data/processed_data record) is a parent. It is cut
+into children of one or a few consecutive sentences (table sections: rows),
+at most child_size characters each, and only the children are embedded. A query
+searches the child index, maps each hit through the child -> parent table and
+returns the distinct parents, best child first. The returned text is the whole
+section, or for sections longer than max_parent_chars the run of children
+around the best match (under the section heading), so a prompt carries full
+sections instead of isolated 512-char fragments.
+
+Files in a store version (written next to the chunk index):
+    child_index.bin   exact (flat L2) index over child embeddings
+    children.jsonl    {"child_id", "parent_id", "start", "end"} per index row;
+                      start/end are character offsets into the parent content
+    parents.jsonl     the sections: {"parent_id", "content", "original_file", ...}
+
+Build into the live store (publishes a new version with the child index added):
+    python rag_pipeline/small_to_big.py [--processed data/processed_data] [--store data/vector_store]
+or let `ingest.py --small-to-big` build it with every publish.
+"""
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import faiss
+import numpy as np
+
+from chunking import RecursiveChunker
+
+CHILD_INDEX_FILE = "child_index.bin"
+CHILDREN_FILE = "children.jsonl"
+PARENTS_FILE = "parents.jsonl"
+FILES = (CHILD_INDEX_FILE, CHILDREN_FILE, PARENTS_FILE)
+
+
+def iter_parents(processed_dir: str) -> Iterator[Dict]:
+    """Sections of data/processed_data as parents, keyed by their record id."""
+    for path in sorted(Path(processed_dir).glob("*.jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                parent = {
+                    "parent_id": record["id"],
+                    "content": record["content"],
+                    "original_file": record["file_name"],
+                    "section_index": record["section_index"],
+                    "scraped_date": record.get("scraped_date"),
+                }
+                parent.update((key, record[key]) for key in ("kind", "section", "url") if key in record)
+                yield parent
+
+
+def split_children(content: str, child_size: int = 200, splitter: Optional[RecursiveChunker] = None) -> List[tuple]:
+    """
+    (start, end) offsets of the children of one section: consecutive sentences
+    of a line packed up to child_size characters. A line never spans two
+    children, so table rows and list items stay separate.
+    """
+    splitter = splitter or RecursiveChunker()
+    spans = []
+    line_start = 0
+    for line in content.split("\n"):
+        pos = line_start
+        current = None
+        for sentence in splitter.split_into_sentences(line):
+            start = content.find(sentence, pos)
+            if start < 0:
+                continue
+            end = start + len(sentence)
+            pos = end
+            if current is not None and end - current[0] <= child_size:
+                current = (current[0], end)
+            else:
+                if current is not None:
+                    spans.append(current)
+                current = (start, end)
+        if current is not None:
+            spans.append(current)
+        line_start += len(line) + 1
+    return spans
+
+
+class SmallToBigIndex:
+    """Child index plus the child -> parent table."""
+
+    def __init__(self, index, children: List[Dict], parents: Dict[str, Dict]):
+        self.index = index
+        self.children = children
+        self.parents = parents
+        # Children of each parent in text order, for growing a window around a match
+        self._siblings: Dict[str, List[int]] = {}
+        for row, child in enumerate(children):
+            self._siblings.setdefault(child["parent_id"], []).append(row)
+
+    def __len__(self):
+        return len(self.children)
+
+    @staticmethod
+    def build(embedding_pipeline, parents: Iterable[Dict], child_size: int = 200) -> Optional['SmallToBigIndex']:
+        """
+        Split parents into children and embed them.
+
+        Args:
+            embedding_pipeline: embedding.EmbeddingPipeline of the store being built
+            parents: Sections, e.g. iter_parents(processed_dir)
+            child_size: Maximum child length in characters (a single longer sentence stays whole)
+
+        Returns:
+            The index, or None if there are no parents
+        """
+        splitter = RecursiveChunker()
+        parent_map, children, texts = {}, [], []
+        for parent in parents:
+            parent_map[parent["parent_id"]] = parent
+            for i, (start, end) in enumerate(split_children(parent["content"], child_size, splitter)):
+                children.append({"child_id": f"{parent['parent_id']}#{i}", "parent_id": parent["parent_id"],
+                                 "start": start, "end": end})
+                texts.append(parent["content"][start:end])
+        if not children:
+            return None
+
+        embeddings = embedding_pipeline.embed_texts(texts).astype('float32')
+        # Exact search: a few thousand children are cheap to scan, and probing
+        # only some IVF cells would miss the precise matches this index is for
+        index = faiss.IndexFlatL2(embeddings.shape[1])
+        index.add(embeddings)
+        print(f"Small-to-big index: {len(children)} children over {len(parent_map)} sections")
+        return SmallToBigIndex(index, children, parent_map)
+
+    def save(self, save_dir: str) -> None:
+        faiss.write_index(self.index, os.path.join(save_dir, CHILD_INDEX_FILE))
+        with open(os.path.join(save_dir, CHILDREN_FILE), "w", encoding="utf-8") as f:
+            for child in self.children:
+                f.write(json.dumps(child) + "\n")
+        with open(os.path.join(save_dir, PARENTS_FILE), "w", encoding="utf-8") as f:
+            for parent in self.parents.values():
+                f.write(json.dumps(parent) + "\n")
+        print(f"Small-to-big index saved to: {save_dir}")
+
+    @staticmethod
+    def remove(save_dir: str) -> None:
+        """Drop a stale child index from a directory being rewritten without one."""
+        for name in FILES:
+            path = os.path.join(save_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def load(save_dir: str) -> Optional['SmallToBigIndex']:
+        """The index saved in save_dir, or None if it has none."""
+        if not all(os.path.exists(os.path.join(save_dir, name)) for name in FILES):
+            return None
+        with open(os.path.join(save_dir, CHILDREN_FILE), "r", encoding="utf-8") as f:
+            children = [json.loads(line) for line in f if line.strip()]
+        with open(os.path.join(save_dir, PARENTS_FILE), "r", encoding="utf-8") as f:
+            parents = {parent["parent_id"]: parent for parent in map(json.loads, filter(str.strip, f))}
+        return SmallToBigIndex(faiss.read_index(os.path.join(save_dir, CHILD_INDEX_FILE)), children, parents)
+
+    def search(self, query_embeddings: np.ndarray, k: int = 5, child_factor: int = 8,
+               max_parent_chars: int = 1500) -> List[List[Dict]]:
+        """
+        Top-k distinct parents for each query row.
+
+        Args:
+            query_embeddings: (n_queries, embedding_dim)
+            k: Parents per query
+            child_factor: Children fetched per wanted parent (several hits often share a section)
+            max_parent_chars: Longer sections are cut to a window of children around the best hit
+        """
+        distances, indices = self.index.search(query_embeddings, min(k * child_factor, len(self.children)))
+        return [self._expand(row_ids, row_dists, k, max_parent_chars)
+                for row_ids, row_dists in zip(indices, distances)]
+
+    def _expand(self, ids, distances, k: int, max_parent_chars: int) -> List[Dict]:
+        results: Dict[str, Dict] = {}
+        for idx, distance in zip(ids, distances):
+            if not 0 <= idx < len(self.children):
+                continue
+            parent_id = self.children[idx]["parent_id"]
+            if parent_id in results:
+                results[parent_id]["matched_children"] += 1
+                continue
+            if len(results) == k:
+                continue
+            parent = self.parents[parent_id]
+            results[parent_id] = {
+                **{key: value for key, value in parent.items() if key != "content"},
+                "chunk_id": parent_id,
+                "content": self._window(parent, int(idx), max_parent_chars),
+                "similarity_score": float(1 / (1 + distance)),
+                "matched_children": 1,
+            }
+        return list(results.values())
+
+    def _window(self, parent: Dict, best: int, max_chars: int) -> str:
+        content = parent["content"]
+        if len(content) <= max_chars:
+            return content
+        siblings = self._siblings[parent["parent_id"]]
+        lo = hi = siblings.index(best)
+        start, end = self.children[best]["start"], self.children[best]["end"]
+        # Grow one child at a time on alternating sides while the window fits
+        grew = True
+        while grew:
+            grew = False
+            if hi + 1 < len(siblings) and self.children[siblings[hi + 1]]["end"] - start <= max_chars:
+                hi += 1
+                end = self.children[siblings[hi]]["end"]
+                grew = True
+            if lo > 0 and end - self.children[siblings[lo - 1]]["start"] <= max_chars:
+                lo -= 1
+                start = self.children[siblings[lo]]["start"]
+                grew = True
+        window = content[start:end]
+        heading = parent.get("section")
+        if start > 0 and heading and not window.startswith(heading):
+            window = f"{heading}\n{window}"
+        return window
+
+
+def main(argv=None):
+    from embedding import EmbeddingPipeline, begin_version, commit_version, resolve_store_dir, verify_manifest
+
+    root = os.path.join(os.path.dirname(__file__), "..")
+    parser = argparse.ArgumentParser(description="Add a small-to-big child index to the live vector store.")
+    parser.add_argument("--processed", default=os.path.join(root, "data", "processed_data"))
+    parser.add_argument("--store", default=os.path.join(root, "data", "vector_store"))
+    parser.add_argument("--child-size", type=int, default=200, help="maximum child length in characters")
+    args = parser.parse_args(argv)
+
+    live_dir, version = resolve_store_dir(args.store)
+    if version is None:
+        raise SystemExit(f"{args.store} is not a versioned store; publish it with ingest.py or embedding.py first")
+    verify_manifest(live_dir)
+    with open(os.path.join(live_dir, "config.json"), "r") as f:
+        model_name = json.load(f).get("model_name", "all-MiniLM-L6-v2")
+
+    index = SmallToBigIndex.build(EmbeddingPipeline(model_name=model_name), iter_parents(args.processed),
+                                  args.child_size)
+    if index is None:
+        raise SystemExit(f"No sections found in {args.processed}")
+
+    new_version, staging_dir = begin_version(args.store)
+    for name in os.listdir(live_dir):
+        if name != "manifest.json" and name not in FILES:
+            shutil.copy2(os.path.join(live_dir, name), os.path.join(staging_dir, name))
+    index.save(staging_dir)
+    commit_version(args.store, new_version, staging_dir)
+
+
+if __name__ == "__main__":
+    main()
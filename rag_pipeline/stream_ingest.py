@@ -0,0 +1,62 @@
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from preprocess_text import iter_source_records, raw_sources, source_scraped_date
+from chunking import JSONLChunkingPipeline
+from embedding import EmbeddingPipeline, FAISSVectorStore, begin_version, commit_version, iter_raw_faqs
+
+
+def iter_raw_chunks(raw_dir: str, chunking_pipeline: JSONLChunkingPipeline) -> Iterator[Dict]:
+    """
+    Stream chunks straight from raw scraped files (.txt, or a scraper's structured
+    .jsonl where one exists): preprocess -> chunk.
+
+    Produces the same chunk_ids as running preprocess_text.py then chunking.py,
+    without materialising either stage's output.
+
+    Args:
+        raw_dir: Directory containing raw .txt / .jsonl files
+        chunking_pipeline: Configured JSONLChunkingPipeline
+
+    Yields:
+        Chunk dictionaries with metadata
+    """
+    for raw_file in raw_sources(raw_dir).values():
+        print(f"  Streaming: {Path(raw_file).name}")
+        records = iter_source_records(raw_file, source_scraped_date(raw_file))
+        yield from chunking_pipeline.iter_chunks(records, raw_file)
+
+
+def stream_ingest(raw_dir: str, output_dir: str, chunk_size: int = 512, overlap: int = 50,
+                  model_name: str = "all-MiniLM-L6-v2", index_type: str = "ivf_flat",
+                  batch_size: int = 256) -> int:
+    """
+    Build the vector store from raw text in bounded batches.
+    Peak memory stays flat regardless of corpus size (apart from the index itself).
+    The result is published as a new version of output_dir.
+
+    Returns:
+        Number of chunks indexed
+    """
+    chunking_pipeline = JSONLChunkingPipeline(chunk_size=chunk_size, overlap=overlap)
+    vector_store = FAISSVectorStore(EmbeddingPipeline(model_name=model_name), index_type=index_type)
+
+    vector_store.add_faqs(iter_raw_faqs(raw_dir))
+    chunks = iter_raw_chunks(raw_dir, chunking_pipeline)
+    version, staging_dir = begin_version(output_dir)
+    n_chunks = vector_store.build_from_stream(chunks, staging_dir, batch_size=batch_size)
+    if n_chunks:
+        commit_version(output_dir, version, staging_dir)
+    else:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    print(f"\nTotal chunks streamed into index: {n_chunks}")
+    return n_chunks
+
+
+if __name__ == "__main__":
+    stream_ingest("../data/raw", "../data/vector_store")
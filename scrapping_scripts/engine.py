@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Declarative scraper engine: one JSON spec per product page instead of a script_*.py.
+
+A spec (specs/<name>.json) lists the pages to visit and, per page, the blocks
+to extract in output order:
+
+    {
+      "output": "script_10.txt",
+      "slow_mo": 100,
+      "pages": [
+        {
+          "goto": "https://bankofmaharashtra.in/salary-gain-scheme",
+          "popup": {"selector": "span.sideMenuSpan", "has_text": "..."},   # optional
+          "reveal": ".tab-pane",                                          # optional
+          "blocks": [
+            {"kind": "page",    "format": "Title: {title}\\nURL: {url}"},
+            {"kind": "literal", "format": "\\n--- FAQs ---"},
+            {"kind": "text",    "selector": "div.col-lg-7 > p", "format": "{text}"},
+            {"kind": "fields",  "selector": ".card", "all": true,
+             "fields": {"q": ".card-header button", "a": ".card-body"}, "format": "Q: {q}\\nA: {a}\\n"},
+            {"kind": "rows",    "scope": "div.page-con-list-block", "selector": ["table", "tbody", "tr"],
+             "cells": 3, "format": "Particulars: {c1}"},
+            {"kind": "list",    "selector": "ul.normlist", "items": "li", "sub": ["ul", "li"],
+             "format": "- {text}", "sub_format": "  * {text}"},
+            {"kind": "table",   "selector": ".page-con-list-block table", "cells": 3,
+             "format": "S.No: {c0}\\nParticulars: {c1}\\nScheme guidelines:\\n{c2}"}
+          ]
+        },
+        {"navigate": {"selector": "span.sideMenuSpan", "has_text": "..."}, "blocks": [...]}
+      ]
+    }
+
+Each page continues from the previous one: "goto" loads a URL, "popup" clicks
+a link that opens a new tab and moves to it, "navigate" clicks a link that loads
+a new document in the same tab.
+
+Selectors are CSS; a list is resolved step by step (first match for every step
+but the last), like chained query_selector calls. "has_text" keeps matches whose
+text contains it, "nth" picks one match by index and "next" swaps each match for
+its first following sibling matching that selector. Field values are "<selector>"
+for innerText, "<selector>@attr" for an attribute, "." / "@attr" for the matched
+element itself; "optional": {name: format} lets a field be missing (it renders
+as "", else as the format). Rows format their cells as {c0}, {c1}, ... or {cells}
+(" | "-joined); "cell" picks the cell selector (default "td") and "all": false
+keeps the first row only. "strip" / "flatten" (newlines to spaces) clean
+extracted text, "skip_empty" drops empty text and list items, and "reveal" shows
+every matching tab pane up front, so no tab has to be clicked.
+
+Lists: "selector" picks the list elements and "items" their items, numbered {i}
+from 1 in each list (without "items" the selector picks the items themselves);
+"sub" selects sub-items under each item, rendered with "sub_format".
+
+Tables: the first matching table is serialized whole (see table_extract.py) and
+its rows with "cells" cells (default 3) rendered by detail_rows, the last cell as
+the details: "rows" (tbody, all, direct, first_tbody), "details" (own, full,
+text), "sub_tables" (scheme, rows, headed), "label", "placeholder", and "note",
+the format for single-cell rows.
+
+"heading" is a line emitted before a block's items when it has any, "empty" a
+line emitted instead when it has none.
+
+Besides the text, every block adds structured records (see scrape_output.py):
+    "section": "<format>"   start a section (titled from the item's values) before each item;
+                            on a literal, the literal itself is the section heading
+    "record": {...} | false  record per item, values are formats: {"type": "faq",
+                            "question": "{q}", "answer": "{a}"}; false records nothing.
+                            Default: text -> text, fields -> the rendered text, list -> item,
+                            rows / table -> row
+    "headers": [...]        column names stored with row records
+
+All blocks of a page are extracted by a single page.evaluate DOM walk. The
+"handles" backend does the same with per-element query_selector / inner_text
+calls, the way the scripts do it, for comparison in bench/scrape_engine.py.
+
+Usage:
+    python engine.py specs/script_10.json [--backend evaluate|handles]
+"""
+import argparse
+import json
+import os
+
+from playwright.sync_api import sync_playwright
+
+from fetch_cache import site_url
+from scrape_output import ScrapeOutput
+from scraper_utils import click_and_navigate, goto, launch_browser, new_page, settle, timed
+from table_extract import SERIALIZE_TABLE_JS, detail_rows, serialize_table_handles
+
+SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "specs")
+
+# Runs in the page. Returns one entry per block: page -> {title, url},
+# text -> [str], fields -> [{name: str|null} | null], rows -> [[str]],
+# list -> [[{text, sub: [str]}] per list], table -> serialized table | null, literal -> null.
+EXTRACT_JS = """
+({reveal, blocks}) => {
+    if (reveal) {
+        document.querySelectorAll(reveal).forEach(el => el.classList.add('active', 'show'));
+    }
+    const serializeTable = """ + SERIALIZE_TABLE_JS + """;
+    const nextMatch = (el, selector) => {
+        for (let sib = el.nextElementSibling; sib; sib = sib.nextElementSibling) {
+            if (sib.matches(selector)) return sib;
+        }
+        return null;
+    };
+    const select = (root, selector, all, block = {}) => {
+        const steps = Array.isArray(selector) ? selector : [selector];
+        for (const step of steps.slice(0, -1)) {
+            root = root.querySelector(step);
+            if (!root) return [];
+        }
+        let elements = Array.from(root.querySelectorAll(steps[steps.length - 1]));
+        if (block.has_text) elements = elements.filter(el => el.innerText.includes(block.has_text));
+        if (block.nth !== undefined) elements = elements.slice(block.nth, block.nth + 1);
+        if (!all) elements = elements.slice(0, 1);
+        if (block.next) elements = elements.map(el => nextMatch(el, block.next)).filter(el => el);
+        return elements;
+    };
+    const value = (el, spec) => {
+        const at = spec.lastIndexOf('@');
+        const sel = at >= 0 ? spec.slice(0, at) : spec;
+        const target = (sel === '' || sel === '.') ? el : el.querySelector(sel);
+        if (!target) return undefined;
+        return at >= 0 ? target.getAttribute(spec.slice(at + 1)) : target.innerText;
+    };
+    return blocks.map(block => {
+        if (block.kind === 'literal') return null;
+        if (block.kind === 'page') return {title: document.title, url: location.href};
+
+        let root = document;
+        if (block.scope) {
+            root = document.querySelector(block.scope);
+            if (!root) return block.kind === 'table' ? null : [];
+        }
+        if (block.kind === 'fields') {
+            const optional = block.optional || {};
+            const elements = block.selector ? select(root, block.selector, block.all, block) : [root];
+            return elements.map(el => {
+                const item = {};
+                for (const [name, spec] of Object.entries(block.fields)) {
+                    const v = value(el, spec);
+                    if (v === undefined && !(name in optional)) return null;
+                    item[name] = v === undefined ? null : v;
+                }
+                return item;
+            });
+        }
+        if (block.kind === 'table') {
+            const [table] = select(root, block.selector, false, block);
+            return table ? serializeTable(table) : null;
+        }
+        const all = block.kind === 'rows' ? block.all !== false : block.all;
+        const elements = select(root, block.selector, all, block);
+        if (block.kind === 'rows') {
+            return elements.map(row => Array.from(row.querySelectorAll(block.cell || 'td'), c => c.innerText));
+        }
+        if (block.kind === 'list') {
+            const item = el => ({
+                text: el.innerText,
+                sub: block.sub ? select(el, block.sub, true).map(s => s.innerText) : [],
+            });
+            return block.items ? elements.map(list => Array.from(list.querySelectorAll(block.items), item))
+                               : [elements.map(item)];
+        }
+        return elements.map(el => el.innerText);
+    });
+}
+"""
+
+
+# ----------------------------------------------------------------------
+# Extraction backends
+# ----------------------------------------------------------------------
+
+def extract_evaluate(page, blocks, reveal=None):
+    """Extract every block with one in-page DOM walk."""
+    with timed("extract"):
+        return page.evaluate(EXTRACT_JS, {"reveal": reveal, "blocks": blocks})
+
+
+def _select_handles(root, selector, all_matches, block=None):
+    block = block or {}
+    steps = selector if isinstance(selector, list) else [selector]
+    for step in steps[:-1]:
+        root = root.query_selector(step)
+        if not root:
+            return []
+    elements = root.query_selector_all(steps[-1])
+    if block.get("has_text"):
+        elements = [el for el in elements if block["has_text"] in el.inner_text()]
+    if "nth" in block:
+        elements = elements[block["nth"]:block["nth"] + 1]
+    if not all_matches:
+        elements = elements[:1]
+    if block.get("next"):
+        siblings = (el.evaluate_handle(
+            """(el, selector) => {
+                for (let sib = el.nextElementSibling; sib; sib = sib.nextElementSibling) {
+                    if (sib.matches(selector)) return sib;
+                }
+                return null;
+            }""", block["next"]).as_element() for el in elements)
+        elements = [el for el in siblings if el]
+    return elements
+
+
+def _value_handle(element, spec):
+    selector, _, attr = spec.rpartition("@") if "@" in spec else (spec, "", "")
+    target = element if selector in ("", ".") else element.query_selector(selector)
+    if not target:
+        return None, False
+    return (target.get_attribute(attr) if attr else target.inner_text()), True
+
+
+def extract_handles(page, blocks, reveal=None):
+    """Extract every block with per-element Playwright calls (one IPC round trip each)."""
+    with timed("extract"):
+        if reveal:
+            page.evaluate("sel => document.querySelectorAll(sel).forEach(el => el.classList.add('active', 'show'))",
+                          reveal)
+        results = []
+        for block in blocks:
+            kind = block["kind"]
+            if kind == "literal":
+                results.append(None)
+                continue
+            if kind == "page":
+                results.append({"title": page.title(), "url": page.url})
+                continue
+
+            root = page
+            if block.get("scope"):
+                root = page.query_selector(block["scope"])
+                if not root:
+                    results.append(None if kind == "table" else [])
+                    continue
+
+            if kind == "fields":
+                elements = (_select_handles(root, block["selector"], block.get("all"), block)
+                            if block.get("selector") else [root])
+                optional = block.get("optional", {})
+                items = []
+                for element in elements:
+                    item = {}
+                    for name, spec in block["fields"].items():
+                        value, found = _value_handle(element, spec)
+                        if not found and name not in optional:
+                            item = None
+                            break
+                        item[name] = value
+                    items.append(item)
+                results.append(items)
+            elif kind == "table":
+                tables = _select_handles(root, block["selector"], False, block)
+                results.append(serialize_table_handles(tables[0]) if tables else None)
+            elif kind == "rows":
+                rows = _select_handles(root, block["selector"], block.get("all", True), block)
+                results.append([[cell.inner_text() for cell in row.query_selector_all(block.get("cell", "td"))]
+                                for row in rows])
+            elif kind == "list":
+                def item(element):
+                    sub = _select_handles(element, block["sub"], True) if block.get("sub") else []
+                    return {"text": element.inner_text(), "sub": [el.inner_text() for el in sub]}
+
+                elements = _select_handles(root, block["selector"], block.get("all"), block)
+                if block.get("items"):
+                    results.append([[item(li) for li in lst.query_selector_all(block["items"])] for lst in elements])
+                else:
+                    results.append([[item(el) for el in elements]])
+            else:
+                results.append([el.inner_text() for el in
+                                _select_handles(root, block["selector"], block.get("all"), block)])
+        return results
+
+
+BACKENDS = {"evaluate": extract_evaluate, "handles": extract_handles}
+
+
+# ----------------------------------------------------------------------
+# Rendering
+# ----------------------------------------------------------------------
+
+def _clean(value, block):
+    if value is None:
+        return None
+    if block.get("strip"):
+        value = value.strip()
+    if block.get("flatten"):
+        value = value.replace("\n", " ")
+    return value
+
+
+def _values(block, item):
+    """Cleaned field values of one fields item; a missing optional field renders as ""."""
+    optional = block.get("optional", {})
+    values = {}
+    for name, v in item.items():
+        v = _clean(v, block)
+        if name in optional:
+            v = optional[name].format(**{name: v}) if v is not None else ""
+        values[name] = v
+    return values
+
+
+def _block_items(block, data):
+    """(values, rendered line) per extracted item of a text / fields / rows / list / table block."""
+    kind = block["kind"]
+    if kind == "table":
+        if data is None:
+            return []
+        rows = detail_rows(data, block.get("rows", "tbody"), block.get("cells", 3), notes="note" in block,
+                           details=block.get("details", "own"), sub_tables=block.get("sub_tables", "scheme"),
+                           label=block.get("label"), placeholder=block.get("placeholder"))
+        items = []
+        for cells in rows:
+            values = {f"c{j}": v for j, v in enumerate(cells)}
+            fmt = block["note"] if len(cells) == 1 and block.get("cells", 3) != 1 else block["format"]
+            items.append((values, fmt.format(**values)))
+        return items
+    if kind == "list":
+        items = []
+        for group in data:
+            i = 0
+            for entry in group:
+                text = _clean(entry["text"], block)
+                if block.get("skip_empty") and not text.strip():
+                    continue
+                i += 1
+                items.append(({"text": text}, block["format"].format(i=i, text=text)))
+                for sub in entry["sub"]:
+                    sub = _clean(sub, block)
+                    if block.get("skip_empty") and not sub.strip():
+                        continue
+                    items.append(({"text": sub}, block["sub_format"].format(i=i, text=sub)))
+        return items
+
+    items = []
+    for i, item in enumerate(data, 1):
+        if kind == "fields":
+            if item is None:
+                continue
+            values = _values(block, item)
+        elif kind == "rows":
+            if "cells" in block and len(item) != block["cells"]:
+                continue
+            values = {f"c{j}": _clean(v, block) for j, v in enumerate(item)}
+            values["cells"] = " | ".join(values.values())
+        else:
+            values = {"text": _clean(item, block)}
+            if block.get("skip_empty") and not values["text"].strip():
+                continue
+        items.append((values, block["format"].format(i=i, **values)))
+    return items
+
+
+def emit_block(out, block, data):
+    """Add one block's records and text lines to a ScrapeOutput."""
+    kind = block["kind"]
+    fmt = block.get("format")
+    if kind == "literal":
+        if "section" in block:
+            out.section(block["section"], text=fmt)
+        else:
+            out.line(fmt)
+        return
+    if kind == "page":
+        out.page(site_url(data["url"], os.environ.get("BOM_BASE_URL")), data["title"],
+                 text=fmt.format(**data) if fmt is not None else None)
+        return
+
+    default = {"rows": {"type": "row"}, "table": {"type": "row"}, "list": {"type": "item", "text": "{text}"},
+               "text": {"type": "text", "text": "{text}"}}.get(kind, {"type": "text"})
+    record = block.get("record", default)
+    items = _block_items(block, data)
+    if items and block.get("heading") is not None:
+        out.line(block["heading"])
+    table_rows, table_lines = [], []
+    for i, (values, line) in enumerate(items, 1):
+        if "section" in block:
+            out.begin_section(block["section"].format(i=i, **values))
+        if record is False:
+            out.line(line)
+            continue
+        fields = {name: spec.format(i=i, **values) for name, spec in record.items() if name != "type"}
+        if record["type"] == "row":
+            table_rows.append([v for name, v in values.items() if name.startswith("c") and name[1:].isdigit()])
+            table_lines.append(line)
+        elif record["type"] == "faq":
+            out.faq(fields["question"], fields["answer"], line=line)
+        elif record["type"] == "item":
+            out.item(fields["text"], line=line)
+        else:
+            out.text(fields.get("text", line.strip()), line=line)
+    if table_rows:
+        out.table(table_rows, headers=block.get("headers"), lines=table_lines)
+    if not items and block.get("empty") is not None:
+        out.line(block["empty"])
+
+
+# ----------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------
+
+def load_spec(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_spec(spec, browser, backend="evaluate"):
+    """Visit the spec's pages in order and return their ScrapeOutput (records and text lines)."""
+    extract = BACKENDS[backend]
+    page = new_page(browser)
+    context = page.context
+    out = ScrapeOutput()
+    try:
+        for page_spec in spec["pages"]:
+            if "goto" in page_spec:
+                goto(page, page_spec["goto"], page_spec.get("wait_for"))
+            if "popup" in page_spec:
+                popup = page_spec["popup"]
+                with page.expect_popup() as popup_info:
+                    page.locator(popup["selector"], has_text=popup.get("has_text")).first.click()
+                page = popup_info.value
+                settle(page, page_spec.get("wait_for"))
+            if "navigate" in page_spec:
+                link = page_spec["navigate"]
+                click_and_navigate(page, page.locator(link["selector"], has_text=link.get("has_text")).first)
+
+            blocks = page_spec["blocks"]
+            for block, data in zip(blocks, extract(page, blocks, page_spec.get("reveal"))):
+                emit_block(out, block, data)
+    finally:
+        context.close()
+    return out
+
+
+def write_output(spec, out):
+    """Write <output>.jsonl and <output>.txt; returns the .txt path."""
+    return out.write(os.path.splitext(spec["output"])[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("spec", help="path to a spec JSON file")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="evaluate")
+    args = parser.parse_args()
+
+    spec = load_spec(args.spec)
+    with sync_playwright() as p:
+        browser = launch_browser(p, slow_mo=spec.get("slow_mo", 0))
+        out = run_spec(spec, browser, args.backend)
+        print(f"Saved {write_output(spec, out)}")
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Conditional fetching and change detection for the scrapers.
+
+For every job (script_<n>.py or spec) the cache remembers the documents it
+loaded, with their ETag / Last-Modified validators, a hash of the response body
+and hashes of the rendered content sections (recorded by scraper_utils through
+BOM_FETCH_LOG), plus the hashes of the job's <job>.txt and <job>.jsonl outputs.
+
+Before a job runs, each of its pages is re-requested conditionally
+(If-None-Match / If-Modified-Since). If every page answers 304, or returns the
+same body, the browser is never started for that job and its output is left
+untouched. After a job runs, pages whose rendered sections changed and whether
+the output itself changed are recorded.
+
+Both files live next to the scraped .txt files:
+    .fetch_cache.json   validators and hashes per job and page
+    changed_pages.json  manifest of the last run for the ingestion stages:
+                        {"jobs": {job: {"status", "output", "changed_pages"}},
+                         "changed_outputs": [...], "unchanged_outputs": [...]}
+    status is "skipped" (not modified, not run), "unchanged" (ran, same output),
+    "changed" or "failed".
+"""
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from fixture_server import SITE_URL, SITE_URLS
+
+CACHE_FILE = ".fetch_cache.json"
+OUTPUT_EXTENSIONS = (".txt", ".jsonl")
+MANIFEST_FILE = "changed_pages.json"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return sha256_bytes(f.read())
+
+
+def resolve_url(url, base_url=None):
+    """Point a site URL at base_url (a fixture server) when one is given."""
+    if base_url:
+        for site_url in SITE_URLS:
+            if url.startswith(site_url):
+                return base_url.rstrip("/") + url[len(site_url):]
+    return url
+
+
+def site_url(url, base_url=None):
+    """Inverse of resolve_url: the site URL a fixture-server URL stands for."""
+    if base_url and url.startswith(base_url.rstrip("/")):
+        return SITE_URL + url[len(base_url.rstrip("/")):]
+    return url
+
+
+def content_sha256(body, base_url=None):
+    """Hash a response body, ignoring the fixture server's origin in rewritten links."""
+    if base_url:
+        body = body.replace(base_url.rstrip("/").encode(), SITE_URL.encode())
+    return sha256_bytes(body)
+
+
+def conditional_get(url, etag=None, last_modified=None, timeout=30):
+    """
+    GET url with the stored validators.
+
+    Returns:
+        (status, body); body is None for 304 Not Modified
+    """
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    if etag:
+        request.add_header("If-None-Match", etag)
+    if last_modified:
+        request.add_header("If-Modified-Since", last_modified)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, None
+        raise
+
+
+def read_fetch_log(path):
+    """Merge a job's BOM_FETCH_LOG lines into {url: {etag, last_modified, sha256, sections}}."""
+    pages = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                pages.setdefault(record.pop("url"), {}).update(record)
+    return pages
+
+
+def _page_changed(old, new):
+    if old is None:
+        return True
+    # Rendered sections ignore markup-only churn (tokens, script tags); fall back to the body
+    if "sections" in old or "sections" in new:
+        return old.get("sections") != new.get("sections")
+    return old.get("sha256") != new.get("sha256")
+
+
+class FetchCache:
+    """Per-job fetch validators and content hashes, stored in <output_dir>/.fetch_cache.json."""
+
+    def __init__(self, output_dir, base_url=None, timeout=30):
+        """
+        Args:
+            output_dir: Directory the jobs write <job>.txt to; the cache and manifest live here too
+            base_url: Fixture server origin standing in for the site (BOM_BASE_URL), if any
+            timeout: Seconds per conditional request
+        """
+        self.output_dir = output_dir
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache_path = os.path.join(output_dir, CACHE_FILE)
+        self.jobs = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                self.jobs = json.load(f)
+        self.results = {}
+
+    def outputs_sha256(self, name):
+        """{file name: hash} of the job's outputs that exist, or None without its .txt."""
+        hashes = {}
+        for extension in OUTPUT_EXTENSIONS:
+            path = os.path.join(self.output_dir, name + extension)
+            if os.path.exists(path):
+                hashes[name + extension] = file_sha256(path)
+        return hashes if f"{name}.txt" in hashes else None
+
+    def _page_not_modified(self, url, page):
+        try:
+            status, body = conditional_get(resolve_url(url, self.base_url), page.get("etag"),
+                                           page.get("last_modified"), self.timeout)
+        except (urllib.error.URLError, OSError) as e:
+            print(f"  {url}: conditional check failed ({e})")
+            return False
+        return status == 304 or content_sha256(body, self.base_url) == page.get("sha256")
+
+    def not_modified(self, name):
+        """True if the job has run before, its outputs are intact and none of its pages changed."""
+        entry = self.jobs.get(name)
+        if not entry or not entry.get("pages"):
+            return False
+        # A missing, added or edited .txt / .jsonl means the job has to run again
+        outputs = self.outputs_sha256(name)
+        if outputs is None or outputs != entry.get("outputs_sha256"):
+            return False
+        return all(self._page_not_modified(url, page) for url, page in entry["pages"].items())
+
+    def skipped(self, name):
+        self.results[name] = {"status": "skipped", "output": f"{name}.txt", "changed_pages": []}
+
+    def failed(self, name):
+        self.results[name] = {"status": "failed", "output": f"{name}.txt", "changed_pages": []}
+
+    def record(self, name, fetch_log):
+        """Store what a successful run fetched and classify it as changed / unchanged."""
+        pages = read_fetch_log(fetch_log)
+        previous = self.jobs.get(name, {})
+        previous_pages = previous.get("pages", {})
+        outputs = self.outputs_sha256(name)
+
+        changed_pages = sorted(url for url, page in pages.items() if _page_changed(previous_pages.get(url), page))
+        status = "unchanged" if outputs is not None and outputs == previous.get("outputs_sha256") else "changed"
+        self.jobs[name] = {"outputs_sha256": outputs, "pages": pages}
+        self.results[name] = {"status": status, "output": f"{name}.txt", "changed_pages": changed_pages}
+        return status
+
+    def save(self):
+        """Write the cache and this run's changed-pages manifest; returns the manifest path."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.jobs, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
+
+        manifest = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "jobs": self.results,
+            "changed_outputs": sorted(r["output"] for r in self.results.values() if r["status"] == "changed"),
+            "unchanged_outputs": sorted(r["output"] for r in self.results.values()
+                                        if r["status"] in ("skipped", "unchanged")),
+        }
+        manifest_path = os.path.join(self.output_dir, MANIFEST_FILE)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+        return manifest_path
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Local static server for saved bankofmaharashtra.in pages, so the scrapers can run offline.
+
+Fixtures are the site's responses saved under scrapping_scripts/fixtures/ by
+`run_all_scripts.py --capture`. Extensionless paths are stored as <path>.html.
+Absolute links to the live site inside HTML are rewritten to this server, so
+pages the scrapers open from a link (new tabs, side menus) are served locally too.
+
+HTML pages carry validators like a real server would, and conditional requests
+(If-None-Match / If-Modified-Since) get 304 Not Modified:
+    ETag           hash of the fixture file
+    Last-Modified  the fixture file's mtime
+--validators picks which of the two are sent (both, etag, last-modified, none).
+A sidecar <page>.html.headers.json overrides or adds headers for one page,
+e.g. {"ETag": "\"v2\"", "Last-Modified": null}; null drops a header.
+
+Usage:
+    python fixture_server.py [--dir fixtures] [--port 8765] [--validators both]
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from email.utils import parsedate_to_datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+SITE_URL = "https://bankofmaharashtra.in"
+# The site redirects to its .bank.in domain; both are served from the same fixtures
+SITE_URLS = (SITE_URL, "https://bankofmaharashtra.bank.in")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+VALIDATORS = ("both", "etag", "last-modified", "none")
+
+
+def fixture_path(url, fixtures_dir):
+    """Map a site URL (or request path) to its file under fixtures_dir."""
+    path = urlsplit(url).path.strip("/") or "index"
+    if not os.path.splitext(path)[1]:
+        path += ".html"
+    return os.path.join(fixtures_dir, *path.split("/"))
+
+
+def save_fixture(url, body, fixtures_dir):
+    """Store one response body as a fixture."""
+    path = fixture_path(url, fixtures_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serves fixtures, rewriting live-site links in HTML to this server's origin."""
+
+    def __init__(self, *args, validators="both", **kwargs):
+        # Set before the base class handles the request from its __init__
+        self.validators = validators
+        super().__init__(*args, **kwargs)
+
+    def translate_path(self, path):
+        return fixture_path(path, self.directory)
+
+    def _page_headers(self, path, raw):
+        headers = {}
+        if self.validators in ("both", "etag"):
+            headers["ETag"] = '"%s"' % hashlib.sha256(raw).hexdigest()[:32]
+        if self.validators in ("both", "last-modified"):
+            headers["Last-Modified"] = self.date_time_string(int(os.path.getmtime(path)))
+        overrides = path + ".headers.json"
+        if os.path.exists(overrides):
+            with open(overrides, "r", encoding="utf-8") as f:
+                headers.update(json.load(f))
+        return {name: value for name, value in headers.items() if value is not None}
+
+    def _not_modified(self, headers):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and "ETag" in headers:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or headers["ETag"].removeprefix("W/") in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and "Last-Modified" in headers:
+            try:
+                return parsedate_to_datetime(headers["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if not path.endswith(".html") or not os.path.exists(path):
+            return super().do_GET()
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        headers = self._page_headers(path, raw)
+        if self._not_modified(headers):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        body = raw
+        origin = f"http://{self.headers.get('Host', '%s:%d' % self.server.server_address)}"
+        for site_url in SITE_URLS:
+            body = body.replace(site_url.encode(), origin.encode())
+
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(fixtures_dir=FIXTURES_DIR, port=0, validators="both"):
+    """
+    Serve fixtures_dir from a background thread.
+
+    Returns:
+        (server, base_url); call server.shutdown() when done
+    """
+    handler = partial(FixtureHandler, directory=fixtures_dir, validators=validators)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=FIXTURES_DIR, help="fixtures directory")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--validators", choices=VALIDATORS, default="both", help="validators sent with HTML pages")
+    args = parser.parse_args()
+
+    handler = partial(FixtureHandler, directory=args.dir, validators=args.validators)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+    print(f"Serving {args.dir} at http://127.0.0.1:{args.port} (set BOM_BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
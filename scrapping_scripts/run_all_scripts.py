@@ -1,51 +1,142 @@
 #!/usr/bin/env python3
 """
 Script to run all scraping scripts in the scrapping_scripts directory.
+
+One headless Chromium is launched and shared over CDP; every script attaches to it
+and works in its own browser context. Up to --concurrency scripts run at once, and
+wall time is reported per script and per scraping action (goto, click_tab, ...).
+Pages described by a spec in specs/<name>.json are scraped by engine.py instead
+of a script_<n>.py.
+
+Scripts whose pages all answer 304 Not Modified (or return the same content) are
+skipped; see fetch_cache.py. Every run writes changed_pages.json next to the
+output for the ingestion stages (`ingest.py --changed-manifest`).
+
+Usage:
+    python run_all_scripts.py [script_1 script_7 ...] [--concurrency 4] [--refresh]
+    python run_all_scripts.py --fixtures fixtures --output-dir /tmp/raw   # offline, against saved pages
+    python run_all_scripts.py --capture fixtures      # save live pages as fixtures
 """
+import argparse
+import asyncio
 import os
+import socket
 import sys
-import subprocess
+import tempfile
+import time
 from pathlib import Path
 
-def run_all_scripts():
+from playwright.async_api import async_playwright
+
+from fetch_cache import FetchCache
+from fixture_server import start_server
+from scraper_utils import raw_output_dir, summarize_timings
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def find_jobs(script_dir, names=None):
+    """Map each scraper name to the command that runs it: its spec if one exists, else its script."""
+    jobs = {s.stem: [str(s)] for s in script_dir.glob("script_*.py")}
+    for spec in (script_dir / "specs").glob("*.json"):
+        jobs[spec.stem] = [str(script_dir / "engine.py"), str(spec)]
+    if names:
+        wanted = {Path(n).stem for n in names}
+        jobs = {name: argv for name, argv in jobs.items() if name in wanted}
+    return dict(sorted(jobs.items()))
+
+
+async def run_script(name, argv, env, semaphore, timeout, cache=None, skip_unmodified=False):
+    """
+    Run one scraper subprocess once a pool slot is free, unless skip_unmodified and
+    the fetch cache says none of its pages changed; returns (name, error, seconds).
+    """
+    async with semaphore:
+        start = time.perf_counter()
+        if skip_unmodified and await asyncio.to_thread(cache.not_modified, name):
+            cache.skipped(name)
+            print(f"= {name} not modified, skipped ({time.perf_counter() - start:.1f}s)")
+            return name, None, time.perf_counter() - start
+
+        print(f"Running {name}...")
+        fd, fetch_log = tempfile.mkstemp(suffix=".jsonl", prefix=f"bom_fetch_{name}_")
+        os.close(fd)
+        proc = await asyncio.create_subprocess_exec(sys.executable, *argv, cwd=os.path.dirname(argv[0]),
+                                                    env=dict(env, BOM_JOB_NAME=name, BOM_FETCH_LOG=fetch_log))
+        try:
+            returncode = await asyncio.wait_for(proc.wait(), timeout)
+            error = None if returncode == 0 else f"Error code: {returncode}"
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            error = f"Timeout after {timeout}s"
+        except Exception as e:
+            error = str(e)
+        elapsed = time.perf_counter() - start
+
+    status = "completed"
+    if cache is not None:
+        if error is None:
+            status = cache.record(name, fetch_log)
+        else:
+            cache.failed(name)
+    os.remove(fetch_log)
+    print(f"{'✓' if error is None else '✗'} {name} {status if error is None else error} ({elapsed:.1f}s)")
+    return name, error, elapsed
+
+
+async def run_all_scripts(names=None, concurrency=4, timeout=300, base_url=None, capture_dir=None,
+                          output_dir=None, headed=False, slow_mo=0, fixed_waits=False, refresh=False):
     # Get the directory where this script is located
     script_dir = Path(__file__).parent
-    
-    # Find all Python scripts (excluding this runner script)
-    scripts = sorted([f for f in script_dir.glob("script_*.py") 
-                     if f.name != "run_all_scripts.py"])
-    
+
+    scripts = find_jobs(script_dir, names)
+
     if not scripts:
         print("No scripts found to run.")
-        return
-    
-    print(f"Found {len(scripts)} scripts to run.\n")
-    
-    successful = []
-    failed = []
-    
-    for idx, script in enumerate(scripts, 1):
-        print(f"[{idx}/{len(scripts)}] Running {script.name}...")
+        return {"wall_time": 0.0, "scripts": [], "actions": {}, "changed": {}}
+
+    print(f"Found {len(scripts)} scripts to run (concurrency {concurrency}).\n")
+
+    port = _free_port()
+    env = dict(os.environ, BOM_CDP_ENDPOINT=f"http://127.0.0.1:{port}", BOM_SLOW_MO=str(slow_mo))
+    if base_url:
+        env["BOM_BASE_URL"] = base_url
+    if capture_dir:
+        env["BOM_CAPTURE_DIR"] = os.path.abspath(capture_dir)
+    if output_dir:
+        env["BOM_OUTPUT_DIR"] = os.path.abspath(output_dir)
+    if fixed_waits:
+        env["BOM_FIXED_WAITS"] = "1"
+    fd, timings_file = tempfile.mkstemp(suffix=".jsonl", prefix="bom_timings_")
+    os.close(fd)
+    env["BOM_TIMINGS_FILE"] = timings_file
+
+    cache = FetchCache(os.path.abspath(output_dir) if output_dir else raw_output_dir(), base_url)
+    # Capturing fixtures needs every page loaded, so nothing is skipped then
+    skip_unmodified = not (refresh or capture_dir)
+
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=not headed, args=[f"--remote-debugging-port={port}"])
         try:
-            # Run the script using subprocess
-            result = subprocess.run(
-                [sys.executable, str(script)],
-                cwd=str(script_dir),
-                timeout=300,  # 5 minutes timeout per script
-                check=True
-            )
-            print(f"✓ {script.name} completed successfully\n")
-            successful.append(script.name)
-        except subprocess.TimeoutExpired:
-            print(f"✗ {script.name} timed out after 5 minutes\n")
-            failed.append((script.name, "Timeout"))
-        except subprocess.CalledProcessError as e:
-            print(f"✗ {script.name} failed with error code {e.returncode}\n")
-            failed.append((script.name, f"Error code: {e.returncode}"))
-        except Exception as e:
-            print(f"✗ {script.name} failed with error: {str(e)}\n")
-            failed.append((script.name, str(e)))
-    
+            semaphore = asyncio.Semaphore(concurrency)
+            results = await asyncio.gather(*(run_script(name, argv, env, semaphore, timeout, cache, skip_unmodified)
+                                             for name, argv in scripts.items()))
+        finally:
+            await browser.close()
+    total = time.perf_counter() - start
+    timings = summarize_timings(timings_file)
+    os.remove(timings_file)
+    manifest_path = cache.save()
+
+    successful = [(name, t) for name, error, t in results if error is None]
+    failed = [(name, error, t) for name, error, t in results if error is not None]
+
     # Summary
     print("\n" + "="*50)
     print("SUMMARY")
@@ -53,16 +144,59 @@ def run_all_scripts():
     print(f"Total scripts: {len(scripts)}")
     print(f"Successful: {len(successful)}")
     print(f"Failed: {len(failed)}")
-    
+    print(f"Wall time: {total:.1f}s (sum of script times {sum(t for _, _, t in results):.1f}s)")
+
     if successful:
         print("\nSuccessful scripts:")
-        for script in successful:
-            print(f"  ✓ {script}")
-    
+        for script, t in successful:
+            print(f"  ✓ {script:<20} {t:>7.1f}s")
+
     if failed:
         print("\nFailed scripts:")
-        for script, error in failed:
-            print(f"  ✗ {script} - {error}")
+        for script, error, t in failed:
+            print(f"  ✗ {script:<20} {t:>7.1f}s - {error}")
+
+    if timings:
+        print("\nTime per action (all scripts):")
+        for action, (count, seconds) in sorted(timings.items(), key=lambda kv: -kv[1][1]):
+            print(f"  {action:<12} {count:>5}x {seconds:>8.2f}s")
+
+    print(f"\nChanges ({manifest_path}):")
+    for name, result in sorted(cache.results.items()):
+        pages = f" ({len(result['changed_pages'])} pages changed)" if result["changed_pages"] else ""
+        print(f"  {name:<20} {result['status']}{pages}")
+
+    return {"wall_time": total, "scripts": results, "actions": timings, "changed": cache.results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scripts", nargs="*", help="script names to run (default: all script_*.py)")
+    parser.add_argument("--concurrency", type=int, default=4, help="scripts (browser contexts) open at once")
+    parser.add_argument("--timeout", type=int, default=300, help="seconds per script")
+    parser.add_argument("--base-url", help="serve site URLs from this origin instead of the live site")
+    parser.add_argument("--fixtures", help="start a local fixture server on this directory and scrape it")
+    parser.add_argument("--capture", help="save every live page response under this directory")
+    parser.add_argument("--output-dir", help="write scraped .txt files here instead of data/raw")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--slow-mo", type=int, default=0)
+    parser.add_argument("--fixed-waits", action="store_true", help="sleep fixed delays like the old scripts (baseline)")
+    parser.add_argument("--refresh", action="store_true", help="run every script even if its pages are not modified")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if args.fixtures:
+        server, base_url = start_server(os.path.abspath(args.fixtures))
+        print(f"Serving fixtures from {args.fixtures} at {base_url}")
+    try:
+        asyncio.run(run_all_scripts(args.scripts, args.concurrency, args.timeout, base_url,
+                                    args.capture, args.output_dir, args.headed, args.slow_mo,
+                                    args.fixed_waits, args.refresh))
+    finally:
+        if server:
+            server.shutdown()
+
 
 if __name__ == "__main__":
-    run_all_scripts()
\ No newline at end of file
+    main()
@@ -0,0 +1,97 @@
+"""
+Structured scraper output.
+
+Scrapers describe what they extract (pages, sections, text, list items, FAQ
+pairs, table rows) instead of only formatting it as text. Every call records a
+JSON object and renders the human-readable line it always produced, so each job
+writes both:
+    <job>.jsonl  one record per line, read by utils/preprocess_text.py
+    <job>.txt    the same content as text, for people and the fetch cache
+
+Record layout (url / title / section are the enclosing page and section):
+    {"type": "section", "url", "title", "section"}
+    {"type": "text",    "url", "title", "section", "text": str}
+    {"type": "item",    "url", "title", "section", "text": str}
+    {"type": "faq",     "url", "title", "section", "question": str, "answer": str}
+    {"type": "row",     "url", "title", "section", "table": int, "headers": [str] | null, "cells": [str]}
+Rows of one table share the "table" number.
+"""
+import json
+import os
+
+from scraper_utils import raw_output_dir
+
+
+class ScrapeOutput:
+    """Records plus their text rendering for one scraper job."""
+
+    def __init__(self):
+        self.lines = []
+        self.records = []
+        self.url = None
+        self.title = None
+        self.current_section = None
+        self._tables = 0
+
+    def _record(self, type_, **fields):
+        self.records.append({"type": type_, "url": self.url, "title": self.title,
+                             "section": self.current_section, **fields})
+
+    def line(self, text):
+        """Text-only line (labels, separators, notes) with no record."""
+        self.lines.append(text)
+
+    def page(self, url, title=None, text=None):
+        """Start a new page; following records carry its url and title."""
+        self.url = url
+        self.title = title
+        self.current_section = None
+        if text is not None:
+            self.lines.append(text)
+
+    def begin_section(self, title):
+        """Start a section without rendering a heading line (it is part of other text)."""
+        self.current_section = title
+        self._record("section")
+
+    def section(self, title, text=None):
+        """Start a section, rendered as "--- title ---" unless text is given."""
+        self.begin_section(title)
+        self.lines.append(f"\n--- {title} ---" if text is None else text)
+
+    def text(self, text, line=None):
+        """A paragraph; empty text still renders its (blank) line but records nothing."""
+        if text:
+            self._record("text", text=text)
+        self.lines.append(text if line is None else line)
+
+    def item(self, text, line=None):
+        """A list item, rendered as "- text" unless line is given."""
+        self._record("item", text=text)
+        self.lines.append(f"- {text}" if line is None else line)
+
+    def faq(self, question, answer, line=None):
+        self._record("faq", question=question, answer=answer)
+        self.lines.append(f"Q: {question}\nA: {answer}\n" if line is None else line)
+
+    def table(self, rows, headers=None, lines=None):
+        """
+        One table: rows are lists of cell texts. Rendered as " | "-joined rows
+        unless lines (the text rendering) is given.
+        """
+        self._tables += 1
+        for cells in rows:
+            self._record("row", table=self._tables, headers=headers, cells=cells)
+        self.lines.extend([" | ".join(cells) for cells in rows] if lines is None else lines)
+
+    def write(self, name, output_dir=None):
+        """Write <name>.jsonl and <name>.txt; returns the .txt path."""
+        output_dir = output_dir or raw_output_dir()
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, f"{name}.jsonl"), "w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output_path = os.path.join(output_dir, f"{name}.txt")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.lines))
+        return output_path
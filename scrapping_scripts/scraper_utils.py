@@ -0,0 +1,267 @@
+"""
+Shared helpers for the script_*.py scrapers.
+
+Environment variables (set by run_all_scripts.py, all optional):
+    BOM_CDP_ENDPOINT  attach to an already running Chromium instead of launching one
+    BOM_HEADLESS      "1" to launch headless when running a script on its own
+    BOM_SLOW_MO       override the per-script slow_mo (milliseconds)
+    BOM_BASE_URL      serve bankofmaharashtra.in URLs from another origin (fixture server)
+    BOM_CAPTURE_DIR   save every bankofmaharashtra.in response as an offline fixture
+    BOM_OUTPUT_DIR    write scraped .txt files here instead of data/raw
+    BOM_TIMINGS_FILE  append per-action timings (JSON lines) here instead of printing them
+    BOM_FIXED_WAITS   "1" to sleep fixed delays like the old scripts did (benchmark baseline)
+    BOM_FETCH_LOG     append loaded documents' validators and content hashes here (fetch_cache.py)
+"""
+import atexit
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from fetch_cache import content_sha256, resolve_url as _resolve_url, site_url
+from fixture_server import SITE_URLS, save_fixture
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Upper bounds for the event-driven waits; they normally return as soon as the
+# page is ready. The fixed delays are what the scripts used to sleep unconditionally.
+NAVIGATION_TIMEOUT = 60000
+IDLE_TIMEOUT = 3000
+TAB_TIMEOUT = 2000
+NAVIGATION_START_TIMEOUT = 2000
+FIXED_PAGE_WAIT = 2000
+FIXED_TAB_WAIT = 1000
+
+_timings = defaultdict(list)
+
+# Content containers hashed per page for change detection (outermost matches, else <body>)
+CONTENT_SECTIONS = "div.page-con-list-block, div.inner_post_content, div.tab-content, main"
+SECTIONS_JS = """
+sel => {
+    const els = Array.from(document.querySelectorAll(sel)).filter(el => !el.parentElement.closest(sel));
+    return (els.length ? els : [document.body]).map(el => el.innerText);
+}
+"""
+
+
+def resolve_url(url):
+    """Point a bankofmaharashtra.in URL at BOM_BASE_URL when one is configured."""
+    return _resolve_url(url, os.environ.get("BOM_BASE_URL"))
+
+
+def raw_output_dir():
+    """Directory the scrapers write their .txt output to."""
+    return os.environ.get("BOM_OUTPUT_DIR") or os.path.join(PROJECT_ROOT, "data", "raw")
+
+
+def launch_browser(p, slow_mo=0):
+    """
+    Return a Chromium browser for a scraper.
+
+    Under run_all_scripts.py this attaches to the runner's shared headless browser
+    over CDP; closing it only drops this script's contexts. Run on its own, the
+    script launches its own browser (headed unless BOM_HEADLESS=1).
+    """
+    slow_mo = int(os.environ.get("BOM_SLOW_MO", slow_mo))
+    endpoint = os.environ.get("BOM_CDP_ENDPOINT")
+    if endpoint:
+        return p.chromium.connect_over_cdp(endpoint, slow_mo=slow_mo)
+    return p.chromium.launch(headless=os.environ.get("BOM_HEADLESS") == "1", slow_mo=slow_mo)
+
+
+def new_page(browser):
+    """
+    Open a page in a fresh, isolated context, recording fixtures if BOM_CAPTURE_DIR
+    is set and loaded documents if BOM_FETCH_LOG is set.
+    """
+    context = browser.new_context()
+    capture_dir = os.environ.get("BOM_CAPTURE_DIR")
+    if capture_dir:
+        context.on("response", lambda response: _capture(response, capture_dir))
+    fetch_log = os.environ.get("BOM_FETCH_LOG")
+    if fetch_log:
+        context.on("response", lambda response: _record_document(response, fetch_log))
+    return context.new_page()
+
+
+def _capture(response, capture_dir):
+    if response.url.startswith(SITE_URLS) and response.ok:
+        try:
+            save_fixture(response.url, response.body(), capture_dir)
+        except Exception as e:
+            # Redirects and aborted requests have no body; they are not fixtures
+            print(f"  capture skipped {response.url}: {e}")
+
+
+# ----------------------------------------------------------------------
+# Fetch log (change detection, see fetch_cache.py)
+# ----------------------------------------------------------------------
+
+def _append_fetch_log(fetch_log, record):
+    with open(fetch_log, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _record_document(response, fetch_log):
+    """Log a loaded site document's validators and body hash (iframes from other sites are ignored)."""
+    base_url = os.environ.get("BOM_BASE_URL")
+    url = site_url(response.url, base_url)
+    if response.request.resource_type != "document" or response.status != 200 or not url.startswith(SITE_URLS):
+        return
+    try:
+        body = response.body()
+    except Exception:
+        return
+    _append_fetch_log(fetch_log, {
+        "url": url,
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+        "sha256": content_sha256(body, base_url),
+    })
+
+
+def _record_sections(page):
+    """Log hashes of the rendered content sections of a page that just settled."""
+    fetch_log = os.environ.get("BOM_FETCH_LOG")
+    if not fetch_log:
+        return
+    texts = page.evaluate(SECTIONS_JS, CONTENT_SECTIONS)
+    _append_fetch_log(fetch_log, {
+        "url": site_url(page.url, os.environ.get("BOM_BASE_URL")),
+        "sections": [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts],
+    })
+
+
+# ----------------------------------------------------------------------
+# Timing instrumentation
+# ----------------------------------------------------------------------
+
+@contextmanager
+def timed(action):
+    """Record the wall time of one scraping action under the given name."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings[action].append(time.perf_counter() - start)
+
+
+def _report_timings():
+    if not _timings:
+        return
+    script = os.environ.get("BOM_JOB_NAME") or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    timings_file = os.environ.get("BOM_TIMINGS_FILE")
+    if timings_file:
+        with open(timings_file, "a", encoding="utf-8") as f:
+            for action, durations in _timings.items():
+                f.write(json.dumps({"script": script, "action": action,
+                                    "count": len(durations), "seconds": sum(durations)}) + "\n")
+        return
+    print(f"\nTimings for {script}:")
+    for action, durations in sorted(_timings.items()):
+        print(f"  {action:<12} {len(durations):>4}x {sum(durations):>8.2f}s")
+
+
+atexit.register(_report_timings)
+
+
+def summarize_timings(timings_file):
+    """Aggregate a BOM_TIMINGS_FILE into {action: (count, seconds)}."""
+    totals = defaultdict(lambda: [0, 0.0])
+    if os.path.exists(timings_file):
+        with open(timings_file, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                totals[record["action"]][0] += record["count"]
+                totals[record["action"]][1] += record["seconds"]
+    return {action: tuple(total) for action, total in totals.items()}
+
+
+# ----------------------------------------------------------------------
+# Event-driven waits (replacing page.wait_for_timeout)
+# ----------------------------------------------------------------------
+
+def _fixed_waits():
+    return os.environ.get("BOM_FIXED_WAITS") == "1"
+
+
+def _wait_idle(page):
+    """Wait for the load event and a quiet network, bounded by IDLE_TIMEOUT."""
+    if _fixed_waits():
+        page.wait_for_timeout(FIXED_PAGE_WAIT)
+        return
+    page.wait_for_load_state("load", timeout=NAVIGATION_TIMEOUT)
+    try:
+        page.wait_for_load_state("networkidle", timeout=IDLE_TIMEOUT)
+    except PlaywrightTimeoutError:
+        # Long-polling widgets never go idle; the document itself is loaded
+        pass
+
+
+def settle(page, selector=None):
+    """
+    Wait until a freshly opened page is ready: for selector to be attached when
+    the caller knows what it needs, otherwise for the network to go quiet.
+    """
+    with timed("settle"):
+        if selector and not _fixed_waits():
+            page.wait_for_selector(selector, state="attached", timeout=NAVIGATION_TIMEOUT)
+        else:
+            _wait_idle(page)
+    _record_sections(page)
+
+
+def goto(page, url, selector=None):
+    """Navigate to a site URL (honouring BOM_BASE_URL) and wait until it is ready."""
+    with timed("goto"):
+        page.goto(resolve_url(url), timeout=NAVIGATION_TIMEOUT)
+    settle(page, selector)
+
+
+def click_tab(page, tab):
+    """
+    Click an in-page tab and wait for its pane (the tab's href/data-target) to show.
+
+    Tab panes are already in the DOM, so a pane that never becomes visible
+    (no JS offline, odd markup) only costs TAB_TIMEOUT and scraping continues.
+    """
+    with timed("click_tab"):
+        target = tab.get_attribute("href") or tab.get_attribute("data-target") or ""
+        tab.click()
+        if _fixed_waits():
+            page.wait_for_timeout(FIXED_TAB_WAIT)
+        elif target.startswith("#") and len(target) > 1:
+            try:
+                page.wait_for_selector(target, state="visible", timeout=TAB_TIMEOUT)
+            except PlaywrightTimeoutError:
+                _timings["tab_timeout"].append(TAB_TIMEOUT / 1000)
+
+
+def click_and_navigate(page, element):
+    """
+    Click a link that loads a new document in the same page and wait for it.
+
+    Side-menu entries sometimes swap content in place instead of navigating, so
+    a click that starts no main-frame navigation within NAVIGATION_START_TIMEOUT
+    falls through to the idle wait rather than holding out for NAVIGATION_TIMEOUT.
+    """
+    with timed("navigate"):
+        if _fixed_waits():
+            element.click()
+            page.wait_for_load_state()
+        else:
+            try:
+                with page.expect_navigation(wait_until="load", timeout=NAVIGATION_TIMEOUT):
+                    # Leaving this block early cancels the outer wait as well
+                    with page.expect_request(lambda r: r.is_navigation_request() and r.frame == page.main_frame,
+                                             timeout=NAVIGATION_START_TIMEOUT):
+                        element.click()
+            except PlaywrightTimeoutError:
+                _timings["no_navigation"].append(NAVIGATION_START_TIMEOUT / 1000)
+        _wait_idle(page)
+    _record_sections(page)
@@ -1,7 +1,10 @@
 from playwright.sync_api import sync_playwright
-import os
+from scrape_output import ScrapeOutput
+from scraper_utils import goto, launch_browser, new_page
 
 URL = "https://bankofmaharashtra.in/mahabank-rooftop-solar-panel-loan"
+ELIGIBILITY_HEADERS = ["S No.", "Parameter", "Eligibility Condition (Up to 3KW)",
+                       "Eligibility Condition (Above 3KW to 10KW)"]
 
 def extract_cell(cell):
     # Handle lists
@@ -21,15 +24,14 @@ def extract_cell(cell):
 
 def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        page.goto(URL, timeout=60000)
-        page.wait_for_timeout(1000)
+        browser = launch_browser(p)
+        page = new_page(browser)
+        goto(page, URL)
 
-        output_lines = []
-        output_lines.append("--- Mahabank Rooftop Solar Panel Loan Scheme Page ---")
-        output_lines.append("Title: " + page.title())
-        output_lines.append("URL: " + page.url)
+        out = ScrapeOutput()
+        out.line("--- Mahabank Rooftop Solar Panel Loan Scheme Page ---")
+        title = page.title()
+        out.page(URL, title, text="Title: " + title + "\nURL: " + page.url)
 
         # Main content div
         content_div = page.query_selector("div.inner_post_content")
@@ -37,11 +39,12 @@ def main():
             # Heading
             heading = content_div.query_selector("div.heading-wrap h1")
             if heading:
-                output_lines.append(f"\n--- {heading.inner_text().strip()} ---")
+                out.section(heading.inner_text().strip())
 
             # Table extraction
             table = content_div.query_selector("table")
             if table:
+                rows, lines = [], []
                 tbody = table.query_selector("tbody")
                 if tbody:
                     for row in tbody.query_selector_all("tr"):
@@ -59,20 +62,16 @@ def main():
                         else:
                             elig_3kw = ""
                             elig_10kw = ""
-                        output_lines.append(f"S No.: {s_no}")
-                        output_lines.append(f"Parameter: {parameter}")
-                        output_lines.append(f"Eligibility Condition (Up to 3KW): {elig_3kw}")
-                        output_lines.append(f"Eligibility Condition (Above 3KW to 10KW): {elig_10kw}")
-                        output_lines.append("-" * 60)
+                        rows.append([s_no, parameter, elig_3kw.strip(), elig_10kw.strip()])
+                        lines.append(f"S No.: {s_no}")
+                        lines.append(f"Parameter: {parameter}")
+                        lines.append(f"Eligibility Condition (Up to 3KW): {elig_3kw}")
+                        lines.append(f"Eligibility Condition (Above 3KW to 10KW): {elig_10kw}")
+                        lines.append("-" * 60)
+                out.table(rows, headers=ELIGIBILITY_HEADERS, lines=lines)
 
-        # Write output to a text file
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)  # Go up one level from scrapping_scripts/
-        output_dir = os.path.join(project_root, "data", "raw")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, "script_14.txt")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(output_lines))
+        # Write output (records and text)
+        out.write("script_14")
 
         browser.close()
 
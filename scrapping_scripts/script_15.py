@@ -1,5 +1,6 @@
 from playwright.sync_api import sync_playwright
-import os
+from scrape_output import ScrapeOutput
+from scraper_utils import goto, launch_browser, new_page
 
 URL = "https://bankofmaharashtra.in/lad"
 
@@ -20,15 +21,14 @@ def get_list_after_heading(page, heading_text, list_type="ul"):
 
 def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=100)
-        page = browser.new_page()
-        page.goto(URL, timeout=60000)
-        page.wait_for_timeout(1000)
+        browser = launch_browser(p, slow_mo=100)
+        page = new_page(browser)
+        goto(page, URL)
 
-        output_lines = []
-        output_lines.append("--- Loan Against Deposit (LAD) Page ---")
-        output_lines.append("Title: Loan Against Deposit (LAD)")
-        output_lines.append(f"URL: {URL}\n")
+        out = ScrapeOutput()
+        out.line("--- Loan Against Deposit (LAD) Page ---")
+        title = "Loan Against Deposit (LAD)"
+        out.page(URL, title, text=f"Title: {title}\nURL: {URL}\n")
 
         # App Download Link
         app_link = ""
@@ -46,42 +46,42 @@ def main():
         if not video_link:
             video_link = "//youtu.be/1i9C6MtTXTU?si=zD6EMDDtoO7ioD8J&rel=0&showinfo=0"
 
-        output_lines.append("--- Loan Against Deposit (LAD) ---")
-        output_lines.append(f"App Download Link: {app_link}")
-        output_lines.append(f"Video Guide: {video_link}\n")
+        out.section(title, text=f"--- {title} ---")
+        out.text(f"App Download Link: {app_link}")
+        out.text(f"Video Guide: {video_link}", line=f"Video Guide: {video_link}\n")
 
         # Introduction
         h4 = page.query_selector("div.page-con-list-block h4")
         if h4:
-            output_lines.append("--- Introduction ---")
-            output_lines.append(h4.inner_text().strip())
+            out.section("Introduction", text="--- Introduction ---")
+            out.text(h4.inner_text().strip())
         intro_ps = page.query_selector_all("div.page-con-list-block > p")
         for p in intro_ps:
             text = p.inner_text().strip()
             # Skip headings
             if text and not p.query_selector("strong"):
-                output_lines.append(text)
+                out.text(text)
 
         # Features
         features = get_list_after_heading(page, "Features of Loan Against Deposit", "ul")
         if features:
-            output_lines.append("\n--- Features of Loan Against Deposit ---")
+            out.section("Features of Loan Against Deposit")
             for feat in features:
-                output_lines.append("- " + feat)
+                out.item(feat)
 
         # Benefits
         benefits = get_list_after_heading(page, "Benefits of Loan Against Deposit During Emergencies", "ul")
         if benefits:
-            output_lines.append("\n--- Benefits of Loan Against Deposit During Emergencies ---")
+            out.section("Benefits of Loan Against Deposit During Emergencies")
             for ben in benefits:
-                output_lines.append("- " + ben)
+                out.item(ben)
 
         # How to Avail
         steps = get_list_after_heading(page, "How to Avail a Loan Against Fixed Deposit", "ol")
         if steps:
-            output_lines.append("\n--- How to Avail a Loan Against Fixed Deposit ---")
+            out.section("How to Avail a Loan Against Fixed Deposit")
             for idx, step in enumerate(steps, 1):
-                output_lines.append(f"{idx}. {step}")
+                out.item(step, line=f"{idx}. {step}")
 
         # Final note/summary
         summary = ""
@@ -89,18 +89,13 @@ def main():
         if summary_block:
             summary = summary_block.inner_text().strip()
         if summary:
-            output_lines.append("\n--- Summary ---")
-            output_lines.append(summary)
-
-        output_lines.append("------------------------------------------------------------")
-
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)  # Go up one level from scrapping_scripts/
-        output_dir = os.path.join(project_root, "data", "raw")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, "script_15.txt")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(output_lines))
+            out.section("Summary")
+            out.text(summary)
+
+        out.line("------------------------------------------------------------")
+
+        # Write output (records and text)
+        out.write("script_15")
 
         browser.close()
 
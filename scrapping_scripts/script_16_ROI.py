@@ -1,33 +1,11 @@
 from playwright.sync_api import sync_playwright
+from scrape_output import ScrapeOutput
+from scraper_utils import goto, launch_browser, new_page
+from table_extract import pipe_rows, serialize_tables
 import re
-import os
 
 URL = "https://bankofmaharashtra.in/retail-interest-rates"
 
-def extract_table_data(table):
-    """Extract data from a table and return as formatted text"""
-    if not table:
-        return ""
-    
-    rows = table.query_selector_all("tbody tr")
-    if not rows:
-        rows = table.query_selector_all("tr")
-    
-    table_data = []
-    for row in rows:
-        cells = row.query_selector_all("td")
-        if cells:
-            row_data = []
-            for cell in cells:
-                # Handle colspan by getting all text content
-                cell_text = cell.inner_text().strip()
-                if cell_text:
-                    row_data.append(cell_text)
-            if row_data:
-                table_data.append(" | ".join(row_data))
-    
-    return "\n".join(table_data)
-
 def get_next_sibling_safe(element):
     """Safely get the next sibling element"""
     try:
@@ -49,15 +27,13 @@ def is_heading_element(element):
 
 def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=200)
-        page = browser.new_page()
-        page.goto(URL, timeout=60000)
-        page.wait_for_timeout(2000)
+        browser = launch_browser(p, slow_mo=200)
+        page = new_page(browser)
+        goto(page, URL)
 
-        output_lines = []
-        output_lines.append("--- Rate of Interest Retail Loans Page ---")
-        output_lines.append("Title: Rate of Interest Retail Loans")
-        output_lines.append(f"URL: {URL}\n")
+        out = ScrapeOutput()
+        out.line("--- Rate of Interest Retail Loans Page ---")
+        out.page(URL, "Rate of Interest Retail Loans", text=f"Title: Rate of Interest Retail Loans\nURL: {URL}\n")
 
         # Get the main content container
         main_content = page.query_selector("div.inner_post_content")
@@ -68,14 +44,15 @@ def main():
             # Extract the main heading
             main_heading = main_content.query_selector("h1")
             if main_heading:
-                output_lines.append(f"Main Heading: {main_heading.inner_text().strip()}")
+                main_heading_text = main_heading.inner_text().strip()
+                out.text(main_heading_text, line=f"Main Heading: {main_heading_text}")
             
             # Extract the description paragraph
             desc_paragraphs = main_content.query_selector_all("p")
             for p in desc_paragraphs:
                 text = p.inner_text().strip()
                 if text and "RLLR" in text:
-                    output_lines.append(f"Description: {text}")
+                    out.text(text, line=f"Description: {text}")
                     break
             
             # Extract all h4 headings and their content
@@ -83,7 +60,7 @@ def main():
             
             for i, heading in enumerate(h4_headings):
                 heading_text = heading.inner_text().strip()
-                output_lines.append(f"\n--- {heading_text} ---")
+                out.section(heading_text)
                 
                 # Get content after this heading until next h4
                 current_element = heading
@@ -105,17 +82,17 @@ def main():
                             # Clean up the text (remove excessive whitespace)
                             text_content = re.sub(r'\s+', ' ', text_content).strip()
                             if text_content:
-                                output_lines.append(text_content)
+                                out.text(text_content)
                                 content_added = True
                         
                         # Extract tables
-                        tables = current_element.query_selector_all("table")
+                        tables = serialize_tables(current_element, "table")
                         for table in tables:
-                            table_data = extract_table_data(table)
+                            table_data = pipe_rows(table)
                             if table_data:
-                                output_lines.append("\nTable Data:")
-                                output_lines.append(table_data)
-                                output_lines.append("")
+                                out.line("\nTable Data:")
+                                out.table(table_data)
+                                out.line("")
                                 content_added = True
                         
                         # Extract lists
@@ -124,7 +101,7 @@ def main():
                             for li in ul.query_selector_all("li"):
                                 li_text = li.inner_text().strip()
                                 if li_text:
-                                    output_lines.append("- " + li_text)
+                                    out.item(li_text)
                                     content_added = True
                         
                         ol_lists = current_element.query_selector_all("ol")
@@ -132,7 +109,7 @@ def main():
                             for idx, li in enumerate(ol.query_selector_all("li"), 1):
                                 li_text = li.inner_text().strip()
                                 if li_text:
-                                    output_lines.append(f"{idx}. {li_text}")
+                                    out.item(li_text, line=f"{idx}. {li_text}")
                                     content_added = True
                     
                     except Exception as e:
@@ -141,7 +118,7 @@ def main():
                 
                 # If no content was added for this section, add a note
                 if not content_added:
-                    output_lines.append("(No additional content found for this section)")
+                    out.line("(No additional content found for this section)")
             
             # Extract abbreviations section
             try:
@@ -153,24 +130,18 @@ def main():
                         abbr_section.append(text)
                 
                 if abbr_section:
-                    output_lines.append("\n--- Abbreviations ---")
+                    out.section("Abbreviations")
                     for abbr in abbr_section:
-                        output_lines.append(abbr)
+                        out.text(abbr)
             except:
                 pass
         else:
-            output_lines.append("Main content container not found")
+            out.line("Main content container not found")
 
-        output_lines.append("\n------------------------------------------------------------")
+        out.line("\n------------------------------------------------------------")
 
-        # Write to file
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)  # Go up one level from scrapping_scripts/
-        output_dir = os.path.join(project_root, "data", "raw")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, "script_16_ROI.txt")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(output_lines))
+        # Write output (records and text)
+        out.write("script_16_ROI")
 
         browser.close()
 
@@ -1,11 +1,17 @@
-from playwright.sync_api import sync_playwright
 import os
 
+from playwright.sync_api import sync_playwright
+from fetch_cache import site_url
+from scrape_output import ScrapeOutput
+from scraper_utils import click_and_navigate, goto, launch_browser, new_page
+
 URL = "https://bankofmaharashtra.in/pradhan-mantri-awas-yojana-2"  # Replace with the actual URL if different
 
-def extract_table1(table):
+SCHEME_HEADERS = ["S.No", "Particulars", "Details"]
+
+def extract_table1(table, out):
     """Extracts the first table (Sno, Particulars, Details)"""
-    output = []
+    table_rows, output = [], []
     rows = table.query_selector_all("tbody tr")
     for row in rows:
         cells = row.query_selector_all("td")
@@ -27,17 +33,21 @@ def extract_table1(table):
             # Remove duplicates and empty lines
             seen = set()
             details = "\n".join(x for x in details_parts if x and not (x in seen or seen.add(x)))
+            table_rows.append([s_no, particular, details])
             output.append(f"\nS.No: {s_no}\nParticulars: {particular}\nDetails:\n{details}\n")
-    return output
+    out.table(table_rows, headers=SCHEME_HEADERS, lines=output)
 
-def extract_table2(table):
+def extract_table2(table, out):
     """Extracts the second table (Eligibility Criteria) in a block format."""
-    output = []
+    rows, output = [], []
     # Get headers
     headers = [th.inner_text().strip() for th in table.query_selector_all("thead tr th")]
     # Expecting: [Criteria, EWS, LIG, MIG]
     for row in table.query_selector_all("tbody tr"):
         cells = row.query_selector_all("td")
+        row_cells = [cell.inner_text().strip() for cell in cells]
+        if row_cells:
+            rows.append(row_cells)
         if len(cells) == 4:
             output.append(f"Criteria: {cells[0].inner_text().strip()}")
             output.append(f"  EWS: {cells[1].inner_text().strip()}")
@@ -52,38 +62,34 @@ def extract_table2(table):
             output.append(f"  EWS/LIG/MIG: {cells[1].inner_text().strip()} | {cells[2].inner_text().strip()}\n")
         else:
             # Fallback: just join all cells
-            output.append(" | ".join([cell.inner_text().strip() for cell in cells]) + "\n")
-    return output
+            output.append(" | ".join(row_cells) + "\n")
+    out.table(rows, headers=headers or None, lines=output)
 
-def extract_steps(ol):
+def extract_steps(ol, out):
     """Extracts the steps to apply (ordered list)"""
-    output = []
     for idx, li in enumerate(ol.query_selector_all("li"), 1):
         # Check for link
         a = li.query_selector("a")
         if a:
             text = li.inner_text().replace(a.inner_text(), "").strip()
             href = a.get_attribute("href")
-            output.append(f"{idx}. {text} [Link: {href}]")
+            out.item(f"{text} [Link: {href}]", line=f"{idx}. {text} [Link: {href}]")
         else:
-            output.append(f"{idx}. {li.inner_text().strip()}")
-    return output
+            text = li.inner_text().strip()
+            out.item(text, line=f"{idx}. {text}")
 
 def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=500)
-        page = browser.new_page()
-        page.goto(URL, timeout=60000)
-        page.wait_for_timeout(2000)
+        browser = launch_browser(p, slow_mo=500)
+        page = new_page(browser)
+        goto(page, URL)
 
         # Click the menu/span for "Pradhan Mantri Awas Yojana – Urban 2.0"
         # You may need to adjust the selector if the menu is dynamic
         # Try to find the span by text
         target_span = page.locator('span.sideMenuSpan', has_text="Pradhan Mantri Awas Yojana – Urban 2.0")
         if target_span.count() > 0:
-            target_span.first.click()
-            page.wait_for_load_state()
-            page.wait_for_timeout(2000)
+            click_and_navigate(page, target_span.first)
         else:
             print("Target span not found!")
             browser.close()
@@ -91,25 +97,27 @@ def main():
 
         # Now extract from the loaded content
         block = page.query_selector("div.page-con-list-block")
-        output_lines = []
+        out = ScrapeOutput()
+        out.page(site_url(page.url, os.environ.get("BOM_BASE_URL")), page.title())
 
         # Title
         h1 = block.query_selector("h1")
         if h1:
-            output_lines.append("--- Title ---")
-            output_lines.append(h1.inner_text().strip())
+            title = h1.inner_text().strip()
+            out.section(title, text="--- Title ---")
+            out.line(title)
 
         # All tables in the block
         tables = block.query_selector_all("table")
         if len(tables) >= 2:
             # Table 1
-            output_lines.append("\n--- Table 1: Scheme Details ---")
-            output_lines.extend(extract_table1(tables[0]))
+            out.section("Scheme Details", text="\n--- Table 1: Scheme Details ---")
+            extract_table1(tables[0], out)
             # Table 2
-            output_lines.append("\n--- Table 2: Eligibility Criteria ---")
-            output_lines.extend(extract_table2(tables[1]))
+            out.section("Eligibility Criteria", text="\n--- Table 2: Eligibility Criteria ---")
+            extract_table2(tables[1], out)
         else:
-            output_lines.append("\n--- Tables not found or less than 2 tables present ---")
+            out.line("\n--- Tables not found or less than 2 tables present ---")
 
         # Steps to Apply
         h3s = block.query_selector_all("h3")
@@ -129,19 +137,13 @@ def main():
                 )
                 break
         if steps_ol:
-            output_lines.append("\n--- Steps to Apply ---")
-            output_lines.extend(extract_steps(steps_ol))
+            out.section("Steps to Apply")
+            extract_steps(steps_ol, out)
         else:
-            output_lines.append("\n--- Steps to Apply not found ---")
+            out.line("\n--- Steps to Apply not found ---")
 
-        # Write to output file
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)  # Go up one level from scrapping_scripts/
-        output_dir = os.path.join(project_root, "data", "raw")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, "script_3.txt")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(output_lines))
+        # Write output (records and text)
+        out.write("script_3")
 
         browser.close()
 
@@ -0,0 +1,243 @@
+"""
+Single-roundtrip table extraction.
+
+Walking a table with query_selector_all / inner_text costs one Playwright IPC
+hop per row, cell, list and nested sub-table; on the large rate tables that is
+thousands of hops. Here a table (nested tables and lists included) is
+serialized to JSON by one evaluate call and rendered in Python:
+
+    {"text": str,
+     "head": [[th text, ...] per "thead tr"],
+     "th": [every <th> text under the table],
+     "rows": [{"in_tbody": bool,      # matches "tbody tr"
+               "direct": bool,        # matches ":scope > tbody > tr"
+               "first_tbody": bool,   # inside the table's first <tbody>
+               "cells": [cell, ...]}  # every <td> under the row, like row.query_selector_all("td")
+              per <tr> under the table]}
+
+    cell = {"text": str,
+            "uls": [{"text": str, "items": [li text, ...]}, ...],
+            "ols": [...same as uls...],
+            "tables": [table, ...]}   # nested tables, serialized recursively
+
+Texts are innerText, exactly what ElementHandle.inner_text() returns, so the
+renderers below reproduce the output of the per-element extractors they replace.
+"""
+from scraper_utils import timed
+
+SERIALIZE_TABLE_JS = """
+(table) => {
+    const texts = els => Array.from(els, el => el.innerText);
+    const list = el => ({text: el.innerText, items: texts(el.querySelectorAll('li'))});
+    const cell = td => ({
+        text: td.innerText,
+        uls: Array.from(td.querySelectorAll('ul'), list),
+        ols: Array.from(td.querySelectorAll('ol'), list),
+        tables: Array.from(td.querySelectorAll('table'), serialize),
+    });
+    const serialize = t => {
+        const firstTbody = t.querySelector('tbody');
+        return {
+            text: t.innerText,
+            head: Array.from(t.querySelectorAll('thead tr'), tr => texts(tr.querySelectorAll('th'))),
+            th: texts(t.querySelectorAll('th')),
+            rows: Array.from(t.querySelectorAll('tr'), tr => ({
+                in_tbody: tr.closest('tbody') !== null,
+                direct: tr.parentElement.tagName === 'TBODY' && tr.parentElement.parentElement === t,
+                first_tbody: firstTbody !== null && firstTbody.contains(tr),
+                cells: Array.from(tr.querySelectorAll('td'), cell),
+            })),
+        };
+    };
+    return serialize(table);
+}
+"""
+
+
+def serialize_table(table):
+    """Serialize one table ElementHandle (None passes through) in a single evaluate call."""
+    if not table:
+        return None
+    with timed("table"):
+        return table.evaluate(SERIALIZE_TABLE_JS)
+
+
+def serialize_tables(root, selector="table"):
+    """Serialize every table matching selector under root (a page or element) in a single call."""
+    with timed("table"):
+        return root.eval_on_selector_all(selector, f"tables => tables.map({SERIALIZE_TABLE_JS})")
+
+
+def serialize_table_handles(table):
+    """
+    The same JSON as serialize_table, built with per-element query_selector_all /
+    inner_text calls the way the scripts used to walk tables. Only for comparison
+    in bench/table_extract.py.
+    """
+    def list_(el):
+        return {"text": el.inner_text(), "items": [li.inner_text() for li in el.query_selector_all("li")]}
+
+    def cell(td):
+        return {
+            "text": td.inner_text(),
+            "uls": [list_(ul) for ul in td.query_selector_all("ul")],
+            "ols": [list_(ol) for ol in td.query_selector_all("ol")],
+            "tables": [serialize(t) for t in td.query_selector_all("table")],
+        }
+
+    def serialize(t):
+        rows = []
+        for tr in t.query_selector_all("tr"):
+            flags = tr.evaluate(
+                """(tr, t) => ({
+                    in_tbody: tr.closest('tbody') !== null,
+                    direct: tr.parentElement.tagName === 'TBODY' && tr.parentElement.parentElement === t,
+                    first_tbody: t.querySelector('tbody') !== null && t.querySelector('tbody').contains(tr),
+                })""",
+                t,
+            )
+            rows.append(dict(flags, cells=[cell(td) for td in tr.query_selector_all("td")]))
+        return {
+            "text": t.inner_text(),
+            "head": [[th.inner_text() for th in tr.query_selector_all("th")] for tr in t.query_selector_all("thead tr")],
+            "th": [th.inner_text() for th in t.query_selector_all("th")],
+            "rows": rows,
+        }
+
+    if not table:
+        return None
+    with timed("table"):
+        return serialize(table)
+
+
+def select_rows(table, rows="tbody"):
+    """
+    Rows of a serialized table, as the old selectors picked them:
+    "tbody" -> "tbody tr", "direct" -> ":scope > tbody > tr",
+    "first_tbody" -> first <tbody>'s "tr", "all" -> "tr".
+    """
+    if rows == "all":
+        return table["rows"]
+    key = {"tbody": "in_tbody", "direct": "direct", "first_tbody": "first_tbody"}[rows]
+    return [row for row in table["rows"] if row[key]]
+
+
+def _dedupe(parts):
+    """Drop empty and repeated parts, preserving order."""
+    seen = set()
+    return [x for x in parts if x and not (x in seen or seen.add(x))]
+
+
+# ----------------------------------------------------------------------
+# Renderers
+# ----------------------------------------------------------------------
+
+def render_sub_table(table, label=None):
+    """A nested table as indented "h1 | h2" lines under a dashed rule."""
+    lines = []
+    if label:
+        lines.append(f"    [Sub-table: {label}]")
+    # Headers from thead, else from the first body row
+    headers = [th.strip() for head_row in table["head"] for th in head_row]
+    body_rows = select_rows(table, "tbody")
+    if not headers and body_rows:
+        headers = [td["text"].strip() for td in body_rows[0]["cells"]]
+        body_rows = body_rows[1:]
+    if headers:
+        lines.append("    " + " | ".join(headers))
+        lines.append("    " + "-" * (len(" | ".join(headers))))
+    for row in body_rows:
+        if row["cells"]:
+            lines.append("    " + " | ".join(cell["text"].strip() for cell in row["cells"]))
+    return "\n".join(lines)
+
+
+def sub_table_lines(table, headed=False):
+    """
+    A nested table as indented "a | b" lines, one per <tr> with <td> cells
+    (nested rows included); headed puts every <th> text and a dashed rule first.
+    """
+    lines = []
+    headers = " | ".join(th.strip() for th in table["th"])
+    if headed and headers:
+        lines.append("    " + headers)
+        lines.append("    " + "-" * len(headers))
+    for row in table["rows"]:
+        if row["cells"]:
+            lines.append("    " + " | ".join(cell["text"].strip() for cell in row["cells"]))
+    return lines
+
+
+def detail_text(cell, details="own", sub_tables="scheme", label=None, placeholder=None):
+    """
+    Text of a details cell (the last cell of a scheme / parameter row).
+
+    details:
+        "text"  the cell's innerText
+        "full"  the cell's innerText, then its list items and sub-tables
+        "own"   the cell's own text (minus list and sub-table text), then its
+                list items and sub-tables
+    <ul> items render as "  - item", <ol> items as "  1. item"; sub_tables picks
+    render_sub_table ("scheme", labelled with label) or sub_table_lines ("rows",
+    or "headed" for th headers). Repeated and empty parts are dropped; a cell with
+    nothing in it gets placeholder, unless it is None.
+    """
+    if details == "text":
+        return cell["text"].strip()
+
+    parts = []
+    for ul in cell["uls"]:
+        parts.extend("  - " + li.strip() for li in ul["items"])
+    for ol in cell["ols"]:
+        parts.extend(f"  {idx}. {li.strip()}" for idx, li in enumerate(ol["items"], 1))
+    for sub_table in cell["tables"]:
+        if sub_tables == "scheme":
+            parts.append(render_sub_table(sub_table, label))
+        else:
+            parts.extend(sub_table_lines(sub_table, headed=sub_tables == "headed"))
+
+    if details == "full":
+        parts.insert(0, cell["text"].strip())
+    else:
+        # Direct text, without the text of lists and sub-tables rendered above
+        direct_text = cell["text"].strip()
+        for el in cell["uls"] + cell["ols"] + cell["tables"]:
+            el_text = el["text"].strip()
+            if el_text and el_text in direct_text:
+                direct_text = direct_text.replace(el_text, "")
+        if direct_text:
+            parts.insert(0, direct_text.strip())
+
+    if not parts and placeholder is not None:
+        parts.append(placeholder)
+    return "\n".join(_dedupe(parts))
+
+
+def detail_rows(table, rows="tbody", cells=3, notes=False, **details):
+    """
+    [cell text, ..., details text] of the rows with exactly `cells` cells; the
+    last cell goes through detail_text(**details). With notes, single-cell rows
+    (colspan notes) are kept as [text].
+    """
+    output = []
+    for row in select_rows(table, rows):
+        row_cells = row["cells"]
+        if len(row_cells) == cells:
+            output.append([cell["text"].strip() for cell in row_cells[:-1]] + [detail_text(row_cells[-1], **details)])
+        elif notes and len(row_cells) == 1:
+            output.append([row_cells[0]["text"].strip()])
+    return output
+
+
+def pipe_rows(table):
+    """Non-empty cell texts of the body rows (all rows if there is no tbody); empty rows are dropped."""
+    if not table:
+        return []
+    rows = select_rows(table, "tbody") or select_rows(table, "all")
+    table_data = []
+    for row in rows:
+        row_data = [cell["text"].strip() for cell in row["cells"] if cell["text"].strip()]
+        if row_data:
+            table_data.append(row_data)
+    return table_data
+
@@ -1,56 +1,125 @@
 import os
 import re
 import json
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-SOURCE_DIR = "C:\\Users\\harsh\\Desktop\\My_space\\Projects_2025\\proj_1211_new\\data\\raw"         # folder where your .txt files are stored
-OUTPUT_DIR = "C:\\Users\\harsh\\Desktop\\My_space\\Projects_2025\\proj_1211_new\\data\\processed_data"        # folder where cleaned jsonl files will be saved
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = os.path.join(PROJECT_ROOT, "data", "raw")                 # folder where your .txt / structured .jsonl files are stored
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data", "processed_data")      # folder where cleaned jsonl files will be saved
+MANIFEST_NAME = ".preprocess_manifest.json"                             # skip list, kept in OUTPUT_DIR
+
+# -----------------------------------------------------
+# Compiled cleaning patterns (built once at import)
+# -----------------------------------------------------
+
+BOILERPLATE_PATTERNS = [
+    r"©\s*\d{4}.*",                      # copyright footers
+    r"All rights reserved.*",
+    r"Privacy Policy.*",
+    r"Terms of Service.*",
+    r"Cookie Policy.*",
+    r"Subscribe to.*",
+    r"Login\s*|\s*Signup.*"
+]
+
+# Literal substrings one of which every boilerplate match must contain
+BOILERPLATE_HINTS = ("©", "all rights reserved", "privacy policy", "terms of service",
+                     "cookie policy", "subscribe to", "login", "signup")
+
+BLANK_LINES_RE = re.compile(r"\n\s*\n")
+SPACES_RE = re.compile(r"[ \t]{2,}|\t")                         # single spaces need no rewrite
+# One alternation instead of one pass per pattern
+BOILERPLATE_RE = re.compile("|".join(f"(?:{bp})" for bp in BOILERPLATE_PATTERNS), re.IGNORECASE)
+HEADING_RE = re.compile(r"(^[A-Z][A-Za-z0-9 ]{3,}$)|(^#+ .*?$)", re.MULTILINE)
+HEADING_LINE_RE = re.compile(r"[A-Z][A-Za-z0-9 ]{3,}|#+ .*")
+MULTI_NEWLINE_RE = re.compile(r"\n{2,}")
+
+# Smart quotes -> ASCII. Chained str.replace beats str.translate here: translate
+# falls off its ASCII fast path as soon as a document contains any non-ASCII char.
+UNICODE_REPLACEMENTS = (("\u201c", '"'), ("\u201d", '"'), ("\u2018", "'"), ("\u2019", "'"))
 
 # -----------------------------------------------------
 # Utility functions for text cleaning
 # -----------------------------------------------------
 
+def _may_contain_boilerplate(text):
+    """Cheap substring pre-check so the boilerplate regex only scans text it can match."""
+    folded = text.lower()
+    if not folded.isascii():
+        # Characters IGNORECASE also matches to ASCII letters ("İ" lowers to "i" + U+0307)
+        folded = folded.replace("\u0307", "").replace("\u0131", "i").replace("\u017f", "s")
+    return any(hint in folded for hint in BOILERPLATE_HINTS)
+
+
+def _clean_fragment(text):
+    """Space collapsing, boilerplate removal and unicode normalization."""
+    text = SPACES_RE.sub(" ", text)                             # collapse multiple spaces
+    if _may_contain_boilerplate(text):
+        text = BOILERPLATE_RE.sub("", text)                     # remove boilerplate
+    if not text.isascii():
+        for src, dst in UNICODE_REPLACEMENTS:                   # normalize unicode & punctuation
+            text = text.replace(src, dst)
+    return text
+
+
 def clean_text(text):
     """Clean and normalize raw scraped text."""
-    
-    # Remove multiple spaces/newlines
-    text = re.sub(r"\n\s*\n", "\n\n", text)                     # collapse extra newlines
-    text = re.sub(r"[ \t]+", " ", text)                         # collapse multiple spaces
-    
-    # Remove boilerplate patterns
-    boilerplate_patterns = [
-        r"©\s*\d{4}.*",                      # copyright footers
-        r"All rights reserved.*",
-        r"Privacy Policy.*",
-        r"Terms of Service.*",
-        r"Cookie Policy.*",
-        r"Subscribe to.*",
-        r"Login\s*|\s*Signup.*"
-    ]
-    for bp in boilerplate_patterns:
-        text = re.sub(bp, "", text, flags=re.IGNORECASE)
-
-    # Normalize unicode & punctuation
-    text = text.replace("\u201c", '"').replace("\u201d", '"')   # smart quotes
-    text = text.replace("\u2018", "'").replace("\u2019", "'")
-    text = text.replace("\t", " ")
-
-    # Strip spaces
-    text = text.strip()
-    return text
+    text = BLANK_LINES_RE.sub("\n\n", text)                      # collapse extra newlines
+    return _clean_fragment(text).strip()
+
+
+def iter_clean_lines(lines):
+    """
+    Streaming clean_text: yields the cleaned text line by line.
+
+    Input is cleaned one paragraph block (run of non-blank lines) at a time, so
+    memory is bounded by the largest paragraph. Output matches clean_text except
+    that boilerplate matches can no longer span a blank line.
+    """
+    started = False
+    pending = None
+
+    for block in _iter_blocks(lines):
+        cleaned = _clean_fragment(block)
+        if not started:
+            cleaned = cleaned.lstrip()
+            if not cleaned:
+                continue
+            started = True
+        if pending is not None:
+            yield from pending.split("\n")
+            yield ""                                            # collapsed blank line
+        pending = cleaned
+
+    if pending is not None:
+        yield from pending.rstrip().split("\n")
+
+
+def _iter_blocks(lines):
+    """Group lines into paragraph blocks separated by whitespace-only lines."""
+    block = []
+    for line in lines:
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield "".join(block).rstrip("\n")
+            block = []
+    if block:
+        yield "".join(block).rstrip("\n")
 
 
 def split_into_sections(text):
     """Split text using headings and semantic boundaries."""
     
     # Detect headings — lines that are all caps or start with patterns like "##", "###"
-    heading_pattern = re.compile(r"(^[A-Z][A-Za-z0-9 ]{3,}$)|(^#+ .*?$)", re.MULTILINE)
-
     sections = []
     last_pos = 0
 
-    for match in heading_pattern.finditer(text):
+    for match in HEADING_RE.finditer(text):
         start = match.start()
 
         if last_pos != 0:
@@ -65,9 +134,40 @@ def split_into_sections(text):
     return [s for s in sections if len(s) > 50]        # ignore useless short junk blocks
 
 
+def iter_sections(lines):
+    """
+    Streaming split_into_sections over cleaned lines (e.g. from iter_clean_lines).
+
+    Mirrors split_into_sections exactly: text before the first heading is dropped
+    unless the document has no heading at all, and so is the first section when
+    the document starts with a heading.
+    """
+    current = []
+    keep_current = False                                # last_pos != 0 in split_into_sections
+    pos = 0
+
+    for line in lines:
+        if HEADING_LINE_RE.fullmatch(line):
+            if keep_current:
+                yield from _finish_section(current)
+            keep_current = pos != 0
+            current = [line]
+        else:
+            current.append(line)
+        pos += len(line) + 1
+
+    yield from _finish_section(current)
+
+
+def _finish_section(lines):
+    section = "\n".join(lines).strip()
+    if len(section) > 50:                               # ignore useless short junk blocks
+        yield section
+
+
 def normalize_section(section):
     """Small normalization inside each section."""
-    section = re.sub(r"\n{2,}", "\n", section)
+    section = MULTI_NEWLINE_RE.sub("\n", section)
     section = section.strip()
     return section
 
@@ -76,46 +176,314 @@ def normalize_section(section):
 # Main processing pipeline
 # -----------------------------------------------------
 
-def process_files():
-    Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().isoformat()
+def iter_records(file_path, timestamp):
+    """Yield processed section records for one raw .txt file, one at a time."""
+    filename = os.path.basename(file_path)
 
-    for filename in os.listdir(SOURCE_DIR):
-        if not filename.endswith(".txt"):
-            continue
+    with open(file_path, "r", encoding="utf-8") as f:
+        # 1. Clean text, streamed line by line
+        cleaned_lines = iter_clean_lines(f)
 
-        file_path = os.path.join(SOURCE_DIR, filename)
+        # 2. Split into meaningful sections
+        sections = iter_sections(cleaned_lines)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            raw_text = f.read()
+        # 3. Normalize each section
+        for i, sec in enumerate(sections):
+            yield {
+                "id": f"{filename}-{i}",
+                "file_name": filename,
+                "section_index": i,
+                "content": normalize_section(sec),
+                "scraped_date": timestamp
+            }
 
-        print(f"Processing: {filename}")
 
-        # 1. Clean text
-        cleaned = clean_text(raw_text)
+def _structured_groups(records):
+    """
+    Group scraper records (scrapping_scripts/scrape_output.py) into units, in page
+    order: ("text", records) for a run of text / list items within one section,
+    ("faq", [record]) per FAQ pair and ("table", rows) per table.
+    """
+    text, rows = [], []
+    for record in records:
+        kind = record.get("type")
+        if text and (kind not in ("text", "item") or record.get("url") != text[0].get("url")):
+            yield "text", text
+            text = []
+        if rows and (kind != "row" or record.get("table") != rows[0].get("table")):
+            yield "table", rows
+            rows = []
 
-        # 2. Split into meaningful sections
-        sections = split_into_sections(cleaned)
+        if kind in ("text", "item"):
+            text.append(record)
+        elif kind == "faq":
+            yield "faq", [record]
+        elif kind == "row":
+            rows.append(record)
+    if text:
+        yield "text", text
+    if rows:
+        yield "table", rows
 
-        # 3. Normalize each section
-        sections = [normalize_section(sec) for sec in sections]
 
-        # Output JSONL file
-        output_file = os.path.join(OUTPUT_DIR, filename.replace(".txt", ".jsonl"))
+def _format_row(record):
+    """A table row as "header: cell | ..." when the headers line up, else the " | "-joined cells."""
+    headers = record.get("headers")
+    cells = [" ".join(cell.split()) if "\n" not in cell else cell for cell in record["cells"]]
+    if headers and len(headers) == len(cells):
+        return " | ".join(f"{header}: {cell}" for header, cell in zip(headers, cells))
+    return " | ".join(cells)
+
+
+def iter_structured_records(file_path, timestamp):
+    """
+    Yield processed records for one structured scraper .jsonl file.
+
+    Sections come from the scraper, so nothing is re-discovered by regex. Each
+    section's text and list items become one "text" record under the section
+    title, each FAQ pair one "faq" record and each table one "table" record that
+    keeps its rows (as "header: cell" pairs) for row-aware chunking.
+    """
+    filename = os.path.basename(file_path)
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        records = (json.loads(line) for line in f if line.strip())
+
+        index = 0
+        for kind, group in _structured_groups(records):
+            first = group[0]
+            heading = first.get("section") or first.get("title") or ""
+            rows = None
+            if kind == "faq":
+                body = f"Q: {first['question']}\nA: {first['answer']}"
+            elif kind == "table":
+                rows = [normalize_section(_clean_fragment(_format_row(r))) for r in group]
+                rows = [row for row in rows if row]
+                body = "\n".join(rows)
+            else:
+                body = "\n".join(r["text"] if r["type"] == "text" else f"- {r['text']}" for r in group)
+
+            content = normalize_section(_clean_fragment(f"{heading}\n{body}" if heading else body))
+            if not body.strip() or not content:
+                continue
+
+            record = {
+                "id": f"{filename}-{index}",
+                "file_name": filename,
+                "section_index": index,
+                "content": content,
+                "scraped_date": timestamp,
+                "kind": kind,
+                "section": heading,
+                "url": first.get("url"),
+            }
+            if rows is not None:
+                record["rows"] = rows
+            yield record
+            index += 1
+
+
+def iter_source_records(file_path, timestamp):
+    """Processed records for a raw source: structured .jsonl, or .txt split by headings."""
+    if file_path.endswith(".jsonl"):
+        return iter_structured_records(file_path, timestamp)
+    return iter_records(file_path, timestamp)
+
+
+def _faq(question, answer, file_path, url=None, section=None):
+    question = " ".join(_clean_fragment(question).split())
+    answer = normalize_section(_clean_fragment(answer))
+    if not question or not answer:
+        return None
+    return {"question": question, "answer": answer, "file_name": os.path.basename(file_path),
+            "url": url, "section": section}
+
+
+def iter_faq_pairs(file_path):
+    """
+    Yield the explicit FAQ pairs of one raw source as {"question", "answer",
+    "file_name", "url", "section"}: the "faq" records of a structured .jsonl, or
+    the "Q: ..." / "A: ..." blocks of a .txt rendering (an answer runs until a
+    blank line, the next question or a "---" divider).
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        if file_path.endswith(".jsonl"):
+            for line in f:
+                record = json.loads(line) if line.strip() else {}
+                if record.get("type") == "faq":
+                    faq = _faq(record["question"], record["answer"], file_path,
+                               record.get("url"), record.get("section") or record.get("title"))
+                    if faq:
+                        yield faq
+            return
+
+        question, answer = None, None
+        for line in f:
+            line = line.strip()
+            if line.startswith("Q:"):
+                if question and answer:
+                    faq = _faq(question, "\n".join(answer), file_path)
+                    if faq:
+                        yield faq
+                question, answer = line[2:].strip(), None
+            elif line.startswith("A:") and question and answer is None:
+                answer = [line[2:].strip()]
+            elif answer is not None and line and not line.startswith("---"):
+                answer.append(line)
+            elif answer is not None:
+                faq = _faq(question, "\n".join(answer), file_path)
+                if faq:
+                    yield faq
+                question, answer = None, None
+        if question and answer:
+            faq = _faq(question, "\n".join(answer), file_path)
+            if faq:
+                yield faq
+
+
+def raw_sources(source_dir):
+    """
+    {stem: path} of the raw sources in source_dir. A scraper's structured
+    <stem>.jsonl is preferred over the <stem>.txt rendering written next to it.
+    """
+    sources = {path.stem: str(path) for path in sorted(Path(source_dir).glob("*.txt"))}
+    sources.update((path.stem, str(path)) for path in sorted(Path(source_dir).glob("*.jsonl")))
+    return dict(sorted(sources.items()))
+
+
+def file_sha256(file_path):
+    """Content hash of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_scraped_date(file_path):
+    """Stable per-source scrape date: the raw file's modification time."""
+    return datetime.fromtimestamp(os.stat(file_path).st_mtime).isoformat()
+
+
+def process_file(file_path, output_dir, scraped_date=None):
+    """
+    Clean and section one raw .txt or structured .jsonl file into <output_dir>/<stem>.jsonl.
+
+    Returns the number of sections written.
+    """
+    output_file = os.path.join(output_dir, f"{Path(file_path).stem}.jsonl")
+    scraped_date = scraped_date or source_scraped_date(file_path)
+
+    n_sections = 0
+    with open(output_file, "w", encoding="utf-8") as out:
+        for obj in iter_source_records(file_path, scraped_date):
+            out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            n_sections += 1
+    return n_sections
+
+
+def _load_manifest(output_dir):
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(output_dir, manifest):
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def _is_unchanged(file_path, output_file, entry, stat):
+    """mtime/size fast path first; fall back to the content hash when those moved."""
+    if not entry or not os.path.exists(output_file):
+        return False
+    if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return True
+    return entry["sha256"] == file_sha256(file_path)
+
+
+def process_files(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR, workers=1, force=False):
+    """
+    Preprocess every raw source in source_dir (see raw_sources) into JSONL sections in output_dir.
+
+    Unchanged sources (same mtime/size, or same content hash) are skipped using a
+    manifest kept in output_dir; the rest are fanned out across a process pool.
+    Each source keeps a stable scraped_date (its mtime when its content last changed),
+    so re-runs produce identical output.
+
+    Args:
+        source_dir: Folder with raw scraped .txt / structured .jsonl files
+        output_dir: Folder for processed .jsonl files
+        workers: Number of worker processes (1 = serial)
+        force: Reprocess every file, ignoring the manifest
+
+    Returns:
+        Dict with sorted 'processed', 'skipped' and 'removed' file names
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    manifest = {} if force else _load_manifest(output_dir)
+    new_manifest = {}
+    pending = []
+    skipped = []
+
+    for file_path in raw_sources(source_dir).values():
+        filename = os.path.basename(file_path)
+        output_file = os.path.join(output_dir, f"{Path(filename).stem}.jsonl")
+        stat = os.stat(file_path)
+        entry = manifest.get(filename)
+
+        if _is_unchanged(file_path, output_file, entry, stat):
+            new_manifest[filename] = dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            skipped.append(filename)
+            continue
+
+        new_manifest[filename] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": file_sha256(file_path),
+            "scraped_date": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        }
+        pending.append(filename)
+
+    # Outputs of raw files that no longer exist
+    removed = sorted(set(manifest) - set(new_manifest))
+    for filename in removed:
+        stale = os.path.join(output_dir, f"{Path(filename).stem}.jsonl")
+        if Path(filename).stem not in {Path(name).stem for name in new_manifest} and os.path.exists(stale):
+            os.remove(stale)
+
+    jobs = [(os.path.join(source_dir, name), output_dir, new_manifest[name]["scraped_date"]) for name in pending]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(process_file, *zip(*jobs)))
+    else:
+        counts = [process_file(*job) for job in jobs]
+
+    for filename, n_sections in zip(pending, counts):
+        print(f"Processed: {filename} ({n_sections} sections)")
+    if skipped:
+        print(f"Skipped {len(skipped)} unchanged file(s)")
+
+    _save_manifest(output_dir, new_manifest)
+    return {"processed": pending, "skipped": skipped, "removed": removed}
+
 
-        with open(output_file, "w", encoding="utf-8") as out:
-            for i, sec in enumerate(sections):
-                obj = {
-                    "id": f"{filename}-{i}",
-                    "file_name": filename,
-                    "section_index": i,
-                    "content": sec,
-                    "scraped_date": timestamp
-                }
-                out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean raw scraped text into sectioned JSONL.")
+    parser.add_argument("-i", "--input", default=SOURCE_DIR, help="folder with raw .txt / structured .jsonl files")
+    parser.add_argument("-o", "--output", default=OUTPUT_DIR, help="folder for processed .jsonl files")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="reprocess files even if unchanged")
+    args = parser.parse_args(argv)
 
-        print(f"Saved → {output_file}")
+    process_files(args.input, args.output, workers=args.workers, force=args.force)
 
 
 if __name__ == "__main__":
-    process_files()
+    main()